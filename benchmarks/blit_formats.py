@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Blit throughput of unconverted vs display-format surfaces.
+
+Run from the project root:
+    python benchmarks/blit_formats.py
+Set SDL_VIDEODRIVER=dummy to run it without a window.
+"""
+import pygame
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WORLD_WIDTH, SKY_BLUE, _create_image
+
+BENCH_SECONDS = 0.5  # Time spent measuring each case
+
+
+def as_loaded_png(surface):
+    """Round-trip a surface through PNG, like an image freshly read from disk"""
+    data = io.BytesIO()
+    pygame.image.save(surface, data, "sprite.png")
+    data.seek(0)
+    return pygame.image.load(data, "sprite.png")
+
+
+def blits_per_second(screen, surface, positions):
+    count = 0
+    start = time.perf_counter()
+    end = start + BENCH_SECONDS
+    while time.perf_counter() < end:
+        for pos in positions:
+            screen.blit(surface, pos)
+        count += len(positions)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+
+    background = _create_image("background.png", WORLD_WIDTH, SCREEN_HEIGHT, SKY_BLUE)
+    sprite = as_loaded_png(_create_image("player_idle.png", 40, 60))
+    cases = [
+        ("background (world-sized)", background, background.convert(), [(0, 0)]),
+        ("sprite loaded from PNG", sprite, sprite.convert_alpha(),
+         [(x * 40 % SCREEN_WIDTH, x * 7 % SCREEN_HEIGHT) for x in range(100)]),
+    ]
+
+    print(f"{'case':<28}{'unconverted/s':>16}{'converted/s':>16}{'speedup':>10}")
+    for name, raw, converted, positions in cases:
+        before = blits_per_second(screen, raw, positions)
+        after = blits_per_second(screen, converted, positions)
+        print(f"{name:<28}{before:>16.0f}{after:>16.0f}{after / before:>9.2f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
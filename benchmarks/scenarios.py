@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""Frame-time benchmarks of the whole game on canned scenarios.
+
+Each scenario runs the real game loop headless (see main.py --headless) in
+its own process, with the frame profiler on, and reports mean, p50, p95,
+p99 and max milliseconds per frame section (snapshot, camera, input,
+the scheduler's sections such as player, enemy_ai, enemies and boss,
+collisions, effects, render, hud, present) and in total.
+
+Run from the project root:
+    python benchmarks/scenarios.py                        # every scenario
+    python benchmarks/scenarios.py boss_fight --frames 300
+    python benchmarks/scenarios.py --output results.json
+    python benchmarks/scenarios.py --baseline results.json
+
+With --baseline the run is compared against a stored result file and the
+exit status is 1 if any scenario's mean or p95 frame time grew by more than
+--tolerance.
+"""
+import pygame
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import main as game
+from src.constants import WORLD_WIDTH, SCREEN_HEIGHT, ENEMY_HEIGHT, BOSS_ACTIVATION_DISTANCE
+from src.turtle import Turtle
+from src.profiler import FrameProfiler
+
+DEFAULT_FRAMES = 600
+DEFAULT_TOLERANCE = 0.10  # Allowed growth of mean and p95 over the baseline
+SEED = 1234
+COMPARED_STATS = ("mean", "p95")
+
+
+def keep_player_alive(player):
+    # Dying would stop the simulation half way through the run
+    player.invincible = True
+    player.invincibility_timer = 60
+    player.lives = max(player.lives, 1)
+
+
+def level_run(world):
+    """The default level, run left to right by the headless input script"""
+    player = world["player"]
+    return lambda: keep_player_alive(player)
+
+
+def boss_fight(world):
+    """The boss arena with the projectile arrays kept full"""
+    player, boss = world["player"], world["boss"]
+    player.rect.x = WORLD_WIDTH - BOSS_ACTIVATION_DISTANCE + 50
+    projectiles = boss.projectiles
+    boss.max_projectiles = projectiles.capacity
+
+    def tick():
+        keep_player_alive(player)
+        while len(projectiles) < projectiles.capacity:
+            projectiles.spawn(boss.rect.centerx, boss.rect.top,
+                              random.uniform(-6, 6), random.uniform(-8, 2))
+    return tick
+
+
+def turtles(world, count=1000):
+    """1,000 turtles hiding in their shells along the ground"""
+    shells = []
+    for _ in range(count):
+        turtle = Turtle(random.randint(200, WORLD_WIDTH - 300), SCREEN_HEIGHT - ENEMY_HEIGHT - 10)
+        turtle.enter_shell()
+        world["all_sprites"].add(turtle)
+        world["enemies"].add(turtle)
+        shells.append(turtle)
+    player = world["player"]
+
+    def tick():
+        keep_player_alive(player)
+        for turtle in shells:
+            turtle.shell_timer = 0  # Stay in the shell
+    return tick
+
+
+def coins(world, count=10000):
+    """10,000 coins scattered over the level"""
+    world["coins"].spawn_random(count, WORLD_WIDTH)
+    player = world["player"]
+    return lambda: keep_player_alive(player)
+
+
+SCENARIOS = {
+    "level_run": level_run,
+    "boss_fight": boss_fight,
+    "turtles_1000": turtles,
+    "coins_10000": coins,
+}
+
+
+def run_scenario(name, frames):
+    """Play one scenario in this process and return its frame section statistics"""
+    random.seed(SEED)
+    profiler = FrameProfiler(enabled=True, history=None)
+    try:
+        game.main(["--headless", "--skip-menu", "--frames", str(frames), "--seed", str(SEED)],
+                  setup=SCENARIOS[name], profiler=profiler)
+    except SystemExit:
+        pass
+    return {"frames": len(profiler.frames), "sections": profiler.get_stats()}
+
+
+def run_isolated(name, frames):
+    """Run a scenario in a fresh interpreter, so caches and pygame state don't carry over"""
+    with tempfile.TemporaryDirectory() as tmp:
+        result_path = os.path.join(tmp, "result.json")
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--child", name,
+                        "--frames", str(frames), "--output", result_path],
+                       cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+        with open(result_path) as file:
+            return json.load(file)
+
+
+def print_results(results):
+    print(f"{'scenario':<16}{'section':<12}{'mean':>8}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}  (ms)")
+    for name, result in results["scenarios"].items():
+        for section, stats in result["sections"].items():
+            print(f"{name:<16}{section:<12}" + "".join(
+                f"{stats[key]:>8.2f}" for key in ("mean", "p50", "p95", "p99", "max")))
+
+
+def compare(results, baseline, tolerance):
+    """Print the change of every frame total against the baseline; return the regressions"""
+    regressions = []
+    print(f"\n{'scenario':<16}{'stat':<8}{'baseline':>10}{'now':>10}{'change':>9}")
+    for name, result in results["scenarios"].items():
+        old = baseline.get("scenarios", {}).get(name)
+        if old is None:
+            print(f"{name:<16}(not in baseline)")
+            continue
+        for stat in COMPARED_STATS:
+            before = old["sections"]["total"][stat]
+            after = result["sections"]["total"][stat]
+            change = after / before - 1 if before else 0.0
+            flag = ""
+            if change > tolerance:
+                flag = "  REGRESSION"
+                regressions.append((name, stat, change))
+            print(f"{name:<16}{stat:<8}{before:>10.2f}{after:>10.2f}{change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scenarios", nargs="*",
+                        help=f"scenarios to run (default: all): {', '.join(SCENARIOS)}")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a results file from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    unknown = [name for name in args.scenarios + [args.child or ""] if name and name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario: {', '.join(unknown)}")
+
+    if args.child:
+        with open(args.output, "w") as file:
+            json.dump(run_scenario(args.child, args.frames), file)
+        return 0
+
+    results = {
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "frames": args.frames,
+        "scenarios": {},
+    }
+    for name in args.scenarios or SCENARIOS:
+        print(f"Running {name}...", file=sys.stderr)
+        results["scenarios"][name] = run_isolated(name, args.frames)
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if compare(results, baseline, args.tolerance):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,33 +4,54 @@ import sys
 import random
 import os
 import math
+import time
+import argparse
 
 # Import from modular files
 from src.constants import (
     SCREEN_WIDTH, SCREEN_HEIGHT, WORLD_WIDTH, 
-    BLACK, WHITE, RED, YELLOW, GOLD, ORANGE, GREEN,
+    WHITE, RED, GOLD, ORANGE, GREEN,
     COIN_SIZE, ENEMY_WIDTH, ENEMY_HEIGHT, SPIKE_HEIGHT,
-    MAX_JUMPS, MAX_LIVES, BOSS_ACTIVATION_DISTANCE,
-    BOSS_WIDTH, BOSS_HEIGHT
+    MAX_JUMPS, MAX_LIVES, BOSS_ACTIVATION_DISTANCE, finalize_assets, clear_image_cache,
+    TICK_RATE, MAX_TICKS_PER_FRAME, FRAME_RATE_LIMIT, STOMP_BOUNCE
 )
 from src.player import Player
 from src.camera import Camera
-from src.coin import Coin
+from src.coin import CoinField
 from src.enemy import Enemy, PatrollingEnemy
 from src.turtle import Turtle
 from src.platform import Platform, MovingPlatform, ShrinkingPlatform, FallingPlatform
 from src.background import Background, Tree, Bush, Cloud
 from src.spike import Spike
 from src.powerup import PowerUp, LifeIcon
-from src.game import handle_enemy_collision, reset_game, reset_boss
-from src.fireball import Fireball
-from src.boss import Boss, BossProjectile
+from src.game import handle_enemy_collision, reset_game, reset_boss, update_enemy_ai
+from src.fireball import fireball_pool
+from src.boss import Boss
+from src.display import create_screen, DEBUG_BLITS_ENV
+from src.renderer import FrameRenderer, FULL, DIRTY, RENDER_MODE_ENV
+from src.spatial import SpatialGroup
+from src.static_layer import StaticLayer
+from src.ambient import AmbientField, DEFAULT_AMBIENT
+from src.particles import ParticleSystem, PARTICLE_BUDGET, PARTICLE_BUDGET_LOW
+from src.text import get_font, render_text, draw_counter, get_text_cache_stats
+from src.scenes import BossIntroScene, BossVictoryScene
+from src.audio import load_victory_sounds
+from src.headless import use_dummy_drivers, load_script, ScriptedInput, DEFAULT_SCRIPT
+from src.profiler import FrameProfiler, ProfilerOverlay
+from src.tracing import start_tracing, stop_tracing, trace_event
+from src.watchdog import HitchWatchdog, HITCH_BUDGET_MS
+from src.gc_control import GCManager, GC_MODES, GC_AUTO, GC_PHASE_PLAYING, GC_PHASE_IDLE
+from src.memdiag import MemoryDiagnostics, MEMDIAG_INTERVAL
+from src.scheduler import UpdateScheduler, INPUT, AI, PHYSICS, COLLISION, ANIMATION
+
+# High scores are kept here; None keeps them in memory only (headless runs)
+high_score_file = "highscore.txt"
 
 # Load high score from file or create if it doesn't exist
 def load_high_score():
     try:
-        if os.path.exists("highscore.txt"):
-            with open("highscore.txt", "r") as file:
+        if high_score_file and os.path.exists(high_score_file):
+            with open(high_score_file, "r") as file:
                 return int(file.read())
         return 0
     except:
@@ -38,22 +59,52 @@ def load_high_score():
         
 # Save high score to file
 def save_high_score(score):
+    if not high_score_file:
+        return
     try:
-        with open("highscore.txt", "w") as file:
+        with open(high_score_file, "w") as file:
             file.write(str(score))
     except:
         pass
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Super Mario Game")
+    parser.add_argument("--headless", action="store_true",
+                        help="run without a window or audio, one tick per frame as fast as possible")
+    parser.add_argument("--frames", type=int, default=0,
+                        help="quit after this many frames (0 runs until quit)")
+    parser.add_argument("--no-render", action="store_true",
+                        help="skip drawing entirely and only run the simulation")
+    parser.add_argument("--script", metavar="FILE",
+                        help="JSON input script to play instead of the keyboard "
+                             "(headless runs use a built-in one by default)")
+    parser.add_argument("--seed", type=int, help="seed Python's random module for repeatable levels")
+    parser.add_argument("--skip-menu", action="store_true", help="start playing straight away")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record frame phases and game events to a Chrome trace JSON file, "
+                             "or to rotating NDJSON files if FILE ends in .ndjson")
+    parser.add_argument("--watchdog", metavar="FILE",
+                        help="sample the stack during frames over the hitch budget and write "
+                             "collapsed stacks to FILE (hitch details go next to it)")
+    parser.add_argument("--hitch-budget", type=float, default=HITCH_BUDGET_MS, metavar="MS",
+                        help=f"frame time counted as a hitch (default {HITCH_BUDGET_MS} ms)")
+    parser.add_argument("--gc", choices=GC_MODES, default=GC_AUTO,
+                        help="garbage collector mode: Python's defaults (auto), defaults with a pause "
+                             "report (report), or frozen level, raised thresholds while playing and "
+                             "collections in menus and cutscenes (managed)")
+    parser.add_argument("--memdiag", action="store_true",
+                        help="trace allocations with tracemalloc and print the top allocation sites "
+                             "and surface memory on exit")
+    parser.add_argument("--memdiag-interval", type=int, default=MEMDIAG_INTERVAL, metavar="FRAMES",
+                        help=f"frames between allocation snapshots (default {MEMDIAG_INTERVAL})")
+    return parser.parse_args(argv)
+
 def draw_text(surface, text, size, x, y, color=WHITE, align="topleft"):
-    font = pygame.font.Font(None, size)
-    text_surface = font.render(text, True, color)
+    # Fonts and rendered strings are cached, so static text costs one blit
+    text_surface = render_text(text, size, color)
     text_rect = text_surface.get_rect()
-    if align == "topleft":
-        text_rect.topleft = (x, y)
-    elif align == "center":
-        text_rect.center = (x, y)
-    elif align == "midtop":
-        text_rect.midtop = (x, y)
+    # align is any Rect position attribute ("topleft", "center", "topright", ...)
+    setattr(text_rect, align, (x, y))
     surface.blit(text_surface, text_rect)
     return text_rect
 
@@ -93,20 +144,67 @@ def draw_menu(screen, high_score=0):
     # Credits
     draw_text(screen, "PRESS ESC TO QUIT", 20, SCREEN_WIDTH - 10, SCREEN_HEIGHT - 10, WHITE, "topright")
 
-def main():
+def main(argv=None, setup=None, profiler=None):
+    """Run the game.
+
+    setup, if given, is called with a dict of the game's objects once the level
+    is built; if it returns a callable, that is called before every simulation
+    tick. profiler times the sections of each frame (disabled by default).
+    """
+    global high_score_file
+    args = parse_args(argv)
+    if args.headless:
+        use_dummy_drivers()
+        high_score_file = None  # Don't overwrite the player's high score
+    if args.seed is not None:
+        random.seed(args.seed)
+    # Started before anything is loaded so the level's allocations are traced too
+    memdiag = MemoryDiagnostics(args.memdiag_interval) if args.memdiag else None
+
     # Initialize Pygame
     pygame.init()
-    pygame.mixer.init()
+    if not args.headless:
+        pygame.mixer.init()
+    load_victory_sounds()  # Prepared now so the victory scene only has to play them
 
     # Set up the display
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    debug_blits = os.environ.get(DEBUG_BLITS_ENV) == "1"
+    screen = create_screen((SCREEN_WIDTH, SCREEN_HEIGHT), debug_blits)
     pygame.display.set_caption("Super Mario Game")
+    # Convert anything loaded before the display existed to its pixel format
+    finalize_assets()
+    # Full redraws by default; dirty-rectangle mode only updates what changed
+    render_mode = DIRTY if os.environ.get(RENDER_MODE_ENV) == DIRTY else FULL
+    renderer = FrameRenderer(screen, render_mode)
     clock = pygame.time.Clock()
+    # The simulation runs in fixed ticks, independently of how often frames are drawn
+    tick_ms = 1000 / TICK_RATE
+    # Headless runs simulate exactly one tick per frame with no frame limit
+    frame_rate_limit = 0 if args.headless else FRAME_RATE_LIMIT
+    render = not args.no_render
+
+    # Scripted input replaces the keyboard
+    script = None
+    if args.script:
+        script = ScriptedInput(load_script(args.script))
+    elif args.headless:
+        script = ScriptedInput(DEFAULT_SCRIPT)
+    get_pressed = script.get_pressed if script else pygame.key.get_pressed
     
     # Game states
     MENU = 0
     PLAYING = 1
-    game_state = MENU
+    game_state = PLAYING if args.skip_menu else MENU
+    if profiler is None:
+        profiler = FrameProfiler()
+    if args.trace:
+        # Frame phases come from the profiler's laps, so tracing keeps it on
+        profiler.tracer = start_tracing(args.trace)
+        profiler.enabled = True
+    # F3 shows the profiler overlay, and keeps the profiler on while it is shown
+    profiler_overlay = ProfilerOverlay(profiler)
+    show_profiler = False
+    keep_profiling = profiler.enabled
     
     # Load high score
     high_score = load_high_score()
@@ -114,14 +212,20 @@ def main():
     # Create camera
     camera = Camera(WORLD_WIDTH, SCREEN_HEIGHT)
 
+    # Every entity is updated once per tick, in phases, by the scheduler
+    scheduler = UpdateScheduler(profiler)
+
     # Create sprite groups
-    all_sprites = pygame.sprite.Group()
-    coins = pygame.sprite.Group()
+    # Everything that gets drawn is indexed along x for viewport queries,
+    # and scheduled for updates while it is in the group
+    all_sprites = SpatialGroup(scheduler=scheduler)
+    coins = CoinField()
     enemies = pygame.sprite.Group()
     platforms = pygame.sprite.Group()
     moving_platforms = pygame.sprite.Group()
     obstacles = pygame.sprite.Group()
-    decorations = pygame.sprite.Group()
+    decorations = SpatialGroup()
+    static_layer = StaticLayer()  # Level geometry that never changes, baked into chunks
     powerups = pygame.sprite.Group()
     ui_elements = pygame.sprite.Group()
     fireballs = pygame.sprite.Group()  # New sprite group for fireballs
@@ -132,6 +236,10 @@ def main():
 
     # Create background
     background = Background()
+    ambient = AmbientField()  # Drifting clouds and pollen
+    for kind, count in DEFAULT_AMBIENT.items():
+        ambient.spawn(kind, count)
+    particles = ParticleSystem()  # Stomps, pickups, hits and boss effects
 
     # Create life icons
     life_icons = []
@@ -246,12 +354,13 @@ def main():
         decorations.add(bush)
         all_sprites.add(bush)
 
+    # Bake everything that never moves, decorations first so they stay behind platforms
+    static_layer.add(decorations)
+    static_layer.add(sprite for sprite in all_sprites if getattr(sprite, "static", False))
+    static_layer.bake_all()
+
     # Create coins
-    for _ in range(30):
-        coin = Coin(random.randint(0, WORLD_WIDTH - COIN_SIZE),
-                   random.randint(100, SCREEN_HEIGHT - 100))
-        all_sprites.add(coin)
-        coins.add(coin)
+    coins.spawn_random(30, WORLD_WIDTH)
 
     # Create enemies
     enemy_positions = [
@@ -284,19 +393,80 @@ def main():
 
     # Create boss at the end of the level
     boss = Boss(WORLD_WIDTH - 200, SCREEN_HEIGHT - 130)
+    boss.target = player
+    boss.platforms = platforms
     all_sprites.add(boss)
+
+    # Per-tick updates of things that aren't sprites
+    scheduler.add(enemies, AI, lambda: update_enemy_ai(enemies, player, camera, platforms), section="enemy_ai")
+    scheduler.add(coins, ANIMATION, section="coins")
     boss_battle_active = False
     boss_battle_won = False
+    boss_phase = 1  # Last boss phase seen, to burst particles when it goes up
+    scene = None  # Cutscene being played; gameplay waits while it runs
+
+    # Let benchmarks and tests change the level before the game starts
+    on_tick = None
+    if setup is not None:
+        on_tick = setup({
+            "player": player, "camera": camera, "boss": boss, "coins": coins,
+            "all_sprites": all_sprites, "enemies": enemies, "platforms": platforms,
+            "particles": particles, "ambient": ambient,
+        })
+
+    def hitch_context():
+        """Describe what the game was doing, for the watchdog's hitch log"""
+        if game_state == MENU:
+            state = "menu"
+        else:
+            state = "game_over" if game_over else "won" if game_won else "playing"
+        return {
+            "state": state,
+            "scene": type(scene).__name__ if scene is not None else None,
+            "boss_battle": boss_battle_active,
+            "boss_phase": boss.phase,
+            "render_mode": renderer.mode,
+            "sprites": len(all_sprites),
+            "enemies": len(enemies),
+            "fireballs": len(fireballs),
+            "coins": len(coins),
+            "projectiles": len(boss.projectiles),
+            "particles": len(particles),
+        }
+
+    if memdiag:
+        memdiag.entities = [all_sprites, coins, boss.projectiles, particles]
+
+    # The level is built: freeze it out of the collector's way (managed mode)
+    gc_manager = GCManager(args.gc)
+    gc_manager.level_loaded()
+
+    # Stack sampling during long frames
+    watchdog = None
+    if args.watchdog:
+        watchdog = HitchWatchdog(args.watchdog, args.hitch_budget, context=hitch_context).start()
 
     # Game state
     game_over = False
     game_won = False
-    font = pygame.font.Font(None, 36)
+    win_stars_shown = False
+    hud_font_size = 36
+    view_margin = 64  # Extra world pixels queried on each side of the camera
+    # Screen areas the HUD may draw on, redrawn every frame in dirty mode
+    hud_rects = [
+        pygame.Rect(0, 0, 300, 100),  # Score, high score, jumps, power-ups
+        pygame.Rect(SCREEN_WIDTH - 110, 0, 110, 40),  # FPS
+        pygame.Rect(0, SCREEN_HEIGHT - 40, 400, 40),  # Fireball hint
+    ]
+    game_over_rect = pygame.Rect(SCREEN_WIDTH // 2 - 160, SCREEN_HEIGHT // 2 - 50, 420, 130)
 
     # Game loop
     running = True
+    frames_run = 0
+    start_time = time.perf_counter()
     last_time = pygame.time.get_ticks()
-    dt = 1
+    accumulator = 0  # Milliseconds of real time not simulated yet
+    tick_count = 0
     frame_count = 0
     fps_update_timer = 0
     current_fps = 60
@@ -305,52 +475,49 @@ def main():
     boss_attack_particles = []  # For visual effects from boss
     last_sprite_update = 0
     low_fps_mode = False
-    skip_frame = False
 
     while running:
-        # Calculate delta time
+        if args.frames and frames_run >= args.frames:
+            break
+        frames_run += 1
+        profiler.begin_frame()
+        if watchdog:
+            watchdog.frame_started()
+        if memdiag:
+            memdiag.frame_started()
+        if script:
+            script.post()
+
+        # Measure the real time since the last frame
         current_time = pygame.time.get_ticks()
-        dt = (current_time - last_time) / (1000 / 60)
-        dt = min(dt, 2.0)  # Cap delta time to prevent physics issues
+        elapsed = tick_ms if args.headless else current_time - last_time
         last_time = current_time
+        accumulator += elapsed
         
         # Calculate actual FPS
         frame_count += 1
-        fps_update_timer += dt
-        if fps_update_timer >= 60:  # Update FPS display once per second
+        fps_update_timer += elapsed
+        if fps_update_timer >= 1000:  # Update FPS display once per second
             current_fps = frame_count
             frame_count = 0
             fps_update_timer = 0
             # Detect low FPS and enable optimization
             low_fps_mode = current_fps < 45
-        
-        # Skip every other frame during boss battles if FPS is low
-        if boss_battle_active and low_fps_mode:
-            skip_frame = not skip_frame
-            if skip_frame and not game_over and not game_won:
-                # Just handle minimum events to stay responsive
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        running = False
-                    elif event.type == pygame.KEYDOWN:
-                        if event.key == pygame.K_ESCAPE:
-                            if game_state == PLAYING:
-                                if player.score > high_score:
-                                    high_score = player.score
-                                    save_high_score(high_score)
-                                game_state = MENU
-                            else:
-                                running = False
-                # Skip the rest of this frame
-                clock.tick(60)
-                continue
+            particles.set_budget(PARTICLE_BUDGET_LOW if low_fps_mode else PARTICLE_BUDGET)
 
         # Event handling
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
+                if scene is not None and event.key != pygame.K_ESCAPE:
+                    scene.handle_event(event)
+                elif event.key == pygame.K_ESCAPE:
+                    if scene is not None:
+                        # Leaving mid-scene ends it like a skip, so the victory bonus
+                        # still counts towards the high score saved below
+                        player.score += scene.score_bonus
+                        scene = None
                     if game_state == PLAYING:
                         # Save high score before going to menu
                         if player.score > high_score:
@@ -359,6 +526,13 @@ def main():
                         game_state = MENU
                     else:
                         running = False
+                elif event.key == pygame.K_F2:
+                    print(f"Render mode: {renderer.toggle_mode()}")
+                elif event.key == pygame.K_F3:
+                    show_profiler = not show_profiler
+                    profiler.enabled = show_profiler or keep_profiling
+                    profiler_overlay.clear()
+                    renderer.invalidate()
                 elif game_state == MENU:
                     if event.key == pygame.K_RETURN:
                         game_state = PLAYING
@@ -421,741 +595,453 @@ def main():
                                     if fireball not in all_sprites:
                                         all_sprites.add(fireball)
 
+        profiler.lap("input")
+
+        # Collections are held back while playing and run on the way to a menu or cutscene
+        if game_state == PLAYING and scene is None and not game_over and not game_won:
+            gc_manager.set_phase(GC_PHASE_PLAYING)
+        else:
+            gc_manager.set_phase(GC_PHASE_IDLE)
+
         # Menu state
         if game_state == MENU:
-            draw_menu(screen, high_score)
-            pygame.display.flip()
-            clock.tick(60)
+            # The menu is static, so in dirty mode it is only drawn when it changes
+            if render:
+                renderer.present_static(("menu", high_score), lambda: draw_menu(screen, high_score))
+            accumulator = 0  # Don't catch up on the time spent in the menu
+            profiler.end_frame()
+            if watchdog:
+                watchdog.frame_finished()
+            if memdiag:
+                memdiag.frame_finished()
+            clock.tick(frame_rate_limit)
             continue
 
-        # Game playing state
-        if not game_over and not game_won:
-            # Get keyboard state
-            keys = pygame.key.get_pressed()
-            
-            # Player movement
-            if keys[pygame.K_LEFT] or keys[pygame.K_a]:
-                player.move_left()
-            if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
-                player.move_right()
-
-            # Update camera and background
-            camera.update(player)
-            background.update()
-            
-            # Update player
-            player.update(WORLD_WIDTH)
-            
-            # Update moving platforms
-            for platform in moving_platforms:
-                platform.update()
-            
-            # Enemy behavior
-            for enemy in enemies:
-                enemy.detect_player(player, camera)
-                enemy.check_platform_edge(platforms)
-                
-                # Check for movement range boundaries
-                if hasattr(enemy, 'start_x') and hasattr(enemy, 'move_range'):
-                    if enemy.rect.x > enemy.start_x + enemy.move_range or enemy.rect.x < enemy.start_x - enemy.move_range:
-                        enemy.direction *= -1
+        # Run as many fixed simulation ticks as real time has passed
+        ticks = 0
+        while accumulator >= tick_ms and ticks < MAX_TICKS_PER_FRAME:
+            accumulator -= tick_ms
+            ticks += 1
+            tick_count += 1
+            # Positions before the tick, for drawing between this tick and the next
+            camera.snapshot()
+            all_sprites.snapshot()
+            particles.snapshot()
+            ambient.snapshot()
+            boss.projectiles.snapshot()
+            if on_tick is not None:
+                on_tick()
+            profiler.lap("snapshot")
+
+            # Game playing state
+            if scene is None and not game_over and not game_won:
+                scheduler.begin_tick()
+                # Update camera and background
+                camera.update(player)
+                background.update(camera)
+                ambient.update()
+                profiler.lap("camera")
+
+                # Get keyboard state
+                keys = get_pressed()
             
-            # Update other sprites
-            for sprite in all_sprites:
-                if sprite != player and sprite not in moving_platforms:
-                    sprite.update()
+                # Player movement
+                if keys[pygame.K_LEFT] or keys[pygame.K_a]:
+                    player.move_left()
+                if keys[pygame.K_RIGHT] or keys[pygame.K_d]:
+                    player.move_right()
+                profiler.lap("input")
+
+                # The player and moving platforms move, then enemies react to them,
+                # then enemies, power-ups, fireballs and crumbling platforms move
+                scheduler.run(INPUT)
+                scheduler.run(AI)
+                scheduler.run(PHYSICS)
                     
-            # Check for player-enemy collisions
-            enemy_collisions = pygame.sprite.spritecollide(player, enemies, False)
-            for enemy in enemy_collisions:
-                # Use the handle_enemy_collision function to process the collision
-                take_damage = handle_enemy_collision(player, enemy, enemies, all_sprites)
+                # Check for player-enemy collisions
+                enemy_collisions = pygame.sprite.spritecollide(player, enemies, False)
+                for enemy in enemy_collisions:
+                    # Use the handle_enemy_collision function to process the collision
+                    take_damage = handle_enemy_collision(player, enemy, enemies, all_sprites, particles)
                 
-                if take_damage and not player.invincible:
-                    # Player is hurt by the enemy
-                    is_dead = player.take_damage()
-                    if is_dead:
-                        # Game over if player has no lives left
-                        if player.score > high_score:
-                            high_score = player.score
-                            save_high_score(high_score)
-                        game_over = True
-                    else:
-                        # Update life icons
-                        if len(life_icons) > player.lives:
-                            icon = life_icons.pop()
-                            ui_elements.remove(icon)
+                    if take_damage and not player.invincible:
+                        # Player is hurt by the enemy
+                        is_dead = player.take_damage()
+                        if is_dead:
+                            # Game over if player has no lives left
+                            if player.score > high_score:
+                                high_score = player.score
+                                save_high_score(high_score)
+                            game_over = True
+                        else:
+                            # Update life icons
+                            if len(life_icons) > player.lives:
+                                icon = life_icons.pop()
+                                ui_elements.remove(icon)
                     
-                    # Move player away slightly to prevent continuous collisions
-                    if player.rect.centerx < enemy.rect.centerx:
-                        player.rect.x -= 20
-                    else:
-                        player.rect.x += 20
-                    player.rect.y -= 10
+                        # Move player away slightly to prevent continuous collisions
+                        if player.rect.centerx < enemy.rect.centerx:
+                            player.rect.x -= 20
+                        else:
+                            player.rect.x += 20
+                        player.rect.y -= 10
                     
-            # Update fireballs and check collisions
-            for fireball in fireballs.copy():
-                # Check platform collisions for fireballs
-                if not fireball.check_platform_collision(platforms):
-                    # Remove fireball if it hit a platform and shouldn't continue
-                    fireballs.remove(fireball)
-                    all_sprites.remove(fireball)
+                # Update fireballs and check collisions
+                for fireball in fireballs.copy():
+                    # Check platform collisions for fireballs
+                    if not fireball.check_platform_collision(platforms):
+                        # Remove fireball if it hit a platform and shouldn't continue
+                        fireball_pool.release(fireball)
+                        continue
                 
-                # Check if fireball is off screen
-                if fireball.rect.x < -50 or fireball.rect.x > WORLD_WIDTH + 50 or fireball.rect.y > SCREEN_HEIGHT + 50:
-                    fireballs.remove(fireball)
-                    all_sprites.remove(fireball)
+                    # Check if fireball is off screen
+                    if fireball.rect.x < -50 or fireball.rect.x > WORLD_WIDTH + 50 or fireball.rect.y > SCREEN_HEIGHT + 50:
+                        fireball_pool.release(fireball)
+                        continue
                     
-                # Check for enemy collisions
-                for enemy in enemies.copy():
-                    if fireball.rect.colliderect(enemy.rect):
-                        # Hit enemy with fireball
-                        enemies.remove(enemy)
-                        all_sprites.remove(enemy)
-                        player.score += 15 * player.score_multiplier  # More points for fireball kill
+                    # Check for enemy collisions
+                    for enemy in enemies.copy():
+                        if fireball.rect.colliderect(enemy.rect):
+                            # Hit enemy with fireball
+                            particles.emit("fireball_hit", *enemy.rect.center)
+                            enemies.remove(enemy)
+                            all_sprites.remove(enemy)
+                            player.score += 15 * player.score_multiplier  # More points for fireball kill
                         
-                        # Remove the fireball after hitting an enemy
-                        fireballs.remove(fireball)
-                        all_sprites.remove(fireball)
-                        break
+                            # Remove the fireball after hitting an enemy
+                            fireball_pool.release(fireball)
+                            break
                     
-            # Update power-ups and check platform collisions
-            for powerup in powerups:
-                powerup.check_platform_collision(platforms)
-
-            # Moving platform logic - make the player move with platforms
-            for platform in moving_platforms:
-                if (player.rect.bottom == platform.rect.top or 
-                    player.rect.bottom == platform.rect.top + 1) and \
-                   player.rect.right > platform.rect.left and \
-                   player.rect.left < platform.rect.right:
-                    if platform.horizontal:
-                        player.rect.x += platform.speed
-                    else:
-                        player.rect.y += platform.speed
-                        player.velocity_y = platform.speed
-
-            # Check for turtle shell collisions with other enemies
-            for enemy in enemies:
-                if isinstance(enemy, Turtle) and enemy.in_shell and enemy.shell_speed != 0:
-                    for other_enemy in enemies:
-                        if other_enemy != enemy and enemy.rect.colliderect(other_enemy.rect):
-                            enemies.remove(other_enemy)
-                            all_sprites.remove(other_enemy)
-                            player.score += 10 * player.score_multiplier
+                # Update power-ups and check platform collisions
+                for powerup in powerups:
+                    powerup.check_platform_collision(platforms)
+
+                # Moving platform logic - make the player move with platforms
+                for platform in moving_platforms:
+                    if (player.rect.bottom == platform.rect.top or 
+                        player.rect.bottom == platform.rect.top + 1) and \
+                       player.rect.right > platform.rect.left and \
+                       player.rect.left < platform.rect.right:
+                        if platform.horizontal:
+                            player.rect.x += platform.speed
+                        else:
+                            player.rect.y += platform.speed
+                            player.velocity_y = platform.speed
+
+                # Check for turtle shell collisions with other enemies
+                for enemy in enemies:
+                    if isinstance(enemy, Turtle) and enemy.in_shell and enemy.shell_speed != 0:
+                        for other_enemy in enemies:
+                            if other_enemy != enemy and enemy.rect.colliderect(other_enemy.rect):
+                                enemies.remove(other_enemy)
+                                all_sprites.remove(other_enemy)
+                                player.score += 10 * player.score_multiplier
                     
-                    # Check if shell hits platforms on the sides
-                    enemy.check_platform_collision(platforms)
-
-            # Platform collision for player
-            player_on_platform = False
-            for platform in platforms:
-                if player.rect.colliderect(platform.rect):
-                    # Landing on top of platform
-                    if player.velocity_y > 0 and player.rect.bottom < platform.rect.bottom + 10:
-                        player.rect.bottom = platform.rect.top
-                        player.velocity_y = 0
-                        player.jumping = False
-                        player.jumps_left = MAX_JUMPS
-                        player.on_ground = True
-                        player_on_platform = True
-                    # Head collision with bottom of platform
-                    elif player.velocity_y < 0 and player.rect.top < platform.rect.bottom and player.rect.top > platform.rect.top:
-                        player.rect.top = platform.rect.bottom
-                        player.velocity_y = 0
-                    # Side collisions
-                    elif player.rect.right > platform.rect.left and player.rect.left < platform.rect.left:
-                        player.rect.right = platform.rect.left
-                        player.velocity_x = 0
-                    elif player.rect.left < platform.rect.right and player.rect.right > platform.rect.right:
-                        player.rect.left = platform.rect.right
-                        player.velocity_x = 0
+                        # Check if shell hits platforms on the sides
+                        enemy.check_platform_collision(platforms)
+
+                # Platform collision for player
+                player_on_platform = False
+                for platform in platforms:
+                    if player.rect.colliderect(platform.rect):
+                        # Landing on top of platform
+                        if player.velocity_y > 0 and player.rect.bottom < platform.rect.bottom + 10:
+                            player.rect.bottom = platform.rect.top
+                            player.velocity_y = 0
+                            player.jumping = False
+                            player.jumps_left = MAX_JUMPS
+                            player.on_ground = True
+                            player_on_platform = True
+                        # Head collision with bottom of platform
+                        elif player.velocity_y < 0 and player.rect.top < platform.rect.bottom and player.rect.top > platform.rect.top:
+                            player.rect.top = platform.rect.bottom
+                            player.velocity_y = 0
+                        # Side collisions
+                        elif player.rect.right > platform.rect.left and player.rect.left < platform.rect.left:
+                            player.rect.right = platform.rect.left
+                            player.velocity_x = 0
+                        elif player.rect.left < platform.rect.right and player.rect.right > platform.rect.right:
+                            player.rect.left = platform.rect.right
+                            player.velocity_x = 0
             
-            # If not on any platform and not jumping, ensure falling state is correct
-            if not player_on_platform and not player.on_ground and player.velocity_y >= 0:
-                player.jumping = True
+                # If not on any platform and not jumping, ensure falling state is correct
+                if not player_on_platform and not player.on_ground and player.velocity_y >= 0:
+                    player.jumping = True
                         
-            # Platform collision for enemies
-            for enemy in enemies:
-                enemy.on_ground = False
-                for platform in platforms:
-                    if enemy.rect.colliderect(platform.rect):
-                        if enemy.velocity_y > 0 and enemy.rect.bottom < platform.rect.bottom + 10:
-                            enemy.rect.bottom = platform.rect.top
-                            enemy.velocity_y = 0
-                            enemy.on_ground = True
-                            break
+                # Platform collision for enemies
+                for enemy in enemies:
+                    enemy.on_ground = False
+                    for platform in platforms:
+                        if enemy.rect.colliderect(platform.rect):
+                            if enemy.velocity_y > 0 and enemy.rect.bottom < platform.rect.bottom + 10:
+                                enemy.rect.bottom = platform.rect.top
+                                enemy.velocity_y = 0
+                                enemy.on_ground = True
+                                break
             
-            # Check for spike collisions
-            spike_collisions = pygame.sprite.spritecollide(player, obstacles, False)
-            if spike_collisions:
-                # If player has stars, don't get hurt by spikes
-                if not player.has_star:
-                    is_dead = player.take_damage()
-                    if is_dead:
-                        # Check for new high score
-                        if player.score > high_score:
-                            high_score = player.score
-                            save_high_score(high_score)
-                        game_over = True
-                    else:
-                        # Update life icons
-                        if len(life_icons) > player.lives:
-                            icon = life_icons.pop()
-                            ui_elements.remove(icon)
+                # Check for spike collisions
+                spike_collisions = pygame.sprite.spritecollide(player, obstacles, False)
+                if spike_collisions:
+                    # If player has stars, don't get hurt by spikes
+                    if not player.has_star:
+                        is_dead = player.take_damage()
+                        if is_dead:
+                            # Check for new high score
+                            if player.score > high_score:
+                                high_score = player.score
+                                save_high_score(high_score)
+                            game_over = True
+                        else:
+                            # Update life icons
+                            if len(life_icons) > player.lives:
+                                icon = life_icons.pop()
+                                ui_elements.remove(icon)
                             
-                    # Move player up to avoid being stuck in spikes
-                    player.rect.y -= 50
+                        # Move player up to avoid being stuck in spikes
+                        player.rect.y -= 50
             
-            # Check for power-up collisions
-            powerup_collisions = pygame.sprite.spritecollide(player, powerups, True)
-            for powerup in powerup_collisions:
-                player.collect_powerup(powerup.type)
-                all_sprites.remove(powerup)
-                
-                # Update UI for lives if needed
-                if powerup.type == "mushroom" and player.lives > len(life_icons):
-                    icon = LifeIcon(SCREEN_WIDTH - 30 - (len(life_icons)) * 25, 10)
-                    ui_elements.add(icon)
-                    life_icons.append(icon)
-
-            # Coin collection
-            visible_coins = [coin for coin in coins if abs(coin.rect.x - player.rect.x) < SCREEN_WIDTH // 2]
-            visible_coins_group = pygame.sprite.Group()
-            visible_coins_group.add(visible_coins)
-            coin_collisions = pygame.sprite.spritecollide(player, visible_coins_group, True)
-            for coin in coin_collisions:
-                coins.remove(coin)
-                player.score += 1 * player.score_multiplier
-
-            # Check if all coins are collected
-            if len(coins) == 0:
-                # Check for new high score
-                if player.score > high_score:
-                    high_score = player.score
-                    save_high_score(high_score)
-                    
-                # Don't end game immediately if boss battle is available or active
-                if boss_battle_won or (not boss_battle_active and player.rect.x < WORLD_WIDTH - 1000):
-                    game_won = True
-                
-            # Check if player is near boss arena to activate boss
-            if not boss_battle_active and not boss.active and player.rect.x > WORLD_WIDTH - BOSS_ACTIVATION_DISTANCE:
-                boss.active = True
-                boss_battle_active = True
-                
-                # Boss battle transition animation
-                boss_transition_time = 3.0  # seconds
-                frames = int(boss_transition_time * 60)  # at 60 fps
-                
-                # Create background for boss arena (darker and more dramatic)
-                sky_color = (20, 20, 40)  # Darker blue
-                ground_color = (60, 30, 30)  # Darker red/brown
-                boss_arena_bg = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
-                
-                # Lightning effect parameters
-                lightning_flash = False
-                lightning_alpha = 0
-                lightning_timer = 0
-                lightning_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                lightning_surf.fill((255, 255, 255))
-                
-                # Warning text flashing
-                warning_text = "BOSS BATTLE"
-                warning_font = pygame.font.Font(None, 72)
-                warning_alpha = 0
-                warning_direction = 1  # 1 = fade in, -1 = fade out
-                
-                # Boss silhouette
-                boss_silhouette = pygame.Surface((BOSS_WIDTH * 2, BOSS_HEIGHT * 2), pygame.SRCALPHA)
-                pygame.draw.rect(boss_silhouette, (200, 0, 0), boss_silhouette.get_rect(), 0)
-                boss_silhouette.set_alpha(0)
-                boss_silhouette_alpha = 0
-                boss_silhouette_pos = [SCREEN_WIDTH // 2 - boss_silhouette.get_width() // 2, 
-                                      SCREEN_HEIGHT // 2 - boss_silhouette.get_height() // 2]
-                
-                # Transition animation loop
-                for frame in range(frames):
-                    # Calculate progress (0.0 to 1.0)
-                    progress = frame / frames
-                    
-                    # Handle events during animation
-                    for event in pygame.event.get():
-                        if event.type == pygame.QUIT:
-                            pygame.quit()
-                            sys.exit()
-                        elif event.type == pygame.KEYDOWN:
-                            # Skip animation on keypress
-                            frame = frames - 1
-                            progress = 1.0
-                    
-                    # Fill with background color that gradually changes
-                    current_sky_color = [
-                        int(BLACK[0] + (sky_color[0] - BLACK[0]) * progress),
-                        int(BLACK[1] + (sky_color[1] - BLACK[1]) * progress),
-                        int(BLACK[2] + (sky_color[2] - BLACK[2]) * progress),
-                    ]
-                    boss_arena_bg.fill(current_sky_color)
-                    
-                    # Draw ground
-                    ground_rect = pygame.Rect(0, SCREEN_HEIGHT - 60, SCREEN_WIDTH, 60)
-                    pygame.draw.rect(boss_arena_bg, ground_color, ground_rect)
-                    
-                    # Draw decorative elements
-                    for i in range(5):
-                        # Jagged mountains in background
-                        points = [
-                            (SCREEN_WIDTH * i // 5, SCREEN_HEIGHT - 60),
-                            (SCREEN_WIDTH * i // 5 + SCREEN_WIDTH // 10, SCREEN_HEIGHT - 120 - random.randint(0, 50)),
-                            (SCREEN_WIDTH * (i+1) // 5, SCREEN_HEIGHT - 60)
-                        ]
-                        pygame.draw.polygon(boss_arena_bg, (40, 20, 20), points)
-                        
-                    # Draw lightning effect (randomly)
-                    if progress > 0.3:
-                        lightning_timer += 1
-                        if lightning_timer % 20 == 0 or (progress > 0.8 and lightning_timer % 10 == 0):
-                            lightning_flash = True
-                            lightning_alpha = random.randint(100, 200)
-                            
-                        if lightning_flash:
-                            lightning_alpha -= 10
-                            if lightning_alpha <= 0:
-                                lightning_flash = False
-                                lightning_alpha = 0
-                            else:
-                                lightning_surf.set_alpha(lightning_alpha)
-                                boss_arena_bg.blit(lightning_surf, (0, 0), special_flags=pygame.BLEND_ADD)
-                    
-                    # Update warning text
-                    if progress > 0.4:
-                        warning_alpha += warning_direction * 8
-                        if warning_alpha >= 255:
-                            warning_alpha = 255
-                            warning_direction = -1
-                        elif warning_alpha <= 0:
-                            warning_alpha = 0
-                            warning_direction = 1
-                            
-                        warning_text_surf = warning_font.render(warning_text, True, RED)
-                        warning_text_surf.set_alpha(warning_alpha)
-                        warning_rect = warning_text_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
-                        boss_arena_bg.blit(warning_text_surf, warning_rect)
-                        
-                        # Draw subtitle
-                        if frame % 30 < 15:  # Blinking
-                            subtitle_text = "PREPARE FOR BATTLE!"
-                            subtitle_font = pygame.font.Font(None, 36)
-                            subtitle_surf = subtitle_font.render(subtitle_text, True, YELLOW)
-                            subtitle_rect = subtitle_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3 + 50))
-                            boss_arena_bg.blit(subtitle_surf, subtitle_rect)
-                    
-                    # Update boss silhouette
-                    if progress > 0.6:
-                        # Make silhouette appear
-                        boss_silhouette_alpha = min(boss_silhouette_alpha + 5, 200)
-                        boss_silhouette.set_alpha(boss_silhouette_alpha)
-                        
-                        # Add eye glow
-                        if progress > 0.8:
-                            eye_radius = int(5 + 5 * math.sin(frame / 10))
-                            eye_color = (255, 0, 0)
-                            pygame.draw.circle(boss_silhouette, eye_color, 
-                                               (boss_silhouette.get_width() // 3, boss_silhouette.get_height() // 3), 
-                                               eye_radius)
-                            pygame.draw.circle(boss_silhouette, eye_color, 
-                                               (boss_silhouette.get_width() * 2 // 3, boss_silhouette.get_height() // 3), 
-                                               eye_radius)
-                        
-                        # Draw silhouette with slight movement
-                        shake_x = random.randint(-2, 2) if progress > 0.8 else 0
-                        shake_y = random.randint(-2, 2) if progress > 0.8 else 0
-                        boss_arena_bg.blit(boss_silhouette, 
-                                           (boss_silhouette_pos[0] + shake_x, 
-                                            boss_silhouette_pos[1] + shake_y))
-                    
-                    # Draw screen shake in later part of animation
-                    screen_shake = 0
-                    if progress > 0.85:
-                        screen_shake = random.randint(-4, 4)
-                    
-                    # Draw to screen
-                    screen.blit(boss_arena_bg, (screen_shake, screen_shake))
-                    
-                    # Update display and control framerate
-                    pygame.display.flip()
-                    clock.tick(60)
-                
-                # Final dramatic flash
-                flash_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                flash_surf.fill((255, 255, 255))
+                # Check for power-up collisions
+                powerup_collisions = pygame.sprite.spritecollide(player, powerups, True)
+                for powerup in powerup_collisions:
+                    player.collect_powerup(powerup.type)
+                    all_sprites.remove(powerup)
                 
-                for alpha in range(255, 0, -15):
-                    # Draw normal game screen
-                    screen.fill(BLACK)
-                    background.draw(screen, camera)
-                    
-                    for sprite in all_sprites:
-                        screen.blit(sprite.image, camera.apply(sprite))
-                        
-                    # Flash overlay
-                    flash_surf.set_alpha(alpha)
-                    screen.blit(flash_surf, (0, 0))
+                    # Update UI for lives if needed
+                    if powerup.type == "mushroom" and player.lives > len(life_icons):
+                        icon = LifeIcon(SCREEN_WIDTH - 30 - (len(life_icons)) * 25, 10)
+                        ui_elements.add(icon)
+                        life_icons.append(icon)
+
+                # Coin collection
+                coins_collected = coins.collect(player.rect)
+                player.score += coins_collected * player.score_multiplier
+                for _ in range(coins_collected):
+                    particles.emit("coin", *player.rect.center)
+
+                # Check if all coins are collected
+                if len(coins) == 0:
+                    # Check for new high score
+                    if player.score > high_score:
+                        high_score = player.score
+                        save_high_score(high_score)
                     
-                    # Update display
-                    pygame.display.flip()
-                    clock.tick(60)
+                    # Don't end game immediately if boss battle is available or active
+                    if boss_battle_won or (not boss_battle_active and player.rect.x < WORLD_WIDTH - 1000):
+                        game_won = True
                 
-                # Show boss health bar
-                boss.draw_health_bar(screen)
-                pygame.display.flip()
+                # Check if player is near boss arena to activate boss
+                if not boss_battle_active and not boss.active and player.rect.x > WORLD_WIDTH - BOSS_ACTIVATION_DISTANCE:
+                    boss.active = True
+                    boss_battle_active = True
                 
-                # Brief moment to prepare
-                pygame.time.delay(500)
+                    # The intro plays as a scene ticked by this loop
+                    scene = BossIntroScene()
+                profiler.lap("collisions")
+
+                # The boss moves and attacks, then its hits are checked
+                scheduler.run(COLLISION)
 
-            # Handle boss battle
-            if boss_battle_active:
-                # Update boss with player position for targeting
-                boss.update(player, platforms)
+                # Handle boss battle
+                if boss_battle_active:
+                    if boss.phase != boss_phase:
+                        if boss.phase > boss_phase:
+                            particles.emit("boss_phase", *boss.rect.center)
+                        trace_event("boss_phase", phase=boss.phase)
+                        boss_phase = boss.phase
                 
-                # Only draw health bar if boss is active
-                if boss.active:
-                    boss.draw_health_bar(screen)
+                    # Check for player collision with boss projectiles (one vectorized test)
+                    projectile_hits = boss.projectiles.collide_rect(player.rect)
                 
-                # Don't update all projectiles every frame in low FPS mode
-                if low_fps_mode:
-                    # Only process projectiles close to the player for collisions
-                    collision_distance = 100
-                    nearby_projectiles = pygame.sprite.Group()
-                    
-                    for projectile in boss.projectiles:
-                        if (abs(projectile.rect.centerx - player.rect.centerx) < collision_distance and 
-                            abs(projectile.rect.centery - player.rect.centery) < collision_distance):
-                            nearby_projectiles.add(projectile)
-                    
-                    # Check for player collision only with nearby projectiles
-                    projectile_hits = pygame.sprite.spritecollide(player, nearby_projectiles, True)
-                else:
-                    # Normal processing at good frame rates
-                    # Add new projectiles to all_sprites when needed
-                    for projectile in boss.projectiles:
-                        if projectile not in all_sprites:
-                            all_sprites.add(projectile)
-                    
-                    # Check for player collision with boss projectiles
-                    projectile_hits = pygame.sprite.spritecollide(player, boss.projectiles, True)
-                
-                # Handle projectile hits
-                if projectile_hits and not player.invincible:
-                    # Player takes damage from projectiles
-                    is_dead = player.take_damage()
-                    if is_dead:
-                        if player.score > high_score:
-                            high_score = player.score
-                            save_high_score(high_score)
-                        game_over = True
-                    else:
-                        # Update life icons
-                        if len(life_icons) > player.lives:
-                            icon = life_icons.pop()
-                            ui_elements.remove(icon)
+                    # Handle projectile hits
+                    if projectile_hits and not player.invincible:
+                        # Player takes damage from projectiles
+                        is_dead = player.take_damage()
+                        if is_dead:
+                            if player.score > high_score:
+                                high_score = player.score
+                                save_high_score(high_score)
+                            game_over = True
+                        else:
+                            # Update life icons
+                            if len(life_icons) > player.lives:
+                                icon = life_icons.pop()
+                                ui_elements.remove(icon)
                 
-                # Check for fireball hits on boss at reduced frequency in low FPS mode
-                if player.has_flower:
-                    perform_check = True
-                    if low_fps_mode:
-                        # Only check every other frame in low FPS mode
-                        perform_check = (frame_count % 2 == 0)
+                    # Check for fireball hits on boss at reduced frequency in low FPS mode
+                    if player.has_flower:
+                        perform_check = True
+                        if low_fps_mode:
+                            # Only check every other frame in low FPS mode
+                            perform_check = (tick_count % 2 == 0)
                         
-                    if perform_check:
-                        fireball_hits = pygame.sprite.spritecollide(boss, fireballs, True)
-                        for fireball in fireball_hits:
-                            all_sprites.remove(fireball)
-                            boss.take_damage()
-                            # Add points for hitting boss
-                            player.score += 25 * player.score_multiplier
+                        if perform_check:
+                            fireball_hits = pygame.sprite.spritecollide(boss, fireballs, False)
+                            for fireball in fireball_hits:
+                                fireball_pool.release(fireball)
+                                boss.take_damage()
+                                # Add points for hitting boss
+                                player.score += 25 * player.score_multiplier
                 
-                # Check for player jump on boss's head (classic stomp)
-                if (player.rect.bottom <= boss.rect.top + 20 and 
-                    player.rect.bottom >= boss.rect.top - 10 and 
-                    player.velocity_y > 0 and 
-                    player.rect.right > boss.rect.left + 20 and 
-                    player.rect.left < boss.rect.right - 20):
+                    # Check for player jump on boss's head (classic stomp)
+                    if (player.rect.bottom <= boss.rect.top + 20 and 
+                        player.rect.bottom >= boss.rect.top - 10 and 
+                        player.velocity_y > 0 and 
+                        player.rect.right > boss.rect.left + 20 and 
+                        player.rect.left < boss.rect.right - 20):
                     
-                    boss.take_damage()
-                    player.velocity_y = -10  # Bounce up
-                    player.score += 50 * player.score_multiplier
+                        boss.take_damage()
+                        player.velocity_y = STOMP_BOUNCE  # Bounce up
+                        player.score += 50 * player.score_multiplier
                 
-                # Check for boss charge attack hit on player
-                if (boss.current_attack == "charge" and 
-                    pygame.sprite.collide_rect(player, boss) and 
-                    not player.invincible):
+                    # Check for boss charge attack hit on player
+                    if (boss.current_attack == "charge" and 
+                        pygame.sprite.collide_rect(player, boss) and 
+                        not player.invincible):
                     
-                    is_dead = player.take_damage()
-                    if is_dead:
-                        if player.score > high_score:
-                            high_score = player.score
-                            save_high_score(high_score)
-                        game_over = True
-                    else:
-                        # Update life icons
-                        if len(life_icons) > player.lives:
-                            icon = life_icons.pop()
-                            ui_elements.remove(icon)
+                        is_dead = player.take_damage()
+                        if is_dead:
+                            if player.score > high_score:
+                                high_score = player.score
+                                save_high_score(high_score)
+                            game_over = True
+                        else:
+                            # Update life icons
+                            if len(life_icons) > player.lives:
+                                icon = life_icons.pop()
+                                ui_elements.remove(icon)
                 
-                # Check if boss is defeated
-                if boss.defeated and not boss_battle_won:
-                    # Victory animation
-                    boss_battle_won = True
-                    
-                    # Play victory fanfare sound if available
-                    try:
-                        victory_sound = pygame.mixer.Sound("assets/victory.wav")
-                        victory_sound.set_volume(0.7)
-                        victory_sound.play()
-                    except:
-                        # If sound file doesn't exist, create a simple victory beep sequence
-                        try:
-                            # Simple victory jingle using pygame's builtin sounds
-                            beep_1 = pygame.mixer.Sound(pygame.sndarray.make_sound(
-                                pygame.sndarray.array(pygame.Surface((4, 4)))))
-                            beep_1.set_volume(0.2)
-                            beep_2 = pygame.mixer.Sound(pygame.sndarray.make_sound(
-                                pygame.sndarray.array(pygame.Surface((8, 8)))))
-                            beep_2.set_volume(0.2)
-                            beep_3 = pygame.mixer.Sound(pygame.sndarray.make_sound(
-                                pygame.sndarray.array(pygame.Surface((16, 16)))))
-                            beep_3.set_volume(0.2)
-                            
-                            # Play a sequence of beeps
-                            beep_1.play()
-                            pygame.time.delay(200)
-                            beep_2.play()
-                            pygame.time.delay(200)
-                            beep_3.play()
-                        except:
-                            # If all fails, silently continue
-                            pass
-                    
-                    # Create victory particles
-                    victory_particles = []
-                    for _ in range(100):
-                        # Particles explode from boss position
-                        particle = {
-                            'x': boss.rect.centerx + random.randint(-50, 50),
-                            'y': boss.rect.centery + random.randint(-50, 50),
-                            'dx': random.uniform(-3, 3),
-                            'dy': random.uniform(-5, -1),  # Mostly upward
-                            'color': random.choice([GOLD, YELLOW, WHITE, ORANGE]),
-                            'size': random.randint(3, 8),
-                            'life': random.randint(30, 120)
-                        }
-                        victory_particles.append(particle)
-                    
-                    # Create flash effect
-                    flash_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-                    flash_surf.fill((255, 255, 255, 180))  # White with some transparency
+                    # Check if boss is defeated
+                    if boss.defeated and not boss_battle_won:
+                        # Victory animation
+                        boss_battle_won = True
                     
-                    # Animation loop
-                    animation_frames = 120  # 2 seconds at 60fps
-                    victory_text = "BOSS DEFEATED!"
-                    for frame in range(animation_frames):
-                        # Handle events during animation to keep game responsive
-                        for event in pygame.event.get():
-                            if event.type == pygame.QUIT:
-                                running = False
-                                break
-                            elif event.type == pygame.KEYDOWN:
-                                if event.key == pygame.K_ESCAPE:
-                                    running = False
-                                    break
-                                # Skip animation with any key
-                                animation_frames = frame + 1
-                                
-                        # Draw the background scene
-                        screen.fill(BLACK)
-                        background.draw(screen, camera)
-                        
-                        # Draw core game elements
-                        for sprite in decorations:
-                            screen.blit(sprite.image, camera.apply(sprite))
-                        for sprite in platforms:
-                            screen.blit(sprite.image, camera.apply(sprite))
-                        for sprite in all_sprites:
-                            if sprite != boss and sprite not in boss.projectiles:
-                                screen.blit(sprite.image, camera.apply(sprite))
-                        
-                        # Draw boss (defeated pose)
-                        boss.image = boss.hurt_frame
-                        screen.blit(boss.image, camera.apply(boss))
-                        
-                        # Flash effect fades out
-                        if frame < 20:
-                            flash_alpha = max(0, 180 - (frame * 9))
-                            flash_surf.set_alpha(flash_alpha)
-                            screen.blit(flash_surf, (0, 0))
-                        
-                        # Update and draw particles
-                        for particle in victory_particles[:]:
-                            # Move particle
-                            particle['x'] += particle['dx']
-                            particle['y'] += particle['dy']
-                            particle['dy'] += 0.1  # Gravity
-                            
-                            # Fade out particle
-                            particle['life'] -= 1
-                            if particle['life'] <= 0:
-                                victory_particles.remove(particle)
-                                continue
-                            
-                            # Draw particle
-                            alpha = min(255, particle['life'] * 3)
-                            pygame.draw.circle(
-                                screen, 
-                                particle['color'], 
-                                (int(particle['x'] - camera.scroll_x), int(particle['y'])), 
-                                particle['size']
-                            )
-                        
-                        # Draw victory text with animation
-                        if frame > 30:
-                            text_size = min(72, (frame - 30) * 2)  # Grows to full size
-                            if text_size > 0:
-                                text_alpha = min(255, (frame - 30) * 8)
-                                font = pygame.font.Font(None, text_size)
-                                text_surf = font.render(victory_text, True, GOLD)
-                                text_surf.set_alpha(text_alpha)
-                                text_rect = text_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
-                                
-                                # Add pulsing effect
-                                if frame > 60:
-                                    scale = 1.0 + 0.05 * abs(math.sin((frame - 60) / 10))
-                                    scaled_size = (int(text_surf.get_width() * scale), int(text_surf.get_height() * scale))
-                                    text_surf = pygame.transform.scale(text_surf, scaled_size)
-                                    text_rect = text_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
-                                
-                                screen.blit(text_surf, text_rect)
-                        
-                        # Draw "big bonus" text
-                        if frame > 60:
-                            bonus_text = f"+1000 POINTS!"
-                            bonus_alpha = min(255, (frame - 60) * 12)
-                            bonus_font = pygame.font.Font(None, 48)
-                            bonus_surf = bonus_font.render(bonus_text, True, WHITE)
-                            bonus_surf.set_alpha(bonus_alpha)
-                            bonus_rect = bonus_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-                            screen.blit(bonus_surf, bonus_rect)
-                            
-                            # Draw continue prompt
-                            if frame > 90:
-                                continue_alpha = min(255, (frame - 90) * 15)
-                                continue_font = pygame.font.Font(None, 30)
-                                continue_surf = continue_font.render("Press any key to continue", True, WHITE)
-                                continue_surf.set_alpha(continue_alpha)
-                                continue_rect = continue_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 2 // 3))
-                                screen.blit(continue_surf, continue_rect)
-                        
-                        # Update display
-                        pygame.display.flip()
-                        clock.tick(60)
-                    
-                    # After animation, add score bonus
-                    player.score += 1000
+                        # Burst of victory particles from the boss
+                        particles.emit("victory", *boss.rect.center)
+                        scene = BossVictoryScene(boss)
+                profiler.lap("boss")
+
+                # Coin spin
+                scheduler.run(ANIMATION)
+
+            # Win stars fall for as long as the win screen is shown
+            if game_won != win_stars_shown:
+                win_stars_shown = game_won
+                if game_won:
+                    particles.emit("win_star", SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)
+                else:
+                    particles.clear("win_star")
+            particles.update()
+
+            if scene is not None:
+                scene.update()
+                if scene.finished:
+                    player.score += scene.score_bonus
+                    scene = None
+                    renderer.invalidate()
+            profiler.lap("effects")
+
+        if ticks == MAX_TICKS_PER_FRAME:
+            # Too far behind to catch up; slow down rather than stall
+            accumulator = min(accumulator, tick_ms)
+        # How far real time is between the last tick and the next one
+        alpha = accumulator / tick_ms
+
+        if not render:
+            profiler.end_frame()
+            if watchdog:
+                watchdog.frame_finished()
+            if memdiag:
+                memdiag.frame_finished()
+            clock.tick(frame_rate_limit)
+            continue
 
         # Draw
-        screen.fill(BLACK)
+        # World sprites are recorded by the renderer and drawn by draw_world below.
+        # The boss battle, cutscenes and win screen draw effects straight on the screen,
+        # so they always redraw everything
+        camera.interpolate(alpha)
+        renderer.begin_frame(camera.scroll_x, force_full=boss_battle_active or game_won or scene is not None)
         
-        # Draw background with camera offset
-        background.draw(screen, camera)
+        # Draw clouds with camera offset
+        background.draw_clouds(renderer, camera)
+        ambient.draw(renderer, camera, kinds=("cloud",), alpha=alpha)
         
-        # Draw decorations
-        for sprite in decorations:
-            # Skip rendering decorations far from the camera view in low FPS mode during boss battles
-            if low_fps_mode and boss_battle_active:
-                if not (-100 < camera.apply(sprite).x < SCREEN_WIDTH + 100):
-                    continue
-            screen.blit(sprite.image, camera.apply(sprite))
+        # Only sprites in the camera's span (plus a margin) are looked up and drawn
+        view = camera.view_rect(view_margin)
+        scroll_x = round(camera.scroll_x)
         
-        # For performance, collect sprites to render to avoid multiple render passes
-        sprites_to_render = []
+        # Static platforms, spikes and decorations are pre-baked chunks
+        static_layer.draw(renderer, camera)
         
-        # Only render sprites that are in or near the viewport
-        viewport_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        # Coins are drawn in one batch
+        coins.draw(renderer, camera)
         
-        # Draw platforms and other sprites
-        for sprite in all_sprites:
-            if sprite in decorations:
-                continue  # Already rendered
-                
-            # Get screen position
-            screen_pos = camera.apply(sprite)
-            
-            # In low FPS mode during boss battle, skip sprites far from the viewport
-            if low_fps_mode and boss_battle_active:
-                # Expand viewport for checking
-                expanded_viewport = viewport_rect.inflate(200, 200)
-                if not expanded_viewport.collidepoint(screen_pos.x + sprite.rect.width/2, screen_pos.y + sprite.rect.height/2):
-                    # Skip rendering this sprite
-                    continue
-            
-            # Prioritize player, boss, and important elements
-            if sprite == player or sprite == boss or (boss_battle_active and sprite in boss.projectiles):
-                # These are always rendered
-                sprites_to_render.append((sprite, screen_pos))
-            elif isinstance(sprite, Platform):
-                # Platforms are important for gameplay
-                sprites_to_render.append((sprite, screen_pos))
-            else:
-                # Other sprites
-                sprites_to_render.append((sprite, screen_pos))
-                
-        # Render the collected sprites
-        for sprite, pos in sprites_to_render:
-            screen.blit(sprite.image, pos)
+        # Draw moving platforms and other sprites
+        for sprite in all_sprites.query(view):
+            x, y = all_sprites.interpolated_position(sprite, alpha)
+            renderer.blit(sprite.image, (x + scroll_x, y))
+        
+        # Pollen and rain drift in front of the level, effects on top of them
+        ambient.draw(renderer, camera, kinds=("pollen", "rain"), alpha=alpha)
+        particles.draw(renderer, camera, alpha)
+        
+        # Boss projectiles are drawn in one batch
+        if boss_battle_active:
+            boss.projectiles.draw(renderer, camera, alpha)
 
         # Draw UI elements - always render these as they're critical
         for ui_element in ui_elements:
-            screen.blit(ui_element.image, ui_element.rect)
+            renderer.blit(ui_element.image, ui_element.rect)
+
+        # Draw the recorded sprites over the background (only the changed areas in dirty mode)
+        for rect in hud_rects:
+            renderer.add_overlay(rect)
+        if game_over:
+            renderer.add_overlay(game_over_rect)
+        if show_profiler:
+            renderer.add_overlay(profiler_overlay.rect)
+        renderer.draw_world(lambda: background.draw_sky(screen, camera))
+        profiler.lap("render")
+
+        # Only draw health bar if boss is active
+        if boss_battle_active and boss.active:
+            boss.draw_health_bar(screen)
 
         # Draw score, jumps, and other UI elements
-        score_text = font.render(f'Score: {player.score}', True, WHITE)
-        high_score_text = font.render(f'High: {high_score}', True, GOLD)
-        jumps_text = font.render(f'Jumps: {player.jumps_left}', True, WHITE)
-        fps_text = font.render(f'FPS: {current_fps}', True, WHITE)
-        screen.blit(score_text, (10, 10))
-        screen.blit(high_score_text, (10, 40))
-        screen.blit(jumps_text, (10, 70))
-        screen.blit(fps_text, (SCREEN_WIDTH - 100, 10))
+        # Labels are cached and numbers are composed from a digit atlas
+        draw_counter(screen, 'Score: ', player.score, 10, 10, hud_font_size, WHITE)
+        draw_counter(screen, 'High: ', high_score, 10, 40, hud_font_size, GOLD)
+        draw_counter(screen, 'Jumps: ', player.jumps_left, 10, 70, hud_font_size, WHITE)
+        draw_counter(screen, 'FPS: ', current_fps, SCREEN_WIDTH - 100, 10, hud_font_size, WHITE)
         
         # Draw active power-ups
         if player.score_multiplier > 1:
-            multiplier_text = font.render(f'x{player.score_multiplier}', True, ORANGE)
-            screen.blit(multiplier_text, (170, 10))
+            draw_counter(screen, 'x', player.score_multiplier, 170, 10, hud_font_size, ORANGE)
         
         if player.has_star:
-            star_text = font.render('★', True, GOLD)
+            star_text = render_text('★', hud_font_size, GOLD)
             screen.blit(star_text, (210, 10))
             
         if player.has_flower:
-            flower_text = font.render('❀', True, GREEN)
+            flower_text = render_text('❀', hud_font_size, GREEN)
             screen.blit(flower_text, (240, 10))
             
             # Show fireball instruction
             if not game_over and not game_won and not low_fps_mode:  # Skip in low FPS mode
-                fire_text = font.render('Press F to shoot fireballs', True, GREEN)
+                fire_text = render_text('Press F to shoot fireballs', hud_font_size, GREEN)
                 screen.blit(fire_text, (10, SCREEN_HEIGHT - 30))
 
         # Game over or win message
         if game_over:
-            message = font.render('Game Over! Press R to restart', True, RED)
+            message = render_text('Game Over! Press R to restart', hud_font_size, RED)
             screen.blit(message, (SCREEN_WIDTH // 2 - 150, SCREEN_HEIGHT // 2))
             
             # Show high score info
             if player.score >= high_score:
-                high_score_msg = font.render('NEW HIGH SCORE!', True, GOLD)
+                high_score_msg = render_text('NEW HIGH SCORE!', hud_font_size, GOLD)
                 screen.blit(high_score_msg, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 40))
                 
-            esc_text = font.render('Press ESC for main menu', True, WHITE)
+            esc_text = render_text('Press ESC for main menu', hud_font_size, WHITE)
             screen.blit(esc_text, (SCREEN_WIDTH // 2 - 120, SCREEN_HEIGHT // 2 + 40))
             
         elif game_won:
@@ -1188,22 +1074,21 @@ def main():
                 win_color = (255, p, q)
             
             # Draw win message with rainbow effect
-            win_font = pygame.font.Font(None, win_text_size)
-            win_message = win_font.render('YOU WIN!', True, win_color)
+            # The color changes every frame, so only the font is cached
+            win_message = get_font(win_text_size).render('YOU WIN!', True, win_color)
             win_rect = win_message.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3))
             screen.blit(win_message, win_rect)
             
             # Show info about how to restart
-            restart_font = pygame.font.Font(None, 36)
-            restart_message = restart_font.render('Press R to play again', True, WHITE)
+            restart_message = render_text('Press R to play again', 36, WHITE)
             restart_rect = restart_message.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
             screen.blit(restart_message, restart_rect)
             
             # Draw stats summary
-            stats_font = pygame.font.Font(None, 28)
+            stats_size = 28
             stats_y = SCREEN_HEIGHT // 2 + 50
             
-            score_text = stats_font.render(f'Final Score: {player.score}', True, WHITE)
+            score_text = render_text(f'Final Score: {player.score}', stats_size, WHITE)
             score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, stats_y))
             screen.blit(score_text, score_rect)
             
@@ -1215,63 +1100,101 @@ def main():
                     int(215 * high_pulse + 40),
                     0
                 )
-                high_score_msg = stats_font.render('NEW HIGH SCORE!', True, high_score_color)
+                high_score_msg = get_font(stats_size).render('NEW HIGH SCORE!', True, high_score_color)
                 high_score_rect = high_score_msg.get_rect(center=(SCREEN_WIDTH // 2, stats_y + 30))
                 screen.blit(high_score_msg, high_score_rect)
             else:
-                high_score_msg = stats_font.render(f'High Score: {high_score}', True, GOLD)
+                high_score_msg = render_text(f'High Score: {high_score}', stats_size, GOLD)
                 high_score_rect = high_score_msg.get_rect(center=(SCREEN_WIDTH // 2, stats_y + 30))
                 screen.blit(high_score_msg, high_score_rect)
                 
             # Show boss defeated message if applicable
             if boss_battle_won:
-                boss_text = stats_font.render('★ BOSS DEFEATED ★', True, GOLD)
+                boss_text = render_text('★ BOSS DEFEATED ★', stats_size, GOLD)
                 boss_rect = boss_text.get_rect(center=(SCREEN_WIDTH // 2, stats_y + 60))
                 screen.blit(boss_text, boss_rect)
                 
             # Instruction to return to menu
-            esc_text = stats_font.render('Press ESC for main menu', True, WHITE)
+            esc_text = render_text('Press ESC for main menu', stats_size, WHITE)
             esc_rect = esc_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 50))
             screen.blit(esc_text, esc_rect)
-            
-            # Draw animated stars around the screen
-            if 'win_stars' not in globals():
-                # Create star positions first time
-                global win_stars
-                win_stars = []
-                for _ in range(20):
-                    star = {
-                        'x': random.randint(0, SCREEN_WIDTH),
-                        'y': random.randint(0, SCREEN_HEIGHT),
-                        'size': random.randint(2, 6),
-                        'speed': random.uniform(0.5, 2.0)
-                    }
-                    win_stars.append(star)
-                    
-            # Update and draw stars
-            for star in win_stars:
-                # Move star
-                star['y'] += star['speed']
-                if star['y'] > SCREEN_HEIGHT:
-                    star['y'] = 0
-                    star['x'] = random.randint(0, SCREEN_WIDTH)
-                
-                # Draw star
-                pygame.draw.circle(screen, GOLD, (int(star['x']), int(star['y'])), star['size'])
-                
-                # Draw tail
-                pygame.draw.line(
-                    screen, 
-                    GOLD, 
-                    (int(star['x']), int(star['y'])), 
-                    (int(star['x']), int(star['y'] - star['size'] * 3)),
-                    1
-                )
 
-        pygame.display.flip()
-        clock.tick(60)
+        # Cutscenes draw over the finished frame
+        if scene is not None:
+            scene.draw(screen)
+        profiler.lap("hud")
+
+        if show_profiler:
+            profiler_overlay.draw(screen)
+            profiler.lap("overlay")
+
+        renderer.present()
+        camera.restore()
+        profiler.lap("present")
+        profiler.end_frame()
+        if watchdog:
+            watchdog.frame_finished()
+        if memdiag:
+            memdiag.frame_finished()
+        clock.tick(frame_rate_limit)
 
     # Quit game
+    if args.headless:
+        seconds = time.perf_counter() - start_time
+        print(f"Headless run: {frames_run} frames, {tick_count} ticks in {seconds:.2f} s "
+              f"({tick_count / max(seconds, 1e-9):.0f} ticks/s), score {player.score}")
+    if render:
+        renderer.print_stats()
+        text_stats = get_text_cache_stats()
+        print(f"Text cache: {text_stats['strings']} strings in {text_stats['fonts']} fonts, "
+              f"{text_stats['digit_atlases']} digit atlases")
+        background_stats = background.get_stats()
+        print(f"Background: {background_stats['resident_chunks']} chunks resident "
+              f"({background_stats['solid_chunks']} solid colour, {background_stats['bytes'] / 1024:.0f} KiB), "
+              f"{background_stats['chunk_loads']} loads, {background_stats['chunk_evictions']} evictions")
+        parallax_stats = background_stats["parallax"]
+        print(f"Parallax: {parallax_stats['layers']} layers, {parallax_stats['bytes'] / 1024:.0f} KiB of strips")
+        layer_stats = static_layer.get_stats()
+        print(f"Static layer: {layer_stats['sprites']} sprites in {layer_stats['chunks']} chunks, "
+              f"{layer_stats['baked_chunks']} baked ({layer_stats['bytes'] / 1024:.0f} KiB), "
+              f"{layer_stats['bakes']} bakes, {layer_stats['evictions']} evictions")
+    pool_stats = fireball_pool.get_stats()
+    if pool_stats["shots"]:
+        summary = (f"Fireball pool: {pool_stats['shots']} shots from {pool_stats['size']} fireballs, "
+                   f"{pool_stats['reuse_rate']:.0%} reused")
+        if not args.headless:
+            # The rate is per minute of real time, which headless runs race through
+            summary += f" ({pool_stats['allocations_avoided_per_minute']:.0f} allocations avoided per minute)"
+        print(summary)
+    sprite_stats = all_sprites.get_stats()
+    print(f"Sprites: {sprite_stats['static']} static, {sprite_stats['dynamic']} moving")
+    ambient_stats = ambient.get_stats()
+    visible = ambient_stats.pop("visible")
+    print("Ambient: " + ", ".join(f"{count} {kind}" for kind, count in ambient_stats.items()) +
+          f", {visible} drawn last frame")
+    particle_stats = particles.get_stats()
+    print(f"Particles: {particle_stats['emitted']} emitted, {particle_stats['dropped']} dropped over the "
+          f"budget of {particle_stats['budget']}, {particle_stats['live']} live, "
+          f"{particle_stats['images']} cached images")
+    scheduler_stats = scheduler.get_stats()
+    phases = "; ".join(f"{phase}: " + ", ".join(f"{count} {section}" for section, count in sections.items())
+                       for phase, sections in scheduler_stats["entities"].items() if sections)
+    print(f"Scheduler: {scheduler_stats['ticks']} ticks; {phases}")
+    gc_manager.print_report()
+    gc_manager.close()
+    if memdiag:
+        memdiag.print_report()
+        memdiag.close()
+    if watchdog:
+        watchdog.stop()
+        stats = watchdog.get_stats()
+        print(f"Watchdog: {stats['hitches']} hitches over {args.hitch_budget:g} ms in {stats['frames']} frames, "
+              f"{stats['samples']} stack samples written to {args.watchdog}")
+    if args.trace:
+        print(f"Trace: {profiler.tracer.get_stats()['events']} events written to {args.trace}")
+        stop_tracing()
+    # The cache is kept across level resets; drop the shared surfaces before the display goes
+    clear_image_cache()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,154 @@
+import pygame
+import numpy as np
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, convert_surface, per_tick
+
+# Particles live in a box this much larger than the screen so they can drift in from the edges
+AMBIENT_MARGIN = 64
+AMBIENT_BOX_WIDTH = SCREEN_WIDTH + AMBIENT_MARGIN * 2
+AMBIENT_BOX_HEIGHT = SCREEN_HEIGHT + AMBIENT_MARGIN * 2
+
+# Per kind: velocity ranges (pixels per 60 Hz tick), parallax depth range, vertical band
+# (fraction of the box height) and how strongly it sways
+AMBIENT_KINDS = {
+    "cloud": {"vx": (0.1, 0.3), "vy": (0.0, 0.0), "depth": (0.3, 0.6), "band": (0.1, 0.4), "sway": 0.0},
+    "pollen": {"vx": (-0.4, 0.4), "vy": (-0.2, 0.2), "depth": (0.8, 1.2), "band": (0.0, 1.0), "sway": 0.3},
+    "rain": {"vx": (1.0, 2.0), "vy": (8.0, 12.0), "depth": (1.0, 1.3), "band": (0.0, 1.0), "sway": 0.0},
+}
+# Particles spawned by default when a level is built
+DEFAULT_AMBIENT = {"cloud": 6, "pollen": 150}
+SWAY_RATE = per_tick(0.05)  # Radians the sway advances per tick
+
+
+def create_ambient_image(kind):
+    """Draw the small image shared by every particle of a kind"""
+    if kind == "cloud":
+        img = pygame.Surface((60, 30), pygame.SRCALPHA)
+        color = (250, 250, 250, 180)
+        pygame.draw.ellipse(img, color, (0, 8, 60, 22))
+        pygame.draw.circle(img, color, (22, 12), 12)
+        pygame.draw.circle(img, color, (38, 10), 10)
+    elif kind == "pollen":
+        img = pygame.Surface((4, 4), pygame.SRCALPHA)
+        pygame.draw.circle(img, (255, 240, 150, 200), (2, 2), 2)
+    else:
+        img = pygame.Surface((2, 10), pygame.SRCALPHA)
+        img.fill((170, 190, 255, 150))
+    return convert_surface(img)
+
+
+class AmbientField:
+    """Clouds, pollen and rain stored as NumPy arrays.
+
+    Positions wrap inside a box slightly larger than the screen and are
+    shifted by the camera scroll times each particle's depth, so the number
+    of particles does not depend on the width of the world. Movement,
+    wraparound and the visibility test are whole-array operations and the
+    visible particles are drawn with one blits call. snapshot() keeps the
+    positions before a tick so draw() can place the particles between the
+    last two ticks.
+    """
+    def __init__(self):
+        self.kind_names = list(AMBIENT_KINDS)
+        self.images = {}
+        self.x = np.zeros(0, dtype=np.float32)
+        self.y = np.zeros(0, dtype=np.float32)
+        self.previous_x = self.x  # Positions at the start of the tick
+        self.previous_y = self.y
+        self.velocity_x = np.zeros(0, dtype=np.float32)
+        self.velocity_y = np.zeros(0, dtype=np.float32)
+        self.depth = np.zeros(0, dtype=np.float32)
+        self.phase = np.zeros(0, dtype=np.float32)
+        self.sway = np.zeros(0, dtype=np.float32)
+        self.kind = np.zeros(0, dtype=np.int8)
+        self.time = 0
+        self.visible_count = 0
+
+    def __len__(self):
+        return len(self.x)
+
+    def count(self, kind):
+        return int(np.count_nonzero(self.kind == self.kind_names.index(kind)))
+
+    def spawn(self, kind, count):
+        """Add particles of a kind at random places in the box"""
+        if count <= 0:
+            return
+        spec = AMBIENT_KINDS[kind]
+        if kind not in self.images:
+            self.images[kind] = create_ambient_image(kind)
+        rng = np.random.default_rng()
+        band_top, band_bottom = spec["band"]
+        self.x = np.concatenate((self.x, rng.uniform(0, AMBIENT_BOX_WIDTH, count).astype(np.float32)))
+        self.y = np.concatenate((self.y, rng.uniform(band_top * AMBIENT_BOX_HEIGHT,
+                                                     band_bottom * AMBIENT_BOX_HEIGHT,
+                                                     count).astype(np.float32)))
+        self.velocity_x = np.concatenate((self.velocity_x, rng.uniform(*map(per_tick, spec["vx"]), count).astype(np.float32)))
+        self.velocity_y = np.concatenate((self.velocity_y, rng.uniform(*map(per_tick, spec["vy"]), count).astype(np.float32)))
+        self.depth = np.concatenate((self.depth, rng.uniform(*spec["depth"], count).astype(np.float32)))
+        self.phase = np.concatenate((self.phase, rng.uniform(0, np.pi * 2, count).astype(np.float32)))
+        self.sway = np.concatenate((self.sway, np.full(count, per_tick(spec["sway"]), dtype=np.float32)))
+        self.kind = np.concatenate((self.kind, np.full(count, self.kind_names.index(kind), dtype=np.int8)))
+
+    def remove(self, mask):
+        keep = ~mask
+        for name in ("x", "y", "velocity_x", "velocity_y", "depth", "phase", "sway", "kind"):
+            setattr(self, name, getattr(self, name)[keep])
+
+    def set_density(self, kind, count):
+        """Spawn or drop particles so a kind has exactly count of them"""
+        current = self.count(kind)
+        if count > current:
+            self.spawn(kind, count - current)
+        elif count < current:
+            matches = np.flatnonzero(self.kind == self.kind_names.index(kind))
+            mask = np.zeros(len(self.x), dtype=bool)
+            mask[matches[count:]] = True
+            self.remove(mask)
+
+    def clear(self):
+        self.remove(np.ones(len(self.x), dtype=bool))
+
+    def snapshot(self):
+        """Remember where the particles are before a simulation tick"""
+        self.previous_x = self.x.copy()
+        self.previous_y = self.y.copy()
+
+    def update(self):
+        """Move every particle and wrap it around the box in one step"""
+        self.time += 1
+        self.visible_count = 0
+        self.x += self.velocity_x
+        self.y += self.velocity_y + self.sway * np.sin(self.phase + self.time * SWAY_RATE)
+        np.mod(self.x, AMBIENT_BOX_WIDTH, out=self.x)
+        np.mod(self.y, AMBIENT_BOX_HEIGHT, out=self.y)
+
+    def draw(self, surface, camera, kinds=None, alpha=1.0):
+        """Draw the particles (optionally only some kinds) with a single blits call,
+        alpha of the way from the last tick"""
+        if not len(self.x):
+            return
+        x, y = self.x, self.y
+        if alpha < 1.0 and len(self.previous_x) == len(x):
+            # Particles that wrapped around the box jump straight to where they are
+            step_x, step_y = x - self.previous_x, y - self.previous_y
+            x = np.where(np.abs(step_x) < AMBIENT_BOX_WIDTH / 2, self.previous_x + step_x * alpha, x)
+            y = np.where(np.abs(step_y) < AMBIENT_BOX_HEIGHT / 2, self.previous_y + step_y * alpha, y)
+        screen_x = np.mod(x + camera.scroll_x * self.depth, AMBIENT_BOX_WIDTH) - AMBIENT_MARGIN
+        screen_y = y - AMBIENT_MARGIN
+        shown = ((screen_x > -AMBIENT_MARGIN) & (screen_x < SCREEN_WIDTH) &
+                 (screen_y > -AMBIENT_MARGIN) & (screen_y < SCREEN_HEIGHT))
+        if kinds is not None:
+            shown &= np.isin(self.kind, [self.kind_names.index(kind) for kind in kinds])
+        visible = np.flatnonzero(shown)
+        self.visible_count += len(visible)
+        images = [self.images.get(name) for name in self.kind_names]
+        surface.blits([(images[kind], (x, y)) for kind, x, y in zip(
+            self.kind[visible].tolist(),
+            screen_x[visible].astype(np.int32).tolist(),
+            screen_y[visible].astype(np.int32).tolist())], doreturn=False)
+
+    def get_stats(self):
+        """Return the particle count per kind and how many were drawn last frame"""
+        stats = {name: self.count(name) for name in self.kind_names}
+        stats["visible"] = self.visible_count  # Drawn since the last update
+        return stats
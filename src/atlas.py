@@ -0,0 +1,192 @@
+import pygame
+import os
+import json
+import sys
+
+# Add the parent directory to path so we can run the baker directly
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.constants import (
+    assets_dir, PLAYER_WIDTH, PLAYER_HEIGHT, ENEMY_WIDTH, ENEMY_HEIGHT,
+    COIN_SIZE, BOSS_WIDTH, BOSS_HEIGHT, SPIKE_WIDTH, SPIKE_HEIGHT,
+    RED, PURPLE, YELLOW
+)
+from src.constants import convert_surface, is_display_format
+
+# Baked atlas files (created by running `python -m src.atlas`)
+ATLAS_IMAGE_PATH = os.path.join(assets_dir, "atlas.png")
+ATLAS_INDEX_PATH = os.path.join(assets_dir, "atlas.json")
+ATLAS_MAX_WIDTH = 1024
+ATLAS_PADDING = 1  # Empty pixels between frames to avoid bleeding
+
+# Placeholder images drawn by load_image: (name, width, height, color), with
+# the colors the game asks for, as the color is part of the frame key
+LOAD_IMAGE_FRAMES = [
+    ("player_walk1.png", PLAYER_WIDTH, PLAYER_HEIGHT, None),
+    ("player_walk2.png", PLAYER_WIDTH, PLAYER_HEIGHT, None),
+    ("player_jump.png", PLAYER_WIDTH, PLAYER_HEIGHT, None),
+    ("player_idle.png", PLAYER_WIDTH, PLAYER_HEIGHT, None),
+    ("enemy_walk1.png", ENEMY_WIDTH, ENEMY_HEIGHT, RED),
+    ("enemy_walk2.png", ENEMY_WIDTH, ENEMY_HEIGHT, RED),
+    ("enemy_walk1.png", ENEMY_WIDTH, ENEMY_HEIGHT, PURPLE),
+    ("enemy_walk2.png", ENEMY_WIDTH, ENEMY_HEIGHT, PURPLE),
+    ("turtle_walk1.png", ENEMY_WIDTH, ENEMY_HEIGHT, (0, 150, 0)),
+    ("turtle_walk2.png", ENEMY_WIDTH, ENEMY_HEIGHT, (0, 150, 0)),
+    ("turtle_shell.png", ENEMY_WIDTH - 10, ENEMY_HEIGHT - 10, (150, 100, 50)),
+    ("coin1.png", COIN_SIZE, COIN_SIZE, YELLOW),
+    ("coin2.png", COIN_SIZE, COIN_SIZE, YELLOW),
+    ("coin3.png", COIN_SIZE, COIN_SIZE, YELLOW),
+    ("coin4.png", COIN_SIZE, COIN_SIZE, YELLOW),
+    ("boss_idle1.png", BOSS_WIDTH, BOSS_HEIGHT, RED),
+    ("boss_idle2.png", BOSS_WIDTH, BOSS_HEIGHT, RED),
+    ("boss_attack1.png", BOSS_WIDTH, BOSS_HEIGHT, RED),
+    ("boss_attack2.png", BOSS_WIDTH, BOSS_HEIGHT, RED),
+    ("boss_attack3.png", BOSS_WIDTH, BOSS_HEIGHT, RED),
+    ("boss_hurt.png", BOSS_WIDTH, BOSS_HEIGHT, PURPLE),
+    ("boss_projectile.png", 20, 20, (255, 100, 0)),
+]
+
+# Loaded atlas state
+_atlas_surface = None
+_atlas_rects = None  # Frame key -> pygame.Rect inside the atlas
+_atlas_enabled = True
+
+
+def frame_key(name, width, height, color=None):
+    """Build the atlas index key for a frame, like load_image's cache key"""
+    key = f"{name}@{width}x{height}"
+    if color is not None:
+        key += "#" + "".join(f"{channel:02x}" for channel in color)
+    return key
+
+
+def get_frame(key):
+    """Return the baked frame for a key as an atlas subsurface, or None"""
+    if not _atlas_enabled:
+        return None
+    if _atlas_rects is None:
+        load_atlas()
+    rect = _atlas_rects.get(key)
+    if rect is None:
+        return None
+    return _atlas_surface.subsurface(rect)
+
+
+def get_atlas_surface():
+    """Return the loaded atlas image (the parent of every baked frame), or None"""
+    return _atlas_surface
+
+
+def load_atlas():
+    """Load the baked atlas image and index (a single image decode)"""
+    global _atlas_surface, _atlas_rects
+    _atlas_rects = {}
+    try:
+        if not (os.path.exists(ATLAS_IMAGE_PATH) and os.path.exists(ATLAS_INDEX_PATH)):
+            return False
+        with open(ATLAS_INDEX_PATH, "r") as file:
+            index = json.load(file)
+        _atlas_surface = convert_surface(pygame.image.load(ATLAS_IMAGE_PATH), alpha=True)
+        _atlas_rects = {key: pygame.Rect(rect) for key, rect in index["frames"].items()}
+        return True
+    except Exception as e:
+        print(f"Could not load sprite atlas: {e}")
+        _atlas_surface = None
+        _atlas_rects = {}
+        return False
+
+
+def convert_atlas():
+    """Convert an atlas loaded before the display existed to the display format"""
+    global _atlas_surface
+    if _atlas_surface is not None and not is_display_format(_atlas_surface):
+        _atlas_surface = convert_surface(_atlas_surface, alpha=True)
+
+
+def collect_frames():
+    """Render every procedurally drawn frame once and return {key: surface}"""
+    # Import here to avoid circular imports
+    from src.constants import _create_image
+    from src.fireball import Fireball
+    from src.powerup import PowerUp
+    from src.background import Tree
+    from src.spike import Spike
+
+    frames = {}
+    for name, width, height, color in LOAD_IMAGE_FRAMES:
+        frames[frame_key(name, width, height, color)] = _create_image(name, width, height, color)
+
+    for i in range(Fireball.frame_count):
+        frames[frame_key(f"fireball_{i}", Fireball.size, Fireball.size)] = \
+            Fireball.create_fireball_image(Fireball.size, Fireball.size, i)
+
+    for type_name in ("mushroom", "star", "flower"):
+        for i, frame in enumerate(PowerUp.create_animation_frames(type_name)):
+            frames[frame_key(f"powerup_{type_name}_{i}", frame.get_width(), frame.get_height())] = frame
+
+    for width, height in Tree.size_map.values():
+        for foliage_type in Tree.foliage_types:
+            frames[frame_key(f"tree_{foliage_type}", width, height)] = \
+                Tree.create_tree_image(width, height, foliage_type)
+
+    frames[frame_key("spike", SPIKE_WIDTH, SPIKE_HEIGHT)] = \
+        Spike.create_spike_image(SPIKE_WIDTH, SPIKE_HEIGHT)
+
+    return frames
+
+
+def pack_frames(frames, max_width=ATLAS_MAX_WIDTH, padding=ATLAS_PADDING):
+    """Shelf-pack frames into rows, tallest first. Returns ({key: rect}, size)"""
+    order = sorted(frames, key=lambda key: (-frames[key].get_height(), key))
+    rects = {}
+    x = y = shelf_height = atlas_width = 0
+    for key in order:
+        width, height = frames[key].get_size()
+        if x and x + width > max_width:
+            # Start a new shelf
+            y += shelf_height + padding
+            x = shelf_height = 0
+        rects[key] = pygame.Rect(x, y, width, height)
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+        atlas_width = max(atlas_width, x)
+    return rects, (max(1, atlas_width), max(1, y + shelf_height))
+
+
+def bake_atlas(image_path=ATLAS_IMAGE_PATH, index_path=ATLAS_INDEX_PATH):
+    """Render all frames into a packed atlas PNG plus a JSON index of sub-rects"""
+    global _atlas_enabled
+    pygame.font.init()  # Boss placeholders draw a text label
+
+    # Always bake from the drawing code, never from a previously baked atlas
+    _atlas_enabled = False
+    try:
+        frames = collect_frames()
+    finally:
+        _atlas_enabled = True
+
+    rects, size = pack_frames(frames)
+    atlas = pygame.Surface(size, pygame.SRCALPHA)
+    atlas.fill((0, 0, 0, 0))
+    for key, rect in rects.items():
+        atlas.blit(frames[key], rect)
+
+    pygame.image.save(atlas, image_path)
+    with open(index_path, "w") as file:
+        json.dump({
+            "image": os.path.basename(image_path),
+            "size": list(size),
+            "frames": {key: list(rect) for key, rect in sorted(rects.items())},
+        }, file)
+
+    # Make the next lookup pick up the freshly baked files
+    load_atlas()
+    return len(rects), size
+
+
+if __name__ == "__main__":
+    # Bake through the imported module so the entity modules share its state
+    from src import atlas
+    count, size = atlas.bake_atlas()
+    print(f"Baked {count} frames into {atlas.ATLAS_IMAGE_PATH} ({size[0]}x{size[1]})")
+    print(f"Index written to {atlas.ATLAS_INDEX_PATH}")
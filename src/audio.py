@@ -1,5 +1,6 @@
 import pygame
 import os
+import numpy as np
 from src.constants import assets_dir
 
 # Initialize sound variables
@@ -11,6 +12,8 @@ game_over_sound = None
 star_sound = None
 current_music = None
 music_volume = 0.5
+# Victory fanfare as (frame offset, sound) cues, prepared by load_victory_sounds()
+victory_cues = []
 
 def initialize_sounds():
     """Initialize all game sounds"""
@@ -124,4 +127,37 @@ def play_music(track, loop=True):
             pygame.mixer.music.set_volume(music_volume)
             pygame.mixer.music.play(-1 if loop else 0)
         except:
-            print(f"Could not play music track: {track}") 
\ No newline at end of file
+            print(f"Could not play music track: {track}") 
+
+def create_beep(frequency, duration=0.15, volume=0.2):
+    """Synthesize a short sine beep in the mixer's format"""
+    rate, size, channels = pygame.mixer.get_init()
+    if size != -16:
+        raise ValueError(f"Unsupported mixer sample size {size}")
+    t = np.arange(int(rate * duration)) / rate
+    wave = (np.sin(2 * np.pi * frequency * t) * 16383).astype(np.int16)
+    if channels > 1:
+        wave = np.repeat(wave[:, None], channels, axis=1)
+    sound = pygame.sndarray.make_sound(np.ascontiguousarray(wave))
+    sound.set_volume(volume)
+    return sound
+
+def load_victory_sounds():
+    """Load the victory fanfare, or synthesize a three-beep jingle, ahead of time"""
+    global victory_cues
+    victory_cues = []
+    if not pygame.mixer.get_init():
+        return victory_cues
+    try:
+        victory_path = os.path.join(assets_dir, "victory.wav")
+        if os.path.exists(victory_path):
+            victory_sound = pygame.mixer.Sound(victory_path)
+            victory_sound.set_volume(0.7)
+            victory_cues = [(0, victory_sound)]
+        else:
+            # Beeps 200 ms (12 frames) apart
+            victory_cues = [(i * 12, create_beep(frequency))
+                            for i, frequency in enumerate((523, 659, 784))]
+    except Exception as e:
+        print(f"Could not prepare victory sounds: {e}")
+    return victory_cues
@@ -1,56 +1,186 @@
 import pygame
 import random
 import math
+import os
 from src.constants import (
-    WORLD_WIDTH, SCREEN_HEIGHT, SKY_BLUE, WHITE, BROWN, 
+    WORLD_WIDTH, SCREEN_WIDTH, SCREEN_HEIGHT, SKY_BLUE, WHITE, BROWN, 
     DARK_GREEN, BLACK
 )
-from src.constants import load_image
+from src.constants import load_image, convert_surface, assets_dir, per_tick
+from src.atlas import get_frame, frame_key
+from src.parallax import (
+    ParallaxBackground, ParallaxLayer, PARALLAX_STRIP_WIDTH,
+    create_mountain_strip, create_hill_strip, create_cloud_strip
+)
+
+# The sky is split into columns of this width, created only near the camera
+BACKGROUND_CHUNK_WIDTH = 512
+BACKGROUND_PRELOAD_CHUNKS = 1  # Chunks kept ready on each side of the view
+BACKGROUND_EVICT_CHUNKS = 3  # Chunks further than this from the view are dropped
+
 
 class Background:
-    def __init__(self):
-        self.image = load_image("background.png", WORLD_WIDTH, SCREEN_HEIGHT, SKY_BLUE)
-        self.clouds = [
-            {"x": random.randint(0, WORLD_WIDTH), "y": random.randint(50, 200), "speed": random.uniform(0.2, 0.5)}
-            for _ in range(15)  # More clouds for a larger world
-        ]
+    """Sky split into fixed-width chunks that are built lazily and evicted when far away.
+
+    A chunk comes from assets/background_<index>.png if that file exists,
+    otherwise from assets/background.png repeated horizontally. With neither
+    file the sky is a solid colour and chunks are stored as None and drawn
+    with a fill, so memory does not grow with the width of the world.
+    Mountains, hills and clouds are parallax layers drawn over the sky.
+    """
+    chunk_width = BACKGROUND_CHUNK_WIDTH
+
+    def __init__(self, world_width=WORLD_WIDTH):
+        self.world_width = world_width
+        self.color = SKY_BLUE
+        self.tile = self.load_tile()
+        self.chunks = {}  # Chunk index -> surface, or None for a solid colour chunk
+        self.chunk_loads = 0
+        self.chunk_evictions = 0
         self.cloud_img = load_image("cloud.png", 100, 50, WHITE)
-        self.rect = pygame.Rect(0, 0, WORLD_WIDTH, SCREEN_HEIGHT)
+        self.parallax = self.create_parallax()
+        self.rect = pygame.Rect(0, 0, world_width, SCREEN_HEIGHT)
 
-    def update(self):
-        for cloud in self.clouds:
-            cloud["x"] += cloud["speed"]
-            if cloud["x"] > WORLD_WIDTH:
-                cloud["x"] = -100
-                cloud["y"] = random.randint(50, 200)
+    def create_parallax(self):
+        """Build the depth layers, furthest first"""
+        width = PARALLAX_STRIP_WIDTH
+        return ParallaxBackground([
+            ParallaxLayer("mountains", create_mountain_strip(width, 260, (150, 170, 200)),
+                          0.2, y=SCREEN_HEIGHT - 260),
+            ParallaxLayer("far_clouds", create_cloud_strip(width, 120, self.cloud_img, 5),
+                          0.3, y=40, drift=0.15),
+            ParallaxLayer("hills", create_hill_strip(width, 160, (110, 180, 110)),
+                          0.5, y=SCREEN_HEIGHT - 160),
+            ParallaxLayer("clouds", create_cloud_strip(width, 150, self.cloud_img, 8),
+                          0.8, y=50, drift=0.35),
+        ])
+
+    def load_tile(self):
+        """Load the repeating background image scaled to the screen height, if there is one"""
+        path = os.path.join(assets_dir, "background.png")
+        if not os.path.exists(path):
+            return None
+        try:
+            img = pygame.image.load(path)
+        except pygame.error as e:
+            print(f"Could not load background: {e}")
+            return None
+        width = max(1, img.get_width() * SCREEN_HEIGHT // img.get_height())
+        # The background is opaque, so drop the alpha channel for faster blits
+        return convert_surface(pygame.transform.scale(img, (width, SCREEN_HEIGHT)), alpha=False)
+
+    def build_chunk(self, index):
+        """Create one chunk surface, or None when the chunk is plain sky colour"""
+        self.chunk_loads += 1
+        path = os.path.join(assets_dir, f"background_{index}.png")
+        if os.path.exists(path):
+            try:
+                img = pygame.image.load(path)
+                return convert_surface(pygame.transform.scale(img, (self.chunk_width, SCREEN_HEIGHT)), alpha=False)
+            except pygame.error as e:
+                print(f"Could not load background chunk {index}: {e}")
+        if self.tile is None:
+            return None
+
+        chunk = pygame.Surface((self.chunk_width, SCREEN_HEIGHT))
+        tile_width = self.tile.get_width()
+        x = -(index * self.chunk_width % tile_width)
+        while x < self.chunk_width:
+            chunk.blit(self.tile, (x, 0))
+            x += tile_width
+        return convert_surface(chunk, alpha=False)
+
+    def get_chunk(self, index):
+        if index not in self.chunks:
+            self.chunks[index] = self.build_chunk(index)
+        return self.chunks[index]
+
+    def visible_chunks(self, camera):
+        """Return the first and last chunk index under the camera"""
+        left = -round(camera.scroll_x)
+        return left // self.chunk_width, (left + SCREEN_WIDTH - 1) // self.chunk_width
+
+    def stream_chunks(self, camera):
+        """Build the chunks next to the view and drop the ones far away from it"""
+        first, last = self.visible_chunks(camera)
+        last_chunk = (self.world_width - 1) // self.chunk_width
+        for index in range(max(0, first - BACKGROUND_PRELOAD_CHUNKS),
+                           min(last_chunk, last + BACKGROUND_PRELOAD_CHUNKS) + 1):
+            self.get_chunk(index)
+        for index in list(self.chunks):
+            if index < first - BACKGROUND_EVICT_CHUNKS or index > last + BACKGROUND_EVICT_CHUNKS:
+                del self.chunks[index]
+                self.chunk_evictions += 1
+
+    def update(self, camera=None):
+        self.parallax.update()
+        if camera is not None:
+            self.stream_chunks(camera)
 
     def draw(self, surface, camera):
-        # Draw the visible portion of the background
-        visible_rect = camera.apply_rect(self.rect)
-        surface.blit(self.image, visible_rect)
-        
-        # Draw clouds that are visible in the current view
-        for cloud in self.clouds:
-            cloud_rect = pygame.Rect(cloud["x"], cloud["y"], 100, 50)
-            if visible_rect.x + camera.width > cloud_rect.x > visible_rect.x - 100:
-                surface.blit(self.cloud_img, (cloud_rect.x + camera.scroll_x, cloud_rect.y))
+        self.draw_sky(surface, camera)
+        self.draw_clouds(surface, camera)
+
+    def draw_sky(self, surface, camera):
+        # Draw only the chunks under the camera
+        scroll_x = round(camera.scroll_x)
+        first, last = self.visible_chunks(camera)
+        for index in range(first, last + 1):
+            chunk = self.get_chunk(index)
+            x = index * self.chunk_width + scroll_x
+            if chunk is None:
+                surface.fill(self.color, (x, 0, self.chunk_width, SCREEN_HEIGHT))
+            else:
+                surface.blit(chunk, (x, 0))
+        # Layers that only move with the camera belong to the sky
+        self.parallax.draw(surface, camera, drifting=False)
+
+    def draw_clouds(self, surface, camera):
+        # Cloud layers drift on their own, so they change even when the camera is still
+        self.parallax.draw(surface, camera, drifting=True)
+
+    def get_stats(self):
+        """Return how many chunks are resident, how many are solid colour and their memory"""
+        surfaces = [chunk for chunk in self.chunks.values() if chunk is not None]
+        return {
+            "resident_chunks": len(self.chunks),
+            "solid_chunks": len(self.chunks) - len(surfaces),
+            "chunk_loads": self.chunk_loads,
+            "chunk_evictions": self.chunk_evictions,
+            "bytes": sum(chunk.get_width() * chunk.get_height() * chunk.get_bytesize()
+                         for chunk in surfaces),
+            "parallax": self.parallax.get_stats(),
+        }
 
 
 class Tree(pygame.sprite.Sprite):
+    size_map = {
+        'small': (60, 80),
+        'medium': (80, 120),
+        'large': (100, 150)
+    }
+    foliage_types = ('pine', 'oak')
+    static = True  # Never moves, so it is baked into the static layer
+
     def __init__(self, x, y, size='medium'):
         super().__init__()
-        self.size_map = {
-            'small': (60, 80),
-            'medium': (80, 120),
-            'large': (100, 150)
-        }
         width, height = self.size_map.get(size, (80, 120))
         self.image = self.create_tree_image(width, height)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.bottom = y  # Bottom of tree anchors at y
     
-    def create_tree_image(self, width, height):
+    @staticmethod
+    def create_tree_image(width, height, foliage_type=None):
+        # Draw foliage (triangular for pine tree or circular for oak)
+        if foliage_type is None:
+            foliage_type = random.choice(Tree.foliage_types)
+
+        # Use the pre-baked tree from the sprite atlas when available
+        baked = get_frame(frame_key(f"tree_{foliage_type}", width, height))
+        if baked is not None:
+            return baked
+
         img = pygame.Surface((width, height), pygame.SRCALPHA)
         
         # Draw trunk
@@ -59,8 +189,7 @@ class Tree(pygame.sprite.Sprite):
         trunk_x = (width - trunk_width) // 2
         pygame.draw.rect(img, BROWN, (trunk_x, height - trunk_height, trunk_width, trunk_height))
         
-        # Draw foliage (triangular for pine tree or circular for oak)
-        foliage_type = random.choice(['pine', 'oak'])
+        # Draw the foliage
         if foliage_type == 'pine':
             # Pine tree with multiple triangles
             for i in range(3):
@@ -78,10 +207,12 @@ class Tree(pygame.sprite.Sprite):
             foliage_radius = width // 2
             pygame.draw.circle(img, DARK_GREEN, (width // 2, height - trunk_height - foliage_radius), foliage_radius)
         
-        return img
+        return convert_surface(img)
 
 
 class Bush(pygame.sprite.Sprite):
+    static = True
+
     def __init__(self, x, y, size='medium'):
         super().__init__()
         self.size_map = {
@@ -107,7 +238,7 @@ class Bush(pygame.sprite.Sprite):
             green_shade = (0, random.randint(100, 180), 0)
             pygame.draw.circle(img, green_shade, (x, y), radius)
         
-        return img
+        return convert_surface(img)
 
 
 class Cloud(pygame.sprite.Sprite):
@@ -118,7 +249,7 @@ class Cloud(pygame.sprite.Sprite):
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
-        self.speed = random.uniform(0.2, 0.5)
+        self.speed = per_tick(random.uniform(0.2, 0.5))
     
     def create_cloud_image(self, width, height):
         img = pygame.Surface((width, height), pygame.SRCALPHA)
@@ -134,7 +265,7 @@ class Cloud(pygame.sprite.Sprite):
         pygame.draw.circle(img, cloud_color, (center_x - width // 3, center_y - height // 4), height // 3)
         pygame.draw.circle(img, cloud_color, (center_x + width // 3, center_y - height // 4), height // 3)
         
-        return img
+        return convert_surface(img)
     
     def update(self):
         self.rect.x += self.speed
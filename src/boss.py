@@ -1,17 +1,25 @@
 import pygame
 import random
 import math
+import numpy as np
 from src.constants import (
     SCREEN_WIDTH, SCREEN_HEIGHT, GRAVITY, PURPLE, RED, YELLOW, 
     BOSS_WIDTH, BOSS_HEIGHT, BOSS_HEALTH
 )
-from src.constants import load_image
+from src.constants import load_image, ticks, per_tick, per_tick_squared, per_tick_fraction
+from src.text import render_text
+from src.tracing import trace_event
+from src.scheduler import COLLISION
 
 # Cache for projectile images to avoid recreation on every frame
 projectile_image_cache = {}
 
 class Boss(pygame.sprite.Sprite):
     """Boss enemy with multiple attack patterns and health bar"""
+    # Acts on where the player ended up after the level's collisions
+    update_phase = COLLISION
+    update_section = "boss"
+
     def __init__(self, x, y):
         super().__init__()
         
@@ -36,31 +44,34 @@ class Boss(pygame.sprite.Sprite):
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
+        # What update() chases and lands on when no arguments are given
+        self.target = None
+        self.platforms = None
         
         # Movement and physics
         self.velocity_x = 0
         self.velocity_y = 0
         self.direction = -1  # -1 left, 1 right
-        self.speed = 2.0      # Reduced base speed for easier dodging
-        self.jump_force = -12  # Less aggressive jump
+        self.speed = per_tick(2.0)  # Reduced base speed for easier dodging
+        self.jump_force = per_tick(-12)  # Less aggressive jump
         
         # Animation variables
         self.animation_index = 0
         self.animation_timer = 0
-        self.animation_speed = 8  # Faster animation
+        self.animation_speed = ticks(8)  # Faster animation
         self.current_animation = "idle"
         
         # Attack variables
         self.attacking = False
         self.attack_timer = 0
-        self.attack_cooldown = 120  # Longer cooldown between attacks (easier)
-        self.attack_duration = 60   # How long an attack lasts
+        self.attack_cooldown = ticks(120)  # Longer cooldown between attacks (easier)
+        self.attack_duration = ticks(60)  # How long an attack lasts
         self.current_attack = "none"
         self.stomped = False
         self.stomp_timer = 0
         self.invulnerable = False
         self.invulnerable_timer = 0
-        self.vulnerability_time = 90  # Longer vulnerability time after being hit
+        self.vulnerability_time = ticks(90)  # Longer vulnerability time after being hit
         
         # Health and state
         self.health = BOSS_HEALTH
@@ -73,7 +84,7 @@ class Boss(pygame.sprite.Sprite):
         self.rage_timer = 0     # Timer for rage mode effects
         
         # Projectiles and special attacks
-        self.projectiles = pygame.sprite.Group()
+        self.projectiles = BossProjectileManager()
         self.attack_pattern = ["jump", "throw", "charge", "stomp", "spin"]  # Added spin attack
         self.current_pattern_index = 0
         
@@ -91,6 +102,9 @@ class Boss(pygame.sprite.Sprite):
         self.weak_spot_timer = 0
     
     def update(self, player=None, platforms=None):
+        # The scheduler calls update() without arguments
+        player = player or self.target
+        platforms = platforms or self.platforms
         if self.defeated:
             # Death animation would go here
             return
@@ -108,20 +122,20 @@ class Boss(pygame.sprite.Sprite):
             
         # Make weak spot flash
         self.weak_spot_timer += 1
-        self.weak_spot_visible = self.weak_spot_timer % 30 < 20
+        self.weak_spot_visible = self.weak_spot_timer % ticks(30) < ticks(20)
             
         # Check if boss should enter rage mode
         if not self.rage_mode and self.health <= self.max_health // 3:
             self.rage_mode = True
             self.speed *= 1.2  # Reduced rage speed increase (easier)
-            self.attack_cooldown = 100  # Less cooldown reduction in rage mode
+            self.attack_cooldown = ticks(100)  # Less cooldown reduction in rage mode
             # Visual indication of rage mode
-            self.flash_timer = 30
+            self.flash_timer = ticks(30)
             
         # Handle rage mode effects - reduce frequency of updates
         if self.rage_mode:
             self.rage_timer += 1
-            if self.rage_timer % 120 < 60 and self.rage_timer % 4 == 0:  # Reduced frequency
+            if self.rage_timer % ticks(120) < ticks(60) and self.rage_timer % ticks(4) == 0:  # Reduced frequency
                 # Randomly shake during rage mode
                 self.shake_offset = [random.randint(-2, 2), random.randint(-2, 2)]
             else:
@@ -142,7 +156,7 @@ class Boss(pygame.sprite.Sprite):
             self.stomped = False
             
             # Create shockwave when landing from a high jump
-            if self.current_attack == "jump" and self.attack_timer > 30 and len(self.projectiles) < self.max_projectiles:
+            if self.current_attack == "jump" and self.attack_timer > ticks(30) and len(self.projectiles) < self.max_projectiles:
                 self.create_shockwave()
         
         # Check platform collisions
@@ -159,7 +173,7 @@ class Boss(pygame.sprite.Sprite):
                 # Reset velocity after attack
                 self.velocity_x = 0
                 # Add recovery period after attack (easier)
-                self.attack_cooldown += 30
+                self.attack_cooldown += ticks(30)
         elif self.attack_cooldown > 0:
             self.attack_cooldown -= 1
         
@@ -173,7 +187,7 @@ class Boss(pygame.sprite.Sprite):
         # Handle stomp status
         if self.stomped:
             self.stomp_timer += 1
-            if self.stomp_timer >= 45:  # Longer stun time (easier)
+            if self.stomp_timer >= ticks(45):  # Longer stun time (easier)
                 self.stomped = False
                 self.stomp_timer = 0
                 # Jump after being stomped
@@ -193,7 +207,7 @@ class Boss(pygame.sprite.Sprite):
                 # Choose attack if cooldown is done
                 if self.attack_cooldown <= 0 and self.health > 0:
                     # Less aggressive in phases and rage mode (easier)
-                    attack_chance = 0.005 * self.phase * (1.5 if self.rage_mode else 1)
+                    attack_chance = per_tick_fraction(0.005 * self.phase * (1.5 if self.rage_mode else 1))
                     if random.random() < attack_chance:
                         self.choose_attack(player)
         
@@ -209,29 +223,11 @@ class Boss(pygame.sprite.Sprite):
         else:
             self.animate("idle")
             
-        # Update projectiles - only update a subset per frame if there are many
-        projectile_count = len(self.projectiles)
-        if projectile_count > 0:
-            # Dynamically adjust update frequency based on projectile count
-            for i, projectile in enumerate(list(self.projectiles)):
-                # Always update projectiles that are close to the screen edges
-                off_screen = (projectile.rect.right < 50 or
-                            projectile.rect.left > SCREEN_WIDTH - 50 or
-                            projectile.rect.bottom < 50 or
-                            projectile.rect.top > SCREEN_HEIGHT - 50)
-                
-                # For many projectiles, stagger updates to improve performance
-                if off_screen or i % max(1, projectile_count // 10) == 0:
-                    if not projectile.update():
-                        self.projectiles.remove(projectile)
-                
-            # Limit total projectiles for performance
-            if projectile_count > self.max_projectiles:
-                # Remove the oldest projectiles
-                for _ in range(projectile_count - self.max_projectiles):
-                    if self.projectiles:
-                        oldest = next(iter(self.projectiles))
-                        self.projectiles.remove(oldest)
+        # Update all projectiles in one batched step
+        self.projectiles.update()
+        
+        # Limit total projectiles for performance
+        self.projectiles.cull_oldest(self.max_projectiles)
                 
         # Keep boss within screen bounds
         if self.rect.left < 50:
@@ -271,13 +267,13 @@ class Boss(pygame.sprite.Sprite):
                     self.image = self.hurt_frame
                     
         # Flash when invulnerable - reduce frequency for performance
-        if self.invulnerable and self.animation_timer % 4 < 2:
+        if self.invulnerable and self.animation_timer % ticks(4) < ticks(2):
             self.image.set_alpha(150)
         else:
             self.image.set_alpha(255)
             
         # Flash red when in rage mode - reduce frequency for performance
-        if self.rage_mode and self.flash_timer > 0 and self.flash_timer % 6 < 3:
+        if self.rage_mode and self.flash_timer > 0 and self.flash_timer % ticks(6) < ticks(3):
             # Use a more efficient method than creating a new surface every frame
             if not hasattr(self, 'rage_image') or self.animation_timer == 0:
                 # Only create the rage image when needed
@@ -311,11 +307,12 @@ class Boss(pygame.sprite.Sprite):
             self.spin_attack()
             
         # Set cooldown - longer in all phases (easier)
-        self.attack_cooldown = max(90, 150 - (self.phase * 15))
+        self.attack_cooldown = ticks(max(90, 150 - (self.phase * 15)))
         if self.rage_mode:
-            self.attack_cooldown = max(60, self.attack_cooldown // 1.5)  # Less cooldown reduction
+            self.attack_cooldown = max(ticks(60), self.attack_cooldown // 1.5)  # Less cooldown reduction
             
         self.current_attack = attack_type
+        trace_event("boss_attack", attack=attack_type, phase=self.phase, projectiles=len(self.projectiles))
         
     def jump_attack(self):
         """Jump high and land heavily"""
@@ -346,16 +343,15 @@ class Boss(pygame.sprite.Sprite):
             
             for i in range(num_projectiles):
                 angle = base_angle + (i - num_projectiles // 2) * angle_step
-                speed = 4 + self.phase  # Slower projectiles (easier)
+                speed = per_tick(4 + self.phase)  # Slower projectiles (easier)
                 
                 # Create projectile
-                projectile = BossProjectile(
+                self.projectiles.spawn(
                     self.rect.centerx, 
                     self.rect.centery,
                     speed * math.cos(angle),
                     speed * math.sin(angle)
                 )
-                self.projectiles.add(projectile)
         else:
             # Normal throw attack - more spread (easier to dodge)
             for i in range(num_projectiles):
@@ -364,16 +360,15 @@ class Boss(pygame.sprite.Sprite):
                                   player.rect.centerx - self.rect.centerx)
                 angle += random.uniform(-0.5, 0.5)  # More spread (easier)
                 
-                speed = 4 + self.phase  # Slower projectiles (easier)
+                speed = per_tick(4 + self.phase)  # Slower projectiles (easier)
                 
                 # Create projectile
-                projectile = BossProjectile(
+                self.projectiles.spawn(
                     self.rect.centerx, 
                     self.rect.centery,
                     speed * math.cos(angle),
                     speed * math.sin(angle)
                 )
-                self.projectiles.add(projectile)
     
     def charge_attack(self, player):
         """Rush toward the player"""
@@ -384,7 +379,7 @@ class Boss(pygame.sprite.Sprite):
             self.direction = -1
             
         # Set velocity for charge - slower in rage mode (easier)
-        charge_speed = 8 + (self.phase * 1.5)  # Slower charge (easier)
+        charge_speed = per_tick(8 + (self.phase * 1.5))  # Slower charge (easier)
         if self.rage_mode:
             charge_speed *= 1.2  # Less rage boost (easier)
             
@@ -405,7 +400,7 @@ class Boss(pygame.sprite.Sprite):
             needed_vel_x = distance / jump_time
             
             # Cap the horizontal velocity - slower (easier)
-            max_vel = 6 + (self.phase * 1.0)
+            max_vel = per_tick(6 + (self.phase * 1.0))
             if self.rage_mode:
                 max_vel *= 1.1
                 
@@ -428,7 +423,7 @@ class Boss(pygame.sprite.Sprite):
             
         # Spin motion effect
         self.velocity_x = 0
-        self.velocity_y = -4  # Smaller hop during spin
+        self.velocity_y = per_tick(-4)  # Smaller hop during spin
         
         # Create projectiles in all directions - fewer (easier)
         num_projectiles = min(6 + (self.phase * 1), 12)
@@ -445,15 +440,14 @@ class Boss(pygame.sprite.Sprite):
         
         for i in range(num_projectiles):
             angle = i * angle_step
-            speed = 4 + (self.phase * 0.5)  # Slower projectiles (easier)
+            speed = per_tick(4 + (self.phase * 0.5))  # Slower projectiles (easier)
             
-            projectile = BossProjectile(
+            self.projectiles.spawn(
                 self.rect.centerx,
                 self.rect.centery,
                 speed * math.cos(angle),
                 speed * math.sin(angle)
             )
-            self.projectiles.add(projectile)
             
     def create_shockwave(self):
         """Create a shockwave of projectiles when landing from a high jump"""
@@ -470,18 +464,17 @@ class Boss(pygame.sprite.Sprite):
         if num_projectiles <= 0:
             return
             
-        speed = 4 + (self.phase * 0.5)  # Slower projectiles (easier)
+        speed = per_tick(4 + (self.phase * 0.5))  # Slower projectiles (easier)
         
         for i in range(num_projectiles):
             angle = 2 * math.pi * i / num_projectiles
             # Ground level projectiles (horizontal path)
-            projectile = BossProjectile(
+            self.projectiles.spawn(
                 self.rect.centerx, 
                 self.rect.bottom - 5,
                 speed * math.cos(angle),
-                min(-1.5, speed * math.sin(angle))  # Bias upward slightly
+                min(per_tick(-1.5), speed * math.sin(angle))  # Bias upward slightly
             )
-            self.projectiles.add(projectile)
             
     def take_damage(self):
         """Boss takes damage"""
@@ -499,17 +492,17 @@ class Boss(pygame.sprite.Sprite):
             if not self.rage_mode and self.health <= self.max_health // 3:
                 self.rage_mode = True
                 self.speed *= 1.2  # Less speed boost in rage mode (easier)
-                self.attack_cooldown = 80  # Less reduction in cooldown (easier)
-                self.flash_timer = 30
+                self.attack_cooldown = ticks(80)  # Less reduction in cooldown (easier)
+                self.flash_timer = ticks(30)
             
             # Check if defeated
             if self.health <= 0:
                 self.defeated = True
                 # Clear all projectiles when defeated
-                self.projectiles.empty()
+                self.projectiles.clear()
                 
             # Visual effects when damaged
-            self.flash_timer = 15
+            self.flash_timer = ticks(15)
                 
             return True
         return False
@@ -524,7 +517,7 @@ class Boss(pygame.sprite.Sprite):
                     self.velocity_y = 0
                     
                     # Create shockwave when landing from a high jump
-                    if self.current_attack == "jump" and self.attack_timer > 30 and len(self.projectiles) < self.max_projectiles:
+                    if self.current_attack == "jump" and self.attack_timer > ticks(30) and len(self.projectiles) < self.max_projectiles:
                         self.create_shockwave()
                 # Top collision
                 elif self.velocity_y < 0 and self.rect.top < platform.rect.bottom:
@@ -573,8 +566,7 @@ class Boss(pygame.sprite.Sprite):
         
         # Add phase indicator
         phase_text = f"Phase {self.phase}"
-        font = pygame.font.Font(None, 20)
-        text_surface = font.render(phase_text, True, (255, 255, 255))
+        text_surface = render_text(phase_text, 20, (255, 255, 255))
         text_rect = text_surface.get_rect(midtop=(bar_x + bar_width // 2, bar_y - 15))
         surface.blit(text_surface, text_rect)
         
@@ -583,54 +575,137 @@ class Boss(pygame.sprite.Sprite):
             pygame.draw.circle(surface, (255, 255, 0), self.weak_spot_rect.center, 10)
             pygame.draw.circle(surface, (255, 0, 0), self.weak_spot_rect.center, 5)
 
-class BossProjectile(pygame.sprite.Sprite):
-    """Projectile fired by the boss"""
-    def __init__(self, x, y, vel_x, vel_y):
-        super().__init__()
-        
+class BossProjectileManager:
+    """All boss projectiles, kept in preallocated arrays with a free list.
+
+    Positions, velocities, ages and rotations live in NumPy arrays so every
+    live projectile is moved, aged and culled in one batched step.
+    """
+    size = 20  # Hitbox and sprite size in pixels
+    gravity = per_tick_squared(0.15)  # More gravity (easier)
+    max_age = ticks(120)  # 2 seconds - shorter lifespan (easier)
+    rotation_period = ticks(3)  # Ticks between rotation steps
+
+    def __init__(self, capacity=512):
+        self.capacity = capacity
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.previous_x = np.zeros(capacity)  # Positions at the start of the tick, for drawing
+        self.previous_y = np.zeros(capacity)
+        self.velocity_x = np.zeros(capacity)
+        self.velocity_y = np.zeros(capacity)
+        self.age = np.zeros(capacity, dtype=np.int32)
+        self.rotation = np.zeros(capacity)
+        self.rotation_speed = np.zeros(capacity)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self.free = list(range(capacity - 1, -1, -1))  # Pop from the end gives low slots first
+        self.count = 0
+
         # Use cached images for better performance
-        rotation_key = 0  # Start with no rotation
-        if rotation_key not in projectile_image_cache:
-            projectile_image_cache[rotation_key] = load_image("boss_projectile.png", 20, 20, (255, 100, 0))
-        
-        self.image = projectile_image_cache[rotation_key]
-        self.rect = self.image.get_rect()
-        self.rect.center = (x, y)
-        self.velocity_x = vel_x
-        self.velocity_y = vel_y
-        self.rotation = 0
-        self.rotation_speed = random.randint(5, 15)
-        self.age = 0
-        self.max_age = 120  # 2 seconds at 60fps - shorter lifespan (easier)
-        
+        if 0 not in projectile_image_cache:
+            projectile_image_cache[0] = load_image("boss_projectile.png", self.size, self.size, (255, 100, 0))
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, x, y, vel_x, vel_y):
+        """Fire a projectile centred on (x, y). Returns False when the arrays are full"""
+        if not self.free:
+            return False
+        i = self.free.pop()
+        self.x[i] = self.previous_x[i] = x
+        self.y[i] = self.previous_y[i] = y
+        self.velocity_x[i] = vel_x
+        self.velocity_y[i] = vel_y
+        self.age[i] = 0
+        self.rotation[i] = 0
+        self.rotation_speed[i] = random.randint(5, 15)
+        self.alive[i] = True
+        self.count += 1
+        return True
+
+    def kill(self, mask):
+        """Remove every live projectile selected by a boolean mask"""
+        dead = np.flatnonzero(mask & self.alive)
+        if len(dead):
+            self.alive[dead] = False
+            self.free.extend(dead.tolist())
+            self.count -= len(dead)
+        return len(dead)
+
+    def clear(self):
+        """Remove all projectiles"""
+        self.alive[:] = False
+        self.free = list(range(self.capacity - 1, -1, -1))
+        self.count = 0
+
+    def snapshot(self):
+        """Remember where the projectiles are before a simulation tick"""
+        self.previous_x[:] = self.x
+        self.previous_y[:] = self.y
+
     def update(self):
-        """Update projectile position"""
-        self.rect.x += self.velocity_x
-        self.rect.y += self.velocity_y
-        
+        """Move, age and rotate all projectiles, then cull the expired ones"""
+        if not self.count:
+            return
+        # Dead slots are updated too; they are overwritten on spawn anyway
+        self.x += self.velocity_x
+        self.y += self.velocity_y
         # Add gravity to projectiles for more realistic arcs
-        self.velocity_y += 0.15  # More gravity (easier)
-        
-        # Rotate the projectile for visual effect - but less frequently
+        self.velocity_y += self.gravity
         self.age += 1
-        if self.age % 3 == 0:  # Only update rotation every 3 frames
-            self.rotation = (self.rotation + self.rotation_speed) % 360
-            
-            # Use image cache for rotated images
-            rotation_key = self.rotation // 15 * 15  # Round to nearest 15 degrees for caching
-            if rotation_key not in projectile_image_cache:
-                projectile_image_cache[rotation_key] = pygame.transform.rotate(
-                    projectile_image_cache[0], rotation_key
-                )
-            
-            self.image = projectile_image_cache[rotation_key]
-            
-        # Check for off-screen or max age to remove projectile
-        if (self.rect.right < 0 or 
-            self.rect.left > SCREEN_WIDTH or 
-            self.rect.bottom < 0 or 
-            self.rect.top > SCREEN_HEIGHT + 50 or
-            self.age > self.max_age):
-            return False
-            
-        return True 
\ No newline at end of file
+        # Rotate the projectile for visual effect - but only every 3 frames
+        rotating = self.age % self.rotation_period == 0
+        self.rotation[rotating] = (self.rotation[rotating] + self.rotation_speed[rotating]) % 360
+
+        # Cull off-screen or old projectiles in bulk
+        half = self.size / 2
+        expired = ((self.x + half < 0) |
+                   (self.x - half > SCREEN_WIDTH) |
+                   (self.y + half < 0) |
+                   (self.y - half > SCREEN_HEIGHT + 50) |
+                   (self.age > self.max_age))
+        self.kill(expired)
+
+    def cull_oldest(self, limit):
+        """Remove the oldest projectiles until at most `limit` remain"""
+        excess = self.count - limit
+        if excess <= 0:
+            return
+        live = np.flatnonzero(self.alive)
+        oldest = live[np.argsort(-self.age[live], kind="stable")[:excess]]
+        mask = np.zeros(self.capacity, dtype=bool)
+        mask[oldest] = True
+        self.kill(mask)
+
+    def collide_rect(self, rect, kill=True):
+        """Count projectiles overlapping a rect, removing them if kill is True"""
+        if not self.count:
+            return 0
+        half = self.size / 2
+        hits = (self.alive &
+                (self.x - half < rect.right) & (self.x + half > rect.left) &
+                (self.y - half < rect.bottom) & (self.y + half > rect.top))
+        if kill:
+            return self.kill(hits)
+        return int(np.count_nonzero(hits))
+
+    def draw(self, surface, camera, alpha=1.0):
+        """Draw every live projectile with a single blits call, alpha of the way from the last tick"""
+        if not self.count:
+            return
+        live = np.flatnonzero(self.alive)
+        x = self.previous_x + (self.x - self.previous_x) * alpha
+        y = self.previous_y + (self.y - self.previous_y) * alpha
+        scroll_x = round(camera.scroll_x)
+        # Round to nearest 15 degrees so rotated images can be cached
+        rotation_keys = (self.rotation[live] // 15 * 15).astype(int)
+        blit_list = []
+        for i, rotation_key in zip(live.tolist(), rotation_keys.tolist()):
+            image = projectile_image_cache.get(rotation_key)
+            if image is None:
+                image = pygame.transform.rotate(projectile_image_cache[0], rotation_key)
+                projectile_image_cache[rotation_key] = image
+            blit_list.append((image, (int(x[i]) - image.get_width() // 2 + scroll_x,
+                                      int(y[i]) - image.get_height() // 2)))
+        surface.blits(blit_list, doreturn=False)
@@ -8,6 +8,8 @@ class Camera:
         self.height = height
         self.scroll_x = 0
         self.target_scroll_x = 0  # Target position for smooth scrolling
+        self.previous_scroll_x = 0  # Scroll at the start of the current simulation tick
+        self.simulated_scroll_x = None  # Real scroll while an interpolated one is drawn
     
     def update(self, target):
         # Calculate target scroll position
@@ -20,11 +22,30 @@ class Camera:
         # Smooth scrolling - interpolate between current and target position
         self.scroll_x += (self.target_scroll_x - self.scroll_x) * CAMERA_SMOOTH_FACTOR
     
+    def snapshot(self):
+        """Remember the scroll before a simulation tick, to interpolate from it"""
+        self.previous_scroll_x = self.scroll_x
+
+    def interpolate(self, alpha):
+        """Set the scroll between the last two ticks for drawing; restore() undoes it"""
+        self.simulated_scroll_x = self.scroll_x
+        self.scroll_x = self.previous_scroll_x + (self.scroll_x - self.previous_scroll_x) * alpha
+
+    def restore(self):
+        if self.simulated_scroll_x is not None:
+            self.scroll_x = self.simulated_scroll_x
+            self.simulated_scroll_x = None
+
     def apply(self, entity):
         # Round scroll value to avoid pixel jittering
         scroll_x_rounded = round(self.scroll_x)
         return pygame.Rect(entity.rect.x + scroll_x_rounded, entity.rect.y, entity.rect.width, entity.rect.height)
 
+    def view_rect(self, margin=0):
+        """Return the world-space area on screen, grown by a margin on every side"""
+        return pygame.Rect(-round(self.scroll_x) - margin, -margin,
+                           SCREEN_WIDTH + margin * 2, self.height + margin * 2)
+
     def apply_rect(self, rect):
         # Round scroll value to avoid pixel jittering
         scroll_x_rounded = round(self.scroll_x)
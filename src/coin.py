@@ -1,28 +1,82 @@
-import pygame
-from src.constants import COIN_SIZE, YELLOW
-from src.constants import load_image
-
-class Coin(pygame.sprite.Sprite):
-    def __init__(self, x, y):
-        super().__init__()
-        # Create animation frames
+import random
+from itertools import repeat
+import numpy as np
+from src.constants import COIN_SIZE, YELLOW, SCREEN_HEIGHT
+from src.constants import load_image, ticks
+
+class CoinField:
+    """All the coins of a level, stored as NumPy arrays instead of sprites.
+
+    Coins are kept sorted by x so drawing and pickup only look at the slice
+    of the level around the camera or the player. All coins share one
+    global animation phase.
+    """
+    animation_delay = ticks(10)  # Ticks per animation step
+
+    def __init__(self, positions=()):
         self.frames = [
             load_image("coin1.png", COIN_SIZE, COIN_SIZE, YELLOW),
             load_image("coin2.png", COIN_SIZE, COIN_SIZE, YELLOW),
             load_image("coin3.png", COIN_SIZE, COIN_SIZE, YELLOW),
             load_image("coin4.png", COIN_SIZE, COIN_SIZE, YELLOW)
         ]
-        self.image = self.frames[0]
-        self.rect = self.image.get_rect()
-        self.rect.x = x
-        self.rect.y = y
         self.animation_index = 0
         self.animation_timer = 0
+        self.set_positions(positions)
+
+    def set_positions(self, positions):
+        """Replace all coins with new ones at the given (x, y) positions"""
+        coords = np.array(positions, dtype=np.int32).reshape(-1, 2)
+        order = np.argsort(coords[:, 0], kind="stable")
+        self.x = coords[order, 0]
+        self.y = coords[order, 1]
+        self.collected = np.zeros(len(self.x), dtype=bool)
+        self.remaining = len(self.x)
+
+    def spawn_random(self, count, world_width):
+        """Replace all coins with `count` coins scattered over the world"""
+        self.set_positions([
+            (random.randint(0, world_width - COIN_SIZE), random.randint(100, SCREEN_HEIGHT - 100))
+            for _ in range(count)
+        ])
+
+    def __len__(self):
+        return self.remaining
+
+    def span(self, left, right):
+        """Index range of the coins whose x lies within [left - COIN_SIZE, right)"""
+        start = np.searchsorted(self.x, left - COIN_SIZE, side="right")
+        end = np.searchsorted(self.x, right, side="left")
+        return start, end
 
     def update(self):
-        # Animate coin
+        # Animate all coins at once
         self.animation_timer += 1
-        if self.animation_timer > 10:
+        if self.animation_timer > self.animation_delay:
             self.animation_timer = 0
             self.animation_index = (self.animation_index + 1) % len(self.frames)
-            self.image = self.frames[self.animation_index] 
\ No newline at end of file
+
+    def collect(self, rect):
+        """Collect every coin overlapping rect and return how many were picked up"""
+        start, end = self.span(rect.left, rect.right)
+        if start >= end:
+            return 0
+        y = self.y[start:end]
+        hits = ~self.collected[start:end] & (y < rect.bottom) & (y + COIN_SIZE > rect.top)
+        count = int(np.count_nonzero(hits))
+        if count:
+            self.collected[start:end] |= hits
+            self.remaining -= count
+        return count
+
+    def draw(self, surface, camera):
+        """Draw the coins inside the camera view with a single blits call"""
+        scroll_x = round(camera.scroll_x)
+        start, end = self.span(-scroll_x, -scroll_x + surface.get_width())
+        if start >= end:
+            return
+        visible = np.flatnonzero(~self.collected[start:end]) + start
+        # The (image, position) pairs are zipped in C, so the renderer can pass them
+        # to the screen's blits as they are
+        positions = zip((self.x[visible] + scroll_x).tolist(), self.y[visible].tolist())
+        surface.blits(zip(repeat(self.frames[self.animation_index]), positions), doreturn=False)
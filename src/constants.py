@@ -9,23 +9,57 @@ PLAYER_HEIGHT = 60
 COIN_SIZE = 20
 ENEMY_WIDTH = 40
 ENEMY_HEIGHT = 40
-GRAVITY = 0.6  # Reduced for smoother falling
-JUMP_FORCE = -13  # Adjusted for smoother jumps
-PLAYER_SPEED = 7  # Slightly reduced for more challenge
-PLAYER_ACCELERATION = 1.0  # Reduced for more challenge
-PLAYER_DECELERATION = 0.9  # Adjusted for more responsiveness but more challenge
-ENEMY_SPEED = 2.0  # Increased for more challenge
+
+# Timing. Speeds, accelerations and durations below are per simulation tick and tuned
+# at 60 ticks a second; MARIO_TICK_RATE picks another rate and the helpers rescale them
+BASE_TICK_RATE = 60  # Tick rate the per-tick values are tuned for
+TICK_RATE_ENV = "MARIO_TICK_RATE"  # Environment variable overriding TICK_RATE
+TICK_RATE = int(os.environ.get(TICK_RATE_ENV, BASE_TICK_RATE))  # Simulation ticks per second
+TICK_SCALE = BASE_TICK_RATE / TICK_RATE  # 60 Hz ticks that pass in one tick
+MAX_TICKS_PER_FRAME = 5  # A slow frame runs at most this many ticks, then drops the backlog
+FRAME_RATE_LIMIT = 60  # Most frames drawn per second, 0 for no limit
+
+# At 60 Hz the helpers return their argument unchanged, so the default game is exact
+def ticks(count):
+    """Convert a duration or period counted in 60 Hz ticks to ticks at TICK_RATE"""
+    if TICK_SCALE == 1 or not count:
+        return count
+    return max(1, round(count / TICK_SCALE))
+
+def per_tick(value):
+    """Convert a speed (or anything else added once per tick) tuned at 60 Hz"""
+    return value if TICK_SCALE == 1 else value * TICK_SCALE
+
+def per_tick_squared(value):
+    """Convert an acceleration (added to a speed once per tick) tuned at 60 Hz"""
+    return value if TICK_SCALE == 1 else value * TICK_SCALE ** 2
+
+def per_tick_factor(factor):
+    """Convert a factor a value is multiplied by once per tick, such as friction"""
+    return factor if TICK_SCALE == 1 else factor ** TICK_SCALE
+
+def per_tick_fraction(fraction):
+    """Convert a fraction of the way to a target covered (or a chance rolled) once per tick"""
+    return fraction if TICK_SCALE == 1 else 1 - (1 - fraction) ** TICK_SCALE
+
+GRAVITY = per_tick_squared(0.6)  # Reduced for smoother falling
+JUMP_FORCE = per_tick(-13)  # Adjusted for smoother jumps
+STOMP_BOUNCE = per_tick(-10)  # Upward speed after stomping an enemy or the boss
+PLAYER_SPEED = per_tick(7)  # Slightly reduced for more challenge
+PLAYER_ACCELERATION = per_tick_squared(1.0)  # Reduced for more challenge
+PLAYER_DECELERATION = per_tick_factor(0.9)  # Adjusted for more responsiveness but more challenge
+ENEMY_SPEED = per_tick(2.0)  # Increased for more challenge
 ENEMY_SIZE = 40
 MAX_JUMPS = 1  # Reduced to single jump for more challenge
 SPIKE_WIDTH = 30
 SPIKE_HEIGHT = 20
-MOVING_PLATFORM_SPEED = 1.5  # Increased for more challenge
-CAMERA_SMOOTH_FACTOR = 0.1  # New constant for camera smoothing
+MOVING_PLATFORM_SPEED = per_tick(1.5)  # Increased for more challenge
+CAMERA_SMOOTH_FACTOR = per_tick_fraction(0.1)  # New constant for camera smoothing
 POWERUP_SIZE = 30
 MAX_LIVES = 2  # Reduced lives for more challenge
-INVINCIBILITY_DURATION = 90  # Reduced invincibility duration
-STAR_DURATION = 300  # Reduced star power duration (5 seconds at 60fps)
-SCORE_MULTIPLIER_DURATION = 200  # Reduced score multiplier duration
+INVINCIBILITY_DURATION = ticks(90)  # Reduced invincibility duration
+STAR_DURATION = ticks(300)  # Reduced star power duration (5 seconds at 60fps)
+SCORE_MULTIPLIER_DURATION = ticks(200)  # Reduced score multiplier duration
 
 # Boss constants
 BOSS_WIDTH = 80
@@ -34,8 +68,8 @@ BOSS_HEALTH = 6   # Reduced from 10 for easier battles
 BOSS_ACTIVATION_DISTANCE = 800  # Distance at which boss activates
 
 # Shrinking platform constants
-SHRINK_DELAY = 60  # Frames before platform starts shrinking
-SHRINK_SPEED = 2   # Pixels to shrink per frame
+SHRINK_DELAY = ticks(60)  # Ticks before platform starts shrinking
+SHRINK_SPEED = per_tick(2)  # Pixels to shrink per tick
 MIN_PLATFORM_WIDTH = 20  # Minimum width before platform is removed
 
 # World dimensions (larger than screen)
@@ -60,8 +94,111 @@ GOLD = (255, 215, 0)
 assets_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets')
 os.makedirs(assets_dir, exist_ok=True)
 
+# Shared cache of loaded/generated images, keyed by (name, width, height, color).
+# Every entity of the same kind gets the same surface, so spawning 30 coins or
+# resetting the level no longer re-reads files or redraws placeholders.
+_image_cache = {}
+_image_cache_stats = {"hits": 0, "misses": 0}
+
 # Load images or create placeholders
 def load_image(name, width, height, color=None):
+    """Return the (shared) surface for an image, loading or drawing it on first use.
+
+    The returned surface is shared between all callers asking for the same
+    key, so copy it before drawing on it.
+    """
+    key = (name, width, height, color)
+    img = _image_cache.get(key)
+    if img is not None:
+        _image_cache_stats["hits"] += 1
+        return img
+
+    _image_cache_stats["misses"] += 1
+    # Prefer a frame from the pre-baked sprite atlas (already converted)
+    from src.atlas import get_frame, frame_key  # Import here to avoid circular imports
+    img = get_frame(frame_key(name, width, height, color))
+    if img is None:
+        # Convert to the display format once, if the display already exists
+        img = convert_surface(_create_image(name, width, height, color))
+    _image_cache[key] = img
+    return img
+
+def is_display_format(surface):
+    """Check whether a surface can be blitted to the display without conversion"""
+    display = pygame.display.get_surface() if pygame.display.get_init() else None
+    if display is None:
+        return True  # Nothing to compare against yet
+    return (surface.get_bytesize() == display.get_bytesize() and
+            surface.get_masks()[:3] == display.get_masks()[:3])
+
+def convert_surface(surface, alpha=None):
+    """Convert a surface to the display pixel format (no-op before the display exists).
+
+    Surfaces with per-pixel alpha keep it unless alpha=False is passed, which
+    is worth doing for fully opaque images such as the background.
+    """
+    if not pygame.display.get_init() or pygame.display.get_surface() is None:
+        return surface
+    if alpha is None:
+        alpha = bool(surface.get_flags() & pygame.SRCALPHA)
+    return surface.convert_alpha() if alpha else surface.convert()
+
+def finalize_assets():
+    """Convert every cached image to the display format.
+
+    Call this once after pygame.display.set_mode(), so images that were
+    loaded before the display existed don't pay a conversion on every blit.
+    """
+    from src.atlas import convert_atlas  # Import here to avoid circular imports
+    convert_atlas()
+    for key, img in _image_cache.items():
+        if not is_display_format(img):
+            _image_cache[key] = convert_surface(img)
+
+def pixel_owner(surface):
+    """Return the surface whose pixels a surface uses (a subsurface's top parent)"""
+    return surface.get_abs_parent()
+
+def pixel_bytes(surfaces):
+    """Pixel memory behind some surfaces, counting each owner's pixels once"""
+    owners = {id(owner): owner for owner in map(pixel_owner, surfaces)}
+    return sum(owner.get_width() * owner.get_height() * owner.get_bytesize()
+               for owner in owners.values())
+
+def get_image_cache_stats():
+    """Return hit/miss counts and memory use of the image cache.
+
+    bytes counts the pixels the cached images own. Frames cut from the sprite
+    atlas own none; the atlas itself is reported as atlas_bytes.
+    """
+    from src.atlas import get_atlas_surface  # Import here to avoid circular imports
+    atlas = get_atlas_surface()
+    own = [img for img in _image_cache.values() if atlas is None or pixel_owner(img) is not atlas]
+    hits = _image_cache_stats["hits"]
+    misses = _image_cache_stats["misses"]
+    total = hits + misses
+    return {
+        "entries": len(_image_cache),
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": hits / total if total else 0.0,
+        "bytes": pixel_bytes(own),
+        "atlas_frames": len(_image_cache) - len(own),
+        "atlas_bytes": pixel_bytes([atlas]) if atlas is not None else 0,
+    }
+
+def cached_images():
+    """Return every surface in the image cache"""
+    return list(_image_cache.values())
+
+def clear_image_cache():
+    """Drop every cached image and reset the statistics"""
+    _image_cache.clear()
+    _image_cache_stats["hits"] = 0
+    _image_cache_stats["misses"] = 0
+
+def _create_image(name, width, height, color=None):
+    """Load an image from the assets directory or draw a placeholder for it"""
     try:
         image_path = os.path.join(assets_dir, name)
         if os.path.exists(image_path):
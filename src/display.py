@@ -0,0 +1,59 @@
+import pygame
+from src.constants import is_display_format
+
+# Set MARIO_DEBUG_BLITS=1 to report surfaces that reach the screen unconverted
+DEBUG_BLITS_ENV = "MARIO_DEBUG_BLITS"
+
+
+class BlitCheckSurface(pygame.Surface):
+    """Off-screen frame buffer that reports blits of surfaces not in the display format.
+
+    Only used in debug mode: everything is drawn here first and copied to the
+    real display when the frame is presented.
+    """
+    def __init__(self, size):
+        super().__init__(size)
+        self.reported = set()  # Surface signatures that were already reported
+        self.unconverted_blits = 0
+
+    def check_source(self, source):
+        if is_display_format(source):
+            return
+        self.unconverted_blits += 1
+        signature = (source.get_size(), source.get_bytesize(), source.get_masks())
+        if signature not in self.reported:
+            self.reported.add(signature)
+            print(f"Unconverted surface blitted to screen: size={source.get_size()} "
+                  f"bytes/pixel={source.get_bytesize()} masks={source.get_masks()}")
+
+    def blit(self, source, *args, **kwargs):
+        self.check_source(source)
+        return super().blit(source, *args, **kwargs)
+
+    def blits(self, blit_sequence, *args, **kwargs):
+        blit_sequence = list(blit_sequence)
+        for item in blit_sequence:
+            self.check_source(item[0])
+        return super().blits(blit_sequence, *args, **kwargs)
+
+
+def create_screen(size, debug_blits=False):
+    """Open the window and return the surface the game should draw on"""
+    display = pygame.display.set_mode(size)
+    if debug_blits:
+        return BlitCheckSurface(size)
+    return display
+
+
+def present(screen, rects=None):
+    """Show the finished frame on the display, or only the given rects of it"""
+    display = pygame.display.get_surface()
+    if rects is None:
+        if screen is not display:
+            display.blit(screen, (0, 0))
+        pygame.display.flip()
+        return
+    if screen is not display:
+        for rect in rects:
+            display.blit(screen, rect, rect)
+    pygame.display.update(rects)
@@ -2,9 +2,14 @@ import pygame
 import random
 import math
 from src.constants import ENEMY_WIDTH, ENEMY_HEIGHT, ENEMY_SPEED, GRAVITY, SCREEN_HEIGHT, GREEN, PURPLE, RED
-from src.constants import load_image
+from src.constants import load_image, ticks, per_tick
+from src.scheduler import PHYSICS
 
 class Enemy(pygame.sprite.Sprite):
+    update_phase = PHYSICS
+    update_section = "enemies"
+    animation_delay = ticks(10)  # Ticks per animation step
+
     def __init__(self, x, y):
         super().__init__()
         # Create animation frames
@@ -40,7 +45,7 @@ class Enemy(pygame.sprite.Sprite):
             
         # Animate enemy
         self.animation_timer += 1
-        if self.animation_timer > 10:
+        if self.animation_timer > self.animation_delay:
             self.animation_timer = 0
             self.animation_index = (self.animation_index + 1) % len(self.frames)
             
@@ -81,6 +86,8 @@ class Enemy(pygame.sprite.Sprite):
             self.rect.x += self.direction * 10
 
 class PatrollingEnemy(Enemy):
+    animation_delay = ticks(8)  # Faster animation
+
     def __init__(self, x, y, patrol_points=None):
         super().__init__(x, y)
         self.frames = [
@@ -102,7 +109,7 @@ class PatrollingEnemy(Enemy):
         self.detection_range = 350  # Wider detection range
         self.can_jump = True  # Can jump to reach the player
         self.jump_cooldown = 0
-        self.max_jump_cooldown = 60  # Frames between jumps
+        self.max_jump_cooldown = ticks(60)  # Ticks between jumps
     
     def update(self):
         # Apply gravity
@@ -136,7 +143,7 @@ class PatrollingEnemy(Enemy):
         
         # Animate enemy
         self.animation_timer += 1
-        if self.animation_timer > 8:  # Faster animation
+        if self.animation_timer > self.animation_delay:
             self.animation_timer = 0
             self.animation_index = (self.animation_index + 1) % len(self.frames)
             
@@ -158,7 +165,7 @@ class PatrollingEnemy(Enemy):
             
             # Jump if player is above and we can jump
             if player.rect.y < self.rect.y - 20 and self.on_ground and self.can_jump and self.jump_cooldown == 0:
-                self.velocity_y = -10  # Jump
+                self.velocity_y = per_tick(-10)  # Jump
                 self.jump_cooldown = self.max_jump_cooldown
         else:
             self.spotted_player = False
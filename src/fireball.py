@@ -1,16 +1,28 @@
 import pygame
-from src.constants import load_image, ORANGE, RED, YELLOW
+from src.constants import load_image, convert_surface, ticks, per_tick, per_tick_squared, ORANGE, RED, YELLOW
+from src.atlas import get_frame, frame_key
+from src.scheduler import PHYSICS
+
+FIREBALL_SPEED = per_tick(10)  # Pixels per tick
 
 class Fireball(pygame.sprite.Sprite):
-    def __init__(self, x, y, direction, speed=10):
+    size = 10
+    frame_count = 4
+    update_phase = PHYSICS
+    update_section = "fireballs"
+    animation_delay = ticks(3)  # Fast animation
+    # Animation frames shared by every fireball (created by the first one)
+    frames = None
+
+    def __init__(self, x, y, direction, speed=FIREBALL_SPEED):
         super().__init__()
-        # Create fireball animation frames
-        self.frames = [
-            self.create_fireball_image(10, 10, 0),
-            self.create_fireball_image(10, 10, 1),
-            self.create_fireball_image(10, 10, 2),
-            self.create_fireball_image(10, 10, 3)
-        ]
+        if Fireball.frames is None:
+            Fireball.frames = self.load_frames()
+        self.pooled = False  # True while waiting in the FireballPool
+        self.reset(x, y, direction, speed)
+
+    def reset(self, x, y, direction, speed=FIREBALL_SPEED):
+        """Put the fireball back into its just-fired state (used when reusing it)"""
         self.image = self.frames[0]
         self.rect = self.image.get_rect()
         self.rect.x = x
@@ -22,9 +34,20 @@ class Fireball(pygame.sprite.Sprite):
         self.bounce_count = 0
         self.max_bounces = 3
         self.velocity_y = 0
-        self.gravity = 0.3
+        self.gravity = per_tick_squared(0.3)
         
-    def create_fireball_image(self, width, height, frame):
+    def load_frames(self):
+        """Get the animation frames from the baked atlas, drawing any that are missing"""
+        frames = []
+        for i in range(self.frame_count):
+            frame = get_frame(frame_key(f"fireball_{i}", self.size, self.size))
+            if frame is None:
+                frame = self.create_fireball_image(self.size, self.size, i)
+            frames.append(frame)
+        return frames
+
+    @staticmethod
+    def create_fireball_image(width, height, frame):
         """Create a fireball animation frame"""
         img = pygame.Surface((width, height), pygame.SRCALPHA)
         
@@ -58,7 +81,7 @@ class Fireball(pygame.sprite.Sprite):
             # Center hot point
             pygame.draw.circle(img, YELLOW, (width//2 + 1, height//2), width//6)
         
-        return img
+        return convert_surface(img)
         
     def update(self):
         # Move fireball horizontally
@@ -70,7 +93,7 @@ class Fireball(pygame.sprite.Sprite):
         
         # Animate fireball
         self.animation_timer += 1
-        if self.animation_timer > 3:  # Fast animation
+        if self.animation_timer > self.animation_delay:
             self.animation_timer = 0
             self.animation_index = (self.animation_index + 1) % len(self.frames)
             self.image = self.frames[self.animation_index]
@@ -78,7 +101,7 @@ class Fireball(pygame.sprite.Sprite):
     def bounce(self):
         """Make the fireball bounce when hitting the ground"""
         if self.bounce_count < self.max_bounces:
-            self.velocity_y = -5  # Bounce upward
+            self.velocity_y = per_tick(-5)  # Bounce upward
             self.bounce_count += 1
             return True
         else:
@@ -102,4 +125,52 @@ class Fireball(pygame.sprite.Sprite):
             self.rect.bottom = pygame.display.get_surface().get_height() - 10
             return self.bounce()  # Bounce and check if should continue
             
-        return True  # No collision or bounce successful 
\ No newline at end of file
+        return True  # No collision or bounce successful
+
+
+class FireballPool:
+    """Recycles spent fireballs instead of allocating a new sprite for every shot"""
+    def __init__(self):
+        self.free = []
+        self.created = 0   # Fireball objects ever allocated (the pool size)
+        self.reused = 0    # Shots served from the free list
+        self.start_time = None  # Ticks of the first shot, for per-minute rates
+
+    def acquire(self, x, y, direction, speed=FIREBALL_SPEED):
+        """Get a fireball ready to fire, reusing a spent one if possible"""
+        if self.start_time is None:
+            self.start_time = pygame.time.get_ticks()
+        if self.free:
+            fireball = self.free.pop()
+            fireball.reset(x, y, direction, speed)
+            self.reused += 1
+        else:
+            fireball = Fireball(x, y, direction, speed)
+            self.created += 1
+        fireball.pooled = False
+        return fireball
+
+    def release(self, fireball):
+        """Remove a spent fireball from all groups and keep it for reuse"""
+        fireball.kill()
+        if not fireball.pooled:
+            fireball.pooled = True
+            self.free.append(fireball)
+
+    def get_stats(self):
+        """Return pool size, reuse rate and allocations avoided per minute"""
+        shots = self.created + self.reused
+        minutes = 0
+        if self.start_time is not None:
+            minutes = (pygame.time.get_ticks() - self.start_time) / 60000
+        return {
+            "size": self.created,
+            "free": len(self.free),
+            "shots": shots,
+            "reuse_rate": self.reused / shots if shots else 0.0,
+            "allocations_avoided_per_minute": self.reused / minutes if minutes > 0 else 0.0,
+        }
+
+
+# Shared pool used by the player and the main loop
+fireball_pool = FireballPool()
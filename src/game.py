@@ -9,17 +9,21 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.player import Player
 from src.enemy import Enemy
 from src.turtle import Turtle
-from src.coin import Coin
 from src.platform import Platform, MovingPlatform
 from src.spike import Spike
 from src.background import Tree, Bush, Cloud, Background
 from src.powerup import PowerUp, LifeIcon
-from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WORLD_WIDTH, MAX_LIVES
+from src.fireball import fireball_pool
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, WORLD_WIDTH, MAX_LIVES, STOMP_BOUNCE
+from src.constants import ticks, per_tick
+from src.tracing import trace_event
 
-def handle_enemy_collision(player, enemy, enemies, all_sprites):
+def handle_enemy_collision(player, enemy, enemies, all_sprites, particles=None):
     """Handle collision between player and enemy"""
     # If player has star power, enemies can't hurt them
     if player.has_star:
+        if particles is not None:
+            particles.emit("stomp", *enemy.rect.center)
         enemies.remove(enemy)
         all_sprites.remove(enemy)
         player.score += 10 * player.score_multiplier
@@ -27,13 +31,15 @@ def handle_enemy_collision(player, enemy, enemies, all_sprites):
         
     # Check if player is above the enemy and falling (stomping)
     if player.rect.bottom < enemy.rect.centery and player.velocity_y > 0:
+        if particles is not None:
+            particles.emit("stomp", *enemy.rect.midtop)
         # For regular enemies
         if not isinstance(enemy, Turtle):
             # Kill enemy
             enemies.remove(enemy)
             all_sprites.remove(enemy)
             player.score += 5 * player.score_multiplier  # Apply score multiplier
-            player.velocity_y = -10  # Bounce after killing enemy
+            player.velocity_y = STOMP_BOUNCE  # Bounce after killing enemy
             player.jumps_left = player.max_jumps  # Reset jumps after killing enemy
             return False  # Not game over
         else:
@@ -42,7 +48,7 @@ def handle_enemy_collision(player, enemy, enemies, all_sprites):
                 # First jump puts turtle in shell
                 enemy.enter_shell()
                 player.score += 2 * player.score_multiplier  # Apply score multiplier
-                player.velocity_y = -10  # Bounce
+                player.velocity_y = STOMP_BOUNCE  # Bounce
                 player.jumps_left = player.max_jumps  # Reset jumps
                 return False  # Not game over
             else:
@@ -50,7 +56,7 @@ def handle_enemy_collision(player, enemy, enemies, all_sprites):
                 direction = 1 if player.rect.centerx > enemy.rect.centerx else -1
                 enemy.kick_shell(direction)
                 player.score += 1 * player.score_multiplier  # Apply score multiplier
-                player.velocity_y = -10  # Bounce after kicking
+                player.velocity_y = STOMP_BOUNCE  # Bounce after kicking
                 player.jumps_left = player.max_jumps  # Reset jumps
                 return False  # Not game over
     elif isinstance(enemy, Turtle) and enemy.in_shell:
@@ -69,6 +75,17 @@ def handle_enemy_collision(player, enemy, enemies, all_sprites):
             return True  # Return true to indicate damage
         return False  # Not game over if it's a turtle in shell state
 
+def update_enemy_ai(enemies, player, camera, platforms):
+    """Let every enemy look for the player and platform edges, and keep to its patrol range"""
+    for enemy in enemies:
+        enemy.detect_player(player, camera)
+        enemy.check_platform_edge(platforms)
+    
+        # Check for movement range boundaries
+        if hasattr(enemy, 'start_x') and hasattr(enemy, 'move_range'):
+            if enemy.rect.x > enemy.start_x + enemy.move_range or enemy.rect.x < enemy.start_x - enemy.move_range:
+                enemy.direction *= -1
+
 def reset_boss(boss, all_sprites):
     """Completely reset a boss to initial state"""
     if not boss:
@@ -90,12 +107,12 @@ def reset_boss(boss, all_sprites):
     boss.velocity_x = 0
     boss.velocity_y = 0
     boss.direction = -1
-    boss.speed = 3.0  # Reset to base speed
+    boss.speed = per_tick(3.0)  # Reset to base speed
     
     # Attack state
     boss.attacking = False
     boss.attack_timer = 0
-    boss.attack_cooldown = 90
+    boss.attack_cooldown = ticks(90)
     boss.stomped = False
     boss.stomp_timer = 0
     boss.invulnerable = False
@@ -113,14 +130,12 @@ def reset_boss(boss, all_sprites):
     boss.image = boss.idle_frames[0]
     
     # Clear projectiles
-    for projectile in boss.projectiles:
-        if projectile in all_sprites:
-            all_sprites.remove(projectile)
-    boss.projectiles.empty()
+    boss.projectiles.clear()
 
 def reset_game(all_sprites, enemies, coins, powerups, ui_elements, life_icons, platforms, moving_platforms,
                player, camera, enemy_positions, turtle_positions, powerup_positions, fireballs, boss=None):
     """Reset the game state"""
+    trace_event("reset_game")
     # Remove sound imports
     # Import sound objects inside function to ensure we get current values
     # from src.audio import jump_sound, coin_sound, powerup_sound, damage_sound, game_over_sound, star_sound
@@ -145,7 +160,7 @@ def reset_game(all_sprites, enemies, coins, powerups, ui_elements, life_icons, p
     player.invincibility_timer = 0
     player.score_multiplier = 1
     player.multiplier_timer = 0
-    player.image.set_alpha(255)  # Reset transparency
+    player.flash_visible = True  # Reset transparency
     
     # Reset player color to normal
     player.update_color(player.normal_color)
@@ -166,10 +181,7 @@ def reset_game(all_sprites, enemies, coins, powerups, ui_elements, life_icons, p
     
     # Recreate coins if needed
     if len(coins) == 0:
-        for _ in range(30):
-            coin = Coin(random.randint(0, camera.width - 20), random.randint(100, SCREEN_HEIGHT - 100))
-            all_sprites.add(coin)
-            coins.add(coin)
+        coins.spawn_random(30, camera.width)
     
     # Clear and recreate all enemies
     for enemy in enemies:
@@ -201,11 +213,10 @@ def reset_game(all_sprites, enemies, coins, powerups, ui_elements, life_icons, p
         all_sprites.add(powerup)
         powerups.add(powerup)
     
-    # Clear fireballs
+    # Clear fireballs and return them to the pool
     if fireballs:
-        for fireball in fireballs:
-            all_sprites.remove(fireball)
-        fireballs.empty()
+        for fireball in fireballs.sprites():
+            fireball_pool.release(fireball)
         
     # Reset boss if present
     if boss:
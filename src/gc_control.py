@@ -0,0 +1,112 @@
+import gc
+import time
+
+# GC modes: Python's defaults, defaults with pause accounting, or managed
+GC_AUTO = "auto"
+GC_REPORT = "report"
+GC_MANAGED = "managed"
+GC_MODES = (GC_AUTO, GC_REPORT, GC_MANAGED)
+
+# Collection thresholds while playing in managed mode. Young collections are
+# rarer and full ones are left for the menus and cutscenes
+GC_PLAYING_THRESHOLDS = (10000, 50, 1000)
+
+GC_PHASE_PLAYING = "playing"
+GC_PHASE_IDLE = "idle"  # Menus, cutscenes and the game over / win screens
+
+
+class GCManager:
+    """Controls when the cyclic garbage collector runs and accounts for its pauses.
+
+    In managed mode everything alive after the level is built is frozen
+    (gc.freeze), so collections never walk it again. While playing, the
+    thresholds are raised, and every move to an idle phase runs a full
+    collection where a pause can't be seen. Outside auto mode every
+    collection is timed through gc.callbacks and summed per phase and
+    generation for the end-of-session report.
+    """
+    def __init__(self, mode=GC_AUTO):
+        if mode not in GC_MODES:
+            raise ValueError(f"Unknown GC mode '{mode}'")
+        self.mode = mode
+        self.default_thresholds = gc.get_threshold()
+        self.phase = GC_PHASE_IDLE
+        self.explicit = False  # True while we run a collection ourselves
+        self.collection_start = None
+        self.pauses = {}  # (phase, generation, explicit) -> [count, total ms, max ms, objects collected]
+        self.frozen = 0
+        if mode != GC_AUTO:
+            gc.callbacks.append(self.on_collection)
+
+    def on_collection(self, event, info):
+        if event == "start":
+            self.collection_start = time.perf_counter()
+            return
+        if self.collection_start is None:
+            return
+        ms = (time.perf_counter() - self.collection_start) * 1000
+        self.collection_start = None
+        key = (self.phase, info["generation"], self.explicit)
+        pause = self.pauses.setdefault(key, [0, 0.0, 0.0, 0])
+        pause[0] += 1
+        pause[1] += ms
+        pause[2] = max(pause[2], ms)
+        pause[3] += info["collected"]
+
+    def level_loaded(self):
+        """Collect, then freeze everything still alive: the level, caches and modules"""
+        if self.mode != GC_MANAGED:
+            return
+        self.collect()
+        gc.freeze()
+        self.frozen = gc.get_freeze_count()
+
+    def collect(self):
+        self.explicit = True
+        try:
+            gc.collect()
+        finally:
+            self.explicit = False
+
+    def set_phase(self, phase):
+        """Called every frame with GC_PHASE_PLAYING or GC_PHASE_IDLE; acts when the phase changes"""
+        if phase == self.phase:
+            return
+        self.phase = phase
+        if self.mode != GC_MANAGED:
+            return
+        if phase == GC_PHASE_PLAYING:
+            gc.set_threshold(*GC_PLAYING_THRESHOLDS)
+        else:
+            gc.set_threshold(*self.default_thresholds)
+            self.collect()
+
+    def close(self):
+        """Stop accounting and put the collector back the way it was"""
+        if self.on_collection in gc.callbacks:
+            gc.callbacks.remove(self.on_collection)
+        gc.set_threshold(*self.default_thresholds)
+        if self.frozen:
+            gc.unfreeze()
+
+    def get_stats(self):
+        """Return the pauses per phase and generation, and the frozen object count"""
+        pauses = [
+            {"phase": phase, "generation": generation, "explicit": explicit, "count": count,
+             "total_ms": total, "max_ms": longest, "mean_ms": total / count, "collected": collected}
+            for (phase, generation, explicit), (count, total, longest, collected) in sorted(self.pauses.items())
+        ]
+        return {"mode": self.mode, "frozen": self.frozen, "pauses": pauses}
+
+    def print_report(self):
+        if self.mode == GC_AUTO:
+            return
+        stats = self.get_stats()
+        print(f"GC report ({self.mode} mode, {stats['frozen']} objects frozen):")
+        if not stats["pauses"]:
+            print("  no collections")
+        for pause in stats["pauses"]:
+            kind = "explicit" if pause["explicit"] else "automatic"
+            print(f"  {pause['phase']:<8} gen {pause['generation']} {kind:<9}: {pause['count']:>5} collections, "
+                  f"{pause['total_ms']:8.2f} ms total, {pause['mean_ms']:6.3f} ms mean, "
+                  f"{pause['max_ms']:6.2f} ms max, {pause['collected']} objects freed")
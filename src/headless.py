@@ -0,0 +1,74 @@
+import os
+import json
+import pygame
+
+# Default input for headless runs: start the game, run right, jump and shoot.
+# Steps are (tick, action, key[, period]); a period repeats the step every that many ticks.
+DEFAULT_SCRIPT = [
+    (1, "tap", "return"),
+    (2, "down", "right"),
+    (40, "tap", "space", 40),
+    (25, "tap", "f", 25),
+]
+
+
+def use_dummy_drivers():
+    """Make SDL open no window and no audio device. Call before pygame.init()"""
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+
+
+def load_script(path):
+    """Read an input script: a JSON list of [tick, action, key] or [tick, action, key, period]"""
+    with open(path) as file:
+        return [tuple(step) for step in json.load(file)]
+
+
+class KeyState:
+    """Stands in for pygame.key.get_pressed() with the keys a script holds down"""
+    def __init__(self, held):
+        self.held = held
+
+    def __getitem__(self, key):
+        return key in self.held
+
+
+class ScriptedInput:
+    """Replays an input script as key events and held keys, one tick at a time.
+
+    post() puts the tick's KEYDOWN/KEYUP events on the pygame event queue,
+    so the game handles them like real key presses, and get_pressed()
+    replaces pygame.key.get_pressed().
+    """
+    def __init__(self, script=DEFAULT_SCRIPT):
+        self.steps = []
+        for step in script:
+            tick, action, key = step[:3]
+            if action not in ("down", "up", "tap"):
+                raise ValueError(f"Unknown input action '{action}'")
+            period = step[3] if len(step) > 3 else 0
+            self.steps.append((tick, action, pygame.key.key_code(key), period))
+        self.held = set()
+        self.tick = 0
+
+    def due(self, tick, period):
+        if period:
+            return self.tick >= tick and (self.tick - tick) % period == 0
+        return self.tick == tick
+
+    def post(self):
+        """Post the events for the next tick"""
+        self.tick += 1
+        for tick, action, key, period in self.steps:
+            if not self.due(tick, period):
+                continue
+            if action in ("down", "tap"):
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=""))
+            if action == "down":
+                self.held.add(key)
+            else:
+                self.held.discard(key)
+                pygame.event.post(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode=""))
+
+    def get_pressed(self):
+        return KeyState(self.held)
@@ -0,0 +1,190 @@
+import pygame
+import tracemalloc
+from collections import defaultdict
+from src.constants import get_image_cache_stats, cached_images, pixel_owner, pixel_bytes
+from src.atlas import get_atlas_surface
+
+# Frames between tracemalloc snapshots, and stack frames kept per allocation
+MEMDIAG_INTERVAL = 60
+MEMDIAG_DEPTH = 1
+MEMDIAG_TOP = 15  # Allocation sites listed in the report
+SURFACE_SEARCH_DEPTH = 3  # How far into an entity's lists and dicts to look for surfaces
+
+# Allocations made by the diagnostics themselves
+IGNORED_FILES = (tracemalloc.__file__, __file__, "<frozen importlib._bootstrap>",
+                 "<frozen importlib._bootstrap_external>", "<unknown>")
+
+
+def find_surfaces(value, found, depth=SURFACE_SEARCH_DEPTH):
+    """Add every surface in an attribute value (and the lists and dicts in it) to found"""
+    if isinstance(value, pygame.Surface):
+        found.append(value)
+    elif depth and isinstance(value, (list, tuple)):
+        for item in value:
+            find_surfaces(item, found, depth - 1)
+    elif depth and isinstance(value, dict):
+        for item in value.values():
+            find_surfaces(item, found, depth - 1)
+
+
+def entity_surfaces(entities, shared=None):
+    """Return {class name: [surfaces]} for surfaces the entities hold, each pixel buffer once.
+
+    entities may mix sprite groups (whose sprites are looked at) and single
+    objects like the coin field. Surfaces whose pixels belong to shared (the
+    sprite atlas) are left out, as no one class owns them.
+    """
+    objects = []
+    for entity in entities:
+        if isinstance(entity, pygame.sprite.AbstractGroup):
+            objects.extend(entity.sprites())
+        else:
+            objects.append(entity)
+
+    seen = set()
+    by_class = defaultdict(list)
+    for obj in objects:
+        found = []
+        for value in vars(obj).values():
+            find_surfaces(value, found)
+        for surface in found:
+            owner = pixel_owner(surface)
+            if owner is not shared and id(owner) not in seen:
+                seen.add(id(owner))
+                by_class[type(obj).__name__].append(owner)
+    return by_class
+
+
+class MemoryDiagnostics:
+    """Allocation profiling of the game loop with tracemalloc.
+
+    tracemalloc starts when this is created, so level loading is traced too.
+    Every `interval` frames a snapshot is compared with the previous one and
+    the growth per source line is added up, giving the bytes and blocks each
+    line keeps alive per frame. Short-lived garbage never shows in a diff, so
+    every frame also records its allocation peak above where it started.
+    Surface pixels are allocated by SDL, which tracemalloc can't see: they
+    are counted separately for the load_image cache and for the surfaces the
+    entities hold.
+    """
+    def __init__(self, interval=MEMDIAG_INTERVAL, depth=MEMDIAG_DEPTH):
+        self.interval = max(1, interval)
+        self.filters = [tracemalloc.Filter(False, name) for name in IGNORED_FILES]
+        self.entities = []  # Groups and objects whose surfaces are counted, set once the level exists
+        self.frame_number = 0
+        self.frames_compared = 0
+        self.frame_base = 0
+        self.transient_total = 0
+        self.transient_max = 0
+        self.growth = defaultdict(lambda: [0, 0])  # Traceback -> [bytes, blocks] kept over compared frames
+        self.surface_peak = 0
+        tracemalloc.start(depth)
+        self.previous = None
+
+    def take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces(self.filters)
+
+    def frame_started(self):
+        tracemalloc.reset_peak()
+        self.frame_base = tracemalloc.get_traced_memory()[0]
+
+    def frame_finished(self):
+        current, peak = tracemalloc.get_traced_memory()
+        transient = peak - max(current, self.frame_base)
+        self.transient_total += transient
+        self.transient_max = max(self.transient_max, transient)
+        self.frame_number += 1
+        if self.frame_number % self.interval:
+            return
+
+        snapshot = self.take_snapshot()
+        if self.previous is not None:
+            for stat in snapshot.compare_to(self.previous, "traceback"):
+                if stat.size_diff or stat.count_diff:
+                    site = self.growth[stat.traceback]
+                    site[0] += stat.size_diff
+                    site[1] += stat.count_diff
+            self.frames_compared += self.interval
+        self.previous = snapshot
+        self.surface_peak = max(self.surface_peak, self.surface_stats()["total_bytes"])
+
+    def surface_stats(self):
+        """Return the pixel bytes in the load_image cache, the atlas and held by entities, per class"""
+        cache = get_image_cache_stats()
+        cached = {id(pixel_owner(image)) for image in cached_images()}
+        classes = {}
+        for name, surfaces in entity_surfaces(self.entities, get_atlas_surface()).items():
+            own = [surface for surface in surfaces if id(surface) not in cached]
+            classes[name] = {
+                "surfaces": len(surfaces),
+                "bytes": pixel_bytes(surfaces),
+                "own_bytes": pixel_bytes(own),
+            }
+        own_bytes = sum(entry["own_bytes"] for entry in classes.values())
+        return {
+            "image_cache_bytes": cache["bytes"],
+            "atlas_bytes": cache["atlas_bytes"],
+            "entity_bytes": own_bytes,  # Not counting the shared load_image and atlas surfaces
+            "total_bytes": cache["bytes"] + cache["atlas_bytes"] + own_bytes,
+            "classes": classes,
+        }
+
+    def top_growth(self, limit=MEMDIAG_TOP):
+        """Return the sites keeping the most memory alive, as (traceback, bytes/frame, blocks/frame)"""
+        frames = max(self.frames_compared, 1)
+        sites = sorted(self.growth.items(), key=lambda item: item[1][0], reverse=True)
+        return [(traceback, size / frames, count / frames)
+                for traceback, (size, count) in sites[:limit] if size > 0]
+
+    def top_live(self, limit=MEMDIAG_TOP):
+        """Return the sites holding the most traced memory right now"""
+        snapshot = self.previous or self.take_snapshot()
+        return snapshot.statistics("lineno")[:limit]
+
+    def get_stats(self):
+        current, peak = tracemalloc.get_traced_memory()
+        surfaces = self.surface_stats()
+        return {
+            "frames": self.frame_number,
+            "frames_compared": self.frames_compared,
+            "traced_bytes": current,
+            "transient_mean": self.transient_total / max(self.frame_number, 1),
+            "transient_max": self.transient_max,
+            "surface_bytes": surfaces["total_bytes"],
+            "surface_peak": max(self.surface_peak, surfaces["total_bytes"]),
+        }
+
+    def print_report(self):
+        stats = self.get_stats()
+        print(f"Memory report: {stats['frames']} frames, {stats['traced_bytes'] / 1024:.0f} KiB traced, "
+              f"{stats['transient_mean'] / 1024:.1f} KiB mean / {stats['transient_max'] / 1024:.1f} KiB max "
+              f"short-lived per frame")
+
+        print(f"  Memory kept per frame, over {stats['frames_compared']} frames "
+              f"(snapshots every {self.interval}):")
+        growth = self.top_growth()
+        if not growth:
+            print("    nothing")
+        for traceback, size, count in growth:
+            frame = traceback[-1]  # The line that allocated
+            print(f"    {size:10.1f} B {count:8.2f} blocks  {frame.filename}:{frame.lineno}")
+
+        print("  Largest live allocation sites:")
+        for stat in self.top_live():
+            frame = stat.traceback[-1]
+            print(f"    {stat.size / 1024:10.1f} KiB {stat.count:8} blocks  {frame.filename}:{frame.lineno}")
+
+        surfaces = self.surface_stats()
+        print(f"  Surface pixels: {surfaces['total_bytes'] / 1024:.0f} KiB "
+              f"(peak {stats['surface_peak'] / 1024:.0f} KiB), "
+              f"{surfaces['image_cache_bytes'] / 1024:.0f} KiB in the load_image cache")
+        if surfaces["atlas_bytes"]:
+            print(f"    {'sprite atlas':<20} {1:6} surface  {surfaces['atlas_bytes'] / 1024:10.1f} KiB "
+                  f"(shared by every baked frame)")
+        for name, entry in sorted(surfaces["classes"].items(), key=lambda item: item[1]["bytes"], reverse=True):
+            print(f"    {name:<20} {entry['surfaces']:6} surfaces {entry['bytes'] / 1024:10.1f} KiB "
+                  f"({entry['own_bytes'] / 1024:.1f} KiB not from load_image)")
+
+    def close(self):
+        self.previous = None
+        tracemalloc.stop()
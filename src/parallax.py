@@ -0,0 +1,111 @@
+import pygame
+import random
+import math
+from src.constants import SCREEN_WIDTH, convert_surface, per_tick
+
+# Strips are at least this wide so a layer never needs more than two blits
+PARALLAX_STRIP_WIDTH = 1600
+
+
+class ParallaxLayer:
+    """A horizontally tiling strip that scrolls at a fraction of the camera speed.
+
+    The strip is at least as wide as the screen, so drawing it costs at most
+    two blits whatever the width of the world. drift moves the layer on its
+    own (pixels per 60 Hz tick), e.g. for clouds carried by the wind.
+    """
+    def __init__(self, name, strip, scroll_factor, y=0, drift=0.0):
+        if strip.get_width() < SCREEN_WIDTH:
+            raise ValueError(f"Parallax strip '{name}' is narrower than the screen")
+        self.name = name
+        self.strip = strip
+        self.scroll_factor = scroll_factor
+        self.y = y
+        self.drift = per_tick(drift)
+        self.offset = 0.0
+
+    def update(self):
+        if self.drift:
+            self.offset = (self.offset + self.drift) % self.strip.get_width()
+
+    def draw(self, surface, scroll_x):
+        width = self.strip.get_width()
+        x = -(round(-scroll_x * self.scroll_factor - self.offset) % width)
+        surface.blit(self.strip, (x, self.y))
+        if x + width < surface.get_width():
+            surface.blit(self.strip, (x + width, self.y))
+
+
+class ParallaxBackground:
+    """Ordered stack of parallax layers, back to front"""
+    def __init__(self, layers=()):
+        self.layers = list(layers)
+
+    def add_layer(self, layer):
+        self.layers.append(layer)
+        return layer
+
+    def update(self):
+        for layer in self.layers:
+            layer.update()
+
+    def draw(self, surface, camera, drifting=None):
+        """Draw the layers. drifting=True/False draws only the moving/still ones"""
+        for layer in self.layers:
+            if drifting is None or bool(layer.drift) == drifting:
+                layer.draw(surface, camera.scroll_x)
+
+    def get_stats(self):
+        """Return the layer count, each strip's size and the strips' total memory"""
+        return {
+            "layers": len(self.layers),
+            "strips": {layer.name: layer.strip.get_size() for layer in self.layers},
+            "bytes": sum(layer.strip.get_width() * layer.strip.get_height() * layer.strip.get_bytesize()
+                         for layer in self.layers),
+        }
+
+
+def create_mountain_strip(width, height, color):
+    """Draw a row of peaks that tiles seamlessly along x"""
+    img = pygame.Surface((width, height), pygame.SRCALPHA)
+    peak_count = max(1, width // 300)
+    spacing = width / peak_count
+    for i in range(peak_count):
+        center = i * spacing + random.uniform(-spacing / 4, spacing / 4)
+        half_width = random.uniform(spacing * 0.6, spacing * 0.9)
+        top = random.randint(0, height // 3)
+        # Draw each peak a strip width to either side too, so it wraps around the seam
+        for shift in (-width, 0, width):
+            pygame.draw.polygon(img, color, [
+                (center - half_width + shift, height),
+                (center + shift, top),
+                (center + half_width + shift, height),
+            ])
+    return convert_surface(img)
+
+
+def create_hill_strip(width, height, color):
+    """Draw rolling hills from a sum of sines whose periods divide the strip width"""
+    img = pygame.Surface((width, height), pygame.SRCALPHA)
+    waves = [(random.uniform(0, math.tau), random.choice((2, 3, 5)), random.uniform(0.1, 0.2))
+             for _ in range(3)]
+    points = [(0, height)]
+    for x in range(0, width + 1, 8):
+        y = height * (0.45 + sum(amplitude * math.sin(phase + cycles * math.tau * x / width)
+                                 for phase, cycles, amplitude in waves))
+        points.append((x, y))
+    points.append((width, height))
+    pygame.draw.polygon(img, color, points)
+    return convert_surface(img)
+
+
+def create_cloud_strip(width, height, cloud_img, count):
+    """Scatter cloud images over a transparent strip, wrapping those that cross the seam"""
+    img = pygame.Surface((width, height), pygame.SRCALPHA)
+    for _ in range(count):
+        x = random.randint(0, width)
+        y = random.randint(0, max(0, height - cloud_img.get_height()))
+        img.blit(cloud_img, (x, y))
+        if x + cloud_img.get_width() > width:
+            img.blit(cloud_img, (x - width, y))
+    return convert_surface(img)
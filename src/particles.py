@@ -0,0 +1,233 @@
+import pygame
+import numpy as np
+from src.constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, WHITE, YELLOW, GOLD, ORANGE, RED, PURPLE, BROWN
+)
+from src.constants import convert_surface, ticks, per_tick, per_tick_squared
+from src.spatial import INTERPOLATION_SNAP_DISTANCE
+
+# Most particles alive at once, and the lower budget used when the game runs slowly
+PARTICLE_CAPACITY = 4096
+PARTICLE_BUDGET = 2000
+PARTICLE_BUDGET_LOW = 400
+ALPHA_LEVELS = 8  # Fading particles use this many pre-rendered alpha steps
+
+CIRCLE = 0
+STREAK = 1  # Circle with a tail above it, for falling stars
+
+PARTICLE_DTYPE = np.dtype([
+    ("x", np.float32), ("y", np.float32),
+    ("velocity_x", np.float32), ("velocity_y", np.float32),
+    ("gravity", np.float32),
+    ("life", np.int32), ("max_life", np.int32),  # max_life 0 means the particle never dies
+    ("size", np.uint8), ("color", np.uint8), ("shape", np.uint8), ("emitter", np.uint8),
+    ("screen", np.bool_),  # Screen-space particles ignore the camera
+    ("wrap", np.bool_),  # Particles falling off the bottom reappear at the top
+    ("fade", np.bool_),
+    ("alive", np.bool_),
+])
+
+# Emitter definitions: how many particles a burst makes and the ranges they are drawn from.
+# spread is the half-size of the box around the emit point the particles start in.
+# Velocities, gravity and life are in 60 Hz ticks and converted to TICK_RATE on emit.
+EMITTERS = {
+    "victory": {"count": 100, "spread": (50, 50), "velocity_x": (-3, 3), "velocity_y": (-5, -1),
+                "gravity": 0.1, "life": (30, 120), "size": (3, 8),
+                "colors": (GOLD, YELLOW, WHITE, ORANGE)},
+    "win_star": {"count": 20, "spread": (SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2), "velocity_x": (0, 0),
+                 "velocity_y": (0.5, 2.0), "gravity": 0, "life": None, "size": (2, 6),
+                 "colors": (GOLD,), "shape": STREAK, "screen": True, "wrap": True, "fade": False},
+    "stomp": {"count": 12, "spread": (10, 2), "velocity_x": (-2.5, 2.5), "velocity_y": (-3, -0.5),
+              "gravity": 0.2, "life": (15, 30), "size": (2, 4), "colors": (WHITE, BROWN)},
+    "coin": {"count": 8, "spread": (6, 6), "velocity_x": (-1.5, 1.5), "velocity_y": (-3, -1),
+             "gravity": 0.15, "life": (15, 25), "size": (2, 3), "colors": (YELLOW, GOLD)},
+    "fireball_hit": {"count": 16, "spread": (4, 4), "velocity_x": (-3, 3), "velocity_y": (-3, 3),
+                     "gravity": 0.05, "life": (10, 25), "size": (2, 5), "colors": (ORANGE, RED, YELLOW)},
+    "boss_phase": {"count": 60, "spread": (40, 40), "velocity_x": (-4, 4), "velocity_y": (-4, 4),
+                   "gravity": 0, "life": (30, 60), "size": (3, 6), "colors": (RED, PURPLE, ORANGE)},
+}
+
+# (color, size, shape, alpha level) -> pre-rendered particle image
+particle_image_cache = {}
+
+
+def get_particle_image(color, size, shape, level):
+    """Return the shared image for a particle look, drawing it on first use"""
+    key = (color, size, shape, level)
+    image = particle_image_cache.get(key)
+    if image is None:
+        alpha = 255 * level // ALPHA_LEVELS
+        tail = size * 3 if shape == STREAK else 0
+        image = pygame.Surface((size * 2, size * 2 + tail), pygame.SRCALPHA)
+        pygame.draw.circle(image, color + (alpha,), (size, size + tail), size)
+        if tail:
+            pygame.draw.line(image, color + (alpha,), (size, size + tail), (size, 0), 1)
+        image = convert_surface(image)
+        particle_image_cache[key] = image
+    return image
+
+
+class ParticleSystem:
+    """All effect particles in one NumPy structured array.
+
+    emit() fills free slots from an emitter definition, update() integrates,
+    ages and culls every particle in bulk, and draw() sends all visible
+    particles to the screen in one blits call. The budget caps how many
+    particles may be alive and can be lowered while the game runs.
+    snapshot() keeps the positions before a tick so draw() can place the
+    particles between the last two ticks.
+    """
+    def __init__(self, capacity=PARTICLE_CAPACITY, budget=PARTICLE_BUDGET):
+        self.particles = np.zeros(capacity, dtype=PARTICLE_DTYPE)
+        self.previous_x = np.zeros(capacity, dtype=np.float32)  # Positions at the start of the tick
+        self.previous_y = np.zeros(capacity, dtype=np.float32)
+        self.budget = min(budget, capacity)
+        self.palette = []  # Color index -> RGB tuple
+        self.emitter_names = list(EMITTERS)
+        self.emitted = 0
+        self.dropped = 0  # Particles not emitted because the budget was full
+
+    def __len__(self):
+        return int(np.count_nonzero(self.particles["alive"]))
+
+    def count(self, emitter):
+        """Return how many live particles came from an emitter"""
+        particles = self.particles
+        return int(np.count_nonzero(particles["alive"] &
+                                    (particles["emitter"] == self.emitter_names.index(emitter))))
+
+    def color_index(self, color):
+        color = tuple(int(c) for c in color[:3])
+        if color not in self.palette:
+            self.palette.append(color)
+        return self.palette.index(color)
+
+    def emit(self, emitter, x, y, count=None):
+        """Start a burst of particles around (x, y). Returns how many were created"""
+        spec = EMITTERS[emitter]
+        if count is None:
+            count = spec["count"]
+        room = max(0, self.budget - len(self))
+        if count > room:
+            self.dropped += count - room
+            count = room
+        if not count:
+            return 0
+
+        slots = np.flatnonzero(~self.particles["alive"])[:count]
+        count = len(slots)
+        rng = np.random.default_rng()
+        new = np.zeros(count, dtype=PARTICLE_DTYPE)
+        spread_x, spread_y = spec["spread"]
+        new["x"] = x + rng.uniform(-spread_x, spread_x, count)
+        new["y"] = y + rng.uniform(-spread_y, spread_y, count)
+        new["velocity_x"] = rng.uniform(*map(per_tick, spec["velocity_x"]), count)
+        new["velocity_y"] = rng.uniform(*map(per_tick, spec["velocity_y"]), count)
+        new["gravity"] = per_tick_squared(spec["gravity"])
+        if spec["life"] is not None:
+            new["life"] = rng.integers(ticks(spec["life"][0]), ticks(spec["life"][1]) + 1, count)
+            new["max_life"] = new["life"]
+        new["size"] = rng.integers(spec["size"][0], spec["size"][1] + 1, count)
+        colors = [self.color_index(color) for color in spec["colors"]]
+        new["color"] = rng.choice(colors, count)
+        new["shape"] = spec.get("shape", CIRCLE)
+        new["emitter"] = self.emitter_names.index(emitter)
+        new["screen"] = spec.get("screen", False)
+        new["wrap"] = spec.get("wrap", False)
+        new["fade"] = spec.get("fade", True)
+        new["alive"] = True
+        self.particles[slots] = new
+        self.previous_x[slots] = new["x"]
+        self.previous_y[slots] = new["y"]
+        self.emitted += count
+        return count
+
+    def set_budget(self, budget):
+        """Change the particle budget, killing the particles closest to death if it shrank"""
+        self.budget = min(budget, len(self.particles))
+        live = np.flatnonzero(self.particles["alive"])
+        excess = len(live) - self.budget
+        if excess > 0:
+            life = self.particles["life"][live]
+            # Particles that never die sort last
+            life = np.where(self.particles["max_life"][live] == 0, np.iinfo(np.int32).max, life)
+            self.particles["alive"][live[np.argsort(life, kind="stable")[:excess]]] = False
+
+    def clear(self, emitter=None):
+        """Kill every particle, or only those from one emitter"""
+        if emitter is None:
+            self.particles["alive"] = False
+        else:
+            self.particles["alive"][self.particles["emitter"] == self.emitter_names.index(emitter)] = False
+
+    def snapshot(self):
+        """Remember where the particles are before a simulation tick"""
+        self.previous_x[:] = self.particles["x"]
+        self.previous_y[:] = self.particles["y"]
+
+    def update(self):
+        """Integrate, age and cull every particle in bulk"""
+        particles = self.particles
+        live = particles["alive"].copy()
+        if not live.any():
+            return
+        particles["x"][live] += particles["velocity_x"][live]
+        particles["y"][live] += particles["velocity_y"][live]
+        particles["velocity_y"][live] += particles["gravity"][live]
+
+        mortal = live & (particles["max_life"] > 0)
+        particles["life"][mortal] -= 1
+        particles["alive"][mortal & (particles["life"] <= 0)] = False
+
+        wrapped = live & particles["wrap"] & (particles["y"] > SCREEN_HEIGHT)
+        if wrapped.any():
+            particles["y"][wrapped] = 0
+            particles["x"][wrapped] = np.random.default_rng().uniform(0, SCREEN_WIDTH, np.count_nonzero(wrapped))
+
+        # Forget world particles that fell far below the screen
+        particles["alive"][live & ~particles["wrap"] & (particles["y"] > SCREEN_HEIGHT + 100)] = False
+
+    def draw(self, surface, camera, alpha=1.0):
+        """Draw every live particle with a single blits call, alpha of the way from the last tick"""
+        live = np.flatnonzero(self.particles["alive"])
+        if not len(live):
+            return
+        p = self.particles[live]
+        px, py = p["x"], p["y"]
+        if alpha < 1.0:
+            previous_x, previous_y = self.previous_x[live], self.previous_y[live]
+            # Particles that wrapped around jump straight to where they are
+            moved = np.abs(px - previous_x) + np.abs(py - previous_y) <= INTERPOLATION_SNAP_DISTANCE
+            px = np.where(moved, previous_x + (px - previous_x) * alpha, px)
+            py = np.where(moved, previous_y + (py - previous_y) * alpha, py)
+        scroll_x = round(camera.scroll_x)
+        size = p["size"].astype(np.int32)
+        x = px.astype(np.int32) + np.where(p["screen"], 0, scroll_x) - size
+        tail = np.where(p["shape"] == STREAK, size * 3, 0)
+        y = py.astype(np.int32) - size - tail
+        shown = (x > -size * 2) & (x < SCREEN_WIDTH) & (y > -size * 2 - tail) & (y < SCREEN_HEIGHT)
+        level = np.where(p["fade"],
+                         np.ceil(p["life"] * ALPHA_LEVELS / np.maximum(p["max_life"], 1)),
+                         ALPHA_LEVELS).astype(np.int32)
+
+        # Look each distinct image up once, then index into the list per particle
+        keys = ((p["color"].astype(np.int32) * 256 + size) * 4 + p["shape"]) * (ALPHA_LEVELS + 1) + level
+        unique, inverse = np.unique(keys[shown], return_inverse=True)
+        images = []
+        for key in unique.tolist():
+            key, level_key = divmod(key, ALPHA_LEVELS + 1)
+            key, shape_key = divmod(key, 4)
+            color_key, size_key = divmod(key, 256)
+            images.append(get_particle_image(self.palette[color_key], size_key, shape_key, level_key))
+        surface.blits([(images[i], (px, py)) for i, px, py in zip(
+            inverse.tolist(), x[shown].tolist(), y[shown].tolist())], doreturn=False)
+
+    def get_stats(self):
+        """Return live, emitted and dropped particle counts and the current budget"""
+        return {
+            "live": len(self),
+            "budget": self.budget,
+            "emitted": self.emitted,
+            "dropped": self.dropped,
+            "images": len(particle_image_cache),
+        }
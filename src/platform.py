@@ -1,19 +1,27 @@
 import pygame
 import random
 from src.constants import BROWN, MOVING_PLATFORM_SPEED, GRAVITY, SHRINK_DELAY, SHRINK_SPEED, MIN_PLATFORM_WIDTH, ORANGE
-from src.constants import load_image
+from src.constants import load_image, convert_surface, ticks
+from src.scheduler import INPUT, PHYSICS
 
 class Platform(pygame.sprite.Sprite):
+    static = True  # Never moves horizontally, so it is baked into the static layer
+
     def __init__(self, x, y, width, color=BROWN):
         super().__init__()
         self.image = pygame.Surface((width, 10))
         self.image.fill(color)
+        self.image = convert_surface(self.image)
         self.rect = self.image.get_rect()
         self.rect.x = x
         self.rect.y = y
 
 
 class MovingPlatform(Platform):
+    static = False
+    update_phase = INPUT  # Moves before enemies look for platform edges
+    update_section = "platforms"
+
     def __init__(self, x, y, width, move_distance, horizontal=True, color=BROWN):
         super().__init__(x, y, width, color)
         self.start_x = x
@@ -34,6 +42,10 @@ class MovingPlatform(Platform):
                 self.speed *= -1
 
 class ShrinkingPlatform(Platform):
+    static = False  # reset() can shift it sideways
+    update_phase = PHYSICS
+    update_section = "platforms"
+
     def __init__(self, x, y, width, color=(255, 100, 0)):  # Orange-red color
         super().__init__(x, y, width, color)
         self.original_width = width
@@ -54,6 +66,7 @@ class ShrinkingPlatform(Platform):
                 # Create new image with reduced width
                 self.image = pygame.Surface((self.current_width, 10))
                 self.image.fill((255, int(100 * (self.current_width / self.original_width)), 0))  # Change color as it shrinks
+                self.image = convert_surface(self.image)
                 
                 # Keep platform centered while shrinking
                 old_center = self.rect.center
@@ -68,14 +81,19 @@ class ShrinkingPlatform(Platform):
         self.player_touched = False
         self.image = pygame.Surface((self.original_width, 10))
         self.image.fill((255, 100, 0))
+        self.image = convert_surface(self.image)
         self.rect = self.image.get_rect(x=self.rect.x, y=self.rect.y)
 
 class FallingPlatform(Platform):
+    static = False
+    update_phase = PHYSICS
+    update_section = "platforms"
+
     def __init__(self, x, y, width, color=(200, 100, 50)):  # Brown-red color
         super().__init__(x, y, width, color)
         self.velocity_y = 0
         self.player_touched = False
-        self.fall_delay = 15  # Frames before platform starts falling
+        self.fall_delay = ticks(15)  # Ticks before platform starts falling
         self.fall_timer = 0
         self.start_y = y
         
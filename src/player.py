@@ -7,11 +7,24 @@ from src.constants import (
     INVINCIBILITY_DURATION, SCORE_MULTIPLIER_DURATION,
     GOLD, WHITE, RED, GREEN, BLUE, ORANGE, PURPLE, YELLOW
 )
-from src.constants import load_image
+from src.constants import load_image, ticks, per_tick, per_tick_squared
+from src.tracing import trace_span, trace_event
+from src.scheduler import INPUT
+
+MAX_FALL_SPEED = per_tick(15)  # Terminal velocity
+MIN_MOVING_SPEED = per_tick(0.5)  # Slower than this counts as standing still
+# Friction stops the player below this; it is compared with one tick's acceleration
+STOP_SPEED = per_tick_squared(0.5)
+ANIMATION_SPEED_STEP = per_tick(2)  # Each step of speed shortens a walking frame by a tick
 
 class Player(pygame.sprite.Sprite):
     # Add max_jumps class variable
     max_jumps = MAX_JUMPS
+    # Animation frame sets per power state, shared by all players
+    frame_sets = {}
+    power_states = ("normal", "star", "flower")
+    update_phase = INPUT  # Moves before the enemies decide what to do about it
+    update_section = "player"
     
     def __init__(self):
         super().__init__()
@@ -25,52 +38,12 @@ class Player(pygame.sprite.Sprite):
         # Store the current color
         self.current_color = self.normal_color
         
-        # Create animation frames for normal state
-        self.frames_right = [
-            load_image("player_walk1.png", PLAYER_WIDTH, PLAYER_HEIGHT, self.current_color),
-            load_image("player_walk2.png", PLAYER_WIDTH, PLAYER_HEIGHT, self.current_color)
-        ]
-        self.frames_left = [pygame.transform.flip(frame, True, False) for frame in self.frames_right]
-        self.jump_frame_right = load_image("player_jump.png", PLAYER_WIDTH, PLAYER_HEIGHT, self.current_color)
-        self.jump_frame_left = pygame.transform.flip(self.jump_frame_right, True, False)
-        self.idle_frame_right = load_image("player_idle.png", PLAYER_WIDTH, PLAYER_HEIGHT, self.current_color)
-        self.idle_frame_left = pygame.transform.flip(self.idle_frame_right, True, False)
-
-        # Create powered-up versions (with star sparkle effects)
-        self.star_frames_right = []
-        self.star_frames_left = []
-        for frame in self.frames_right:
-            star_frame = frame.copy()
-            # Add star sparkle effect
-            self.add_sparkle_effect(star_frame)
-            self.star_frames_right.append(star_frame)
-            self.star_frames_left.append(pygame.transform.flip(star_frame, True, False))
-        
-        # Create flower power-up versions (with fire effects)
-        self.flower_frames_right = []
-        self.flower_frames_left = []
-        for frame in self.frames_right:
-            flower_frame = frame.copy()
-            # Add flower effect (fire highlights)
-            self.add_flower_effect(flower_frame)
-            self.flower_frames_right.append(flower_frame)
-            self.flower_frames_left.append(pygame.transform.flip(flower_frame, True, False))
-        
-        self.star_jump_frame_right = self.jump_frame_right.copy()
-        self.add_sparkle_effect(self.star_jump_frame_right)
-        self.star_jump_frame_left = pygame.transform.flip(self.star_jump_frame_right, True, False)
-        
-        self.flower_jump_frame_right = self.jump_frame_right.copy()
-        self.add_flower_effect(self.flower_jump_frame_right)
-        self.flower_jump_frame_left = pygame.transform.flip(self.flower_jump_frame_right, True, False)
-        
-        self.star_idle_frame_right = self.idle_frame_right.copy()
-        self.add_sparkle_effect(self.star_idle_frame_right)
-        self.star_idle_frame_left = pygame.transform.flip(self.star_idle_frame_right, True, False)
-        
-        self.flower_idle_frame_right = self.idle_frame_right.copy()
-        self.add_flower_effect(self.flower_idle_frame_right)
-        self.flower_idle_frame_left = pygame.transform.flip(self.flower_idle_frame_right, True, False)
+        # Point the animation frames at the shared frame sets of every power
+        # state, so picking up a power-up only changes which ones are shown
+        for power in self.power_states:
+            prefix = "" if power == "normal" else power + "_"
+            for name, frames in self.get_frame_set(power).items():
+                setattr(self, prefix + name, frames)
         
         self.image = self.idle_frame_right
         self.rect = self.image.get_rect()
@@ -86,7 +59,7 @@ class Player(pygame.sprite.Sprite):
         self.animation_timer = 0
         self.on_ground = False
         self.coyote_time = 0  # Time after leaving a platform when you can still jump
-        self.max_coyote_time = 7  # Frames of coyote time
+        self.max_coyote_time = ticks(7)  # Ticks of coyote time
         
         # New attributes for power-ups and lives
         self.lives = MAX_LIVES
@@ -101,60 +74,65 @@ class Player(pygame.sprite.Sprite):
         self.score_multiplier = 1
         self.multiplier_timer = 0
         self.flash_timer = 0  # For invincibility flashing effect
+        self.flash_visible = True  # False while the flash shows the faded frames
+        self.faded_frames = {}  # Shared frame -> this player's faded copy of it
+    
+    @classmethod
+    def get_frame_set(cls, power):
+        """Return the walk/jump/idle frames (both directions) for a power state,
+        building them the first time.
+
+        The player art doesn't change with the base color, so only the star
+        sparkles and flower fire highlights make the sets differ.
+        """
+        frame_set = cls.frame_sets.get(power)
+        if frame_set is not None:
+            return frame_set
+        
+        with trace_span("Player.get_frame_set", power=power):
+            # The effects draw from the global random module. Sets used to be built per
+            # base color, drawing four times as many numbers, so seeded runs no longer
+            # follow the path they took before the sets were shared
+            effect = {"star": cls.add_sparkle_effect, "flower": cls.add_flower_effect}.get(power)
+            frame_set = {}
+            walk_frames = []
+            for name in ("player_walk1.png", "player_walk2.png"):
+                frame = load_image(name, PLAYER_WIDTH, PLAYER_HEIGHT)
+                if effect:
+                    frame = frame.copy()
+                    effect(frame)
+                walk_frames.append(frame)
+            frame_set["frames_right"] = walk_frames
+            frame_set["frames_left"] = [pygame.transform.flip(frame, True, False) for frame in walk_frames]
+        
+            for name, image_name in (("jump_frame", "player_jump.png"), ("idle_frame", "player_idle.png")):
+                frame = load_image(image_name, PLAYER_WIDTH, PLAYER_HEIGHT)
+                if effect:
+                    frame = frame.copy()
+                    effect(frame)
+                frame_set[name + "_right"] = frame
+                frame_set[name + "_left"] = pygame.transform.flip(frame, True, False)
+        
+        cls.frame_sets[power] = frame_set
+        return frame_set
+    
+    def get_faded_frame(self, frame):
+        """Return this player's see-through copy of a shared frame, for the invincibility flash"""
+        faded = self.faded_frames.get(frame)
+        if faded is None:
+            faded = frame.copy()
+            faded.set_alpha(150)
+            self.faded_frames[frame] = faded
+        return faded
     
     def update_color(self, new_color):
-        """Update player's base color and recreate animation frames"""
+        """Update player's base color and show the frame for its power state"""
         self.current_color = new_color
         
         # Store current state
         was_facing_right = self.facing_right
         was_jumping = self.jumping
         
-        # Recreate normal animation frames with new color
-        self.frames_right = [
-            load_image("player_walk1.png", PLAYER_WIDTH, PLAYER_HEIGHT, self.current_color),
-            load_image("player_walk2.png", PLAYER_WIDTH, PLAYER_HEIGHT, self.current_color)
-        ]
-        self.frames_left = [pygame.transform.flip(frame, True, False) for frame in self.frames_right]
-        self.jump_frame_right = load_image("player_jump.png", PLAYER_WIDTH, PLAYER_HEIGHT, self.current_color)
-        self.jump_frame_left = pygame.transform.flip(self.jump_frame_right, True, False)
-        self.idle_frame_right = load_image("player_idle.png", PLAYER_WIDTH, PLAYER_HEIGHT, self.current_color)
-        self.idle_frame_left = pygame.transform.flip(self.idle_frame_right, True, False)
-        
-        # Recreate star frames
-        self.star_frames_right = []
-        self.star_frames_left = []
-        for frame in self.frames_right:
-            star_frame = frame.copy()
-            self.add_sparkle_effect(star_frame)
-            self.star_frames_right.append(star_frame)
-            self.star_frames_left.append(pygame.transform.flip(star_frame, True, False))
-        
-        self.star_jump_frame_right = self.jump_frame_right.copy()
-        self.add_sparkle_effect(self.star_jump_frame_right)
-        self.star_jump_frame_left = pygame.transform.flip(self.star_jump_frame_right, True, False)
-        
-        self.star_idle_frame_right = self.idle_frame_right.copy()
-        self.add_sparkle_effect(self.star_idle_frame_right)
-        self.star_idle_frame_left = pygame.transform.flip(self.star_idle_frame_right, True, False)
-        
-        # Recreate flower frames
-        self.flower_frames_right = []
-        self.flower_frames_left = []
-        for frame in self.frames_right:
-            flower_frame = frame.copy()
-            self.add_flower_effect(flower_frame)
-            self.flower_frames_right.append(flower_frame)
-            self.flower_frames_left.append(pygame.transform.flip(flower_frame, True, False))
-        
-        self.flower_jump_frame_right = self.jump_frame_right.copy()
-        self.add_flower_effect(self.flower_jump_frame_right)
-        self.flower_jump_frame_left = pygame.transform.flip(self.flower_jump_frame_right, True, False)
-        
-        self.flower_idle_frame_right = self.idle_frame_right.copy()
-        self.add_flower_effect(self.flower_idle_frame_right)
-        self.flower_idle_frame_left = pygame.transform.flip(self.flower_idle_frame_right, True, False)
-        
         # Set correct frame based on current state
         if self.has_star:
             if was_jumping:
@@ -172,7 +150,8 @@ class Player(pygame.sprite.Sprite):
             else:
                 self.image = self.idle_frame_right if was_facing_right else self.idle_frame_left
                 
-    def add_sparkle_effect(self, surface):
+    @staticmethod
+    def add_sparkle_effect(surface):
         """Add sparkle effect to a surface for star power"""
         width, height = surface.get_size()
         # Add yellow sparkles
@@ -183,7 +162,8 @@ class Player(pygame.sprite.Sprite):
             # Add white center to sparkle
             pygame.draw.circle(surface, WHITE, (x, y), 1)
             
-    def add_flower_effect(self, surface):
+    @staticmethod
+    def add_flower_effect(surface):
         """Add flower power effect to a surface (fire highlights)"""
         width, height = surface.get_size()
         # Add fire-like highlights (orange and yellow)
@@ -195,20 +175,19 @@ class Player(pygame.sprite.Sprite):
             # Add yellow center
             pygame.draw.circle(surface, YELLOW, (x, y), 1)
 
-    def update(self, world_bounds):
+    def update(self, world_bounds=WORLD_WIDTH):
         # Track if player was on ground in previous frame
         was_on_ground = self.on_ground
         
         # Animation timing - dynamically adjust animation speed based on movement speed
-        animation_speed = max(3, 8 - abs(self.velocity_x) // 2)  # Faster animation when moving faster
+        animation_speed = max(3, 8 - abs(self.velocity_x) // ANIMATION_SPEED_STEP)  # Faster animation when moving faster
         self.animation_timer += 1
-        if self.animation_timer > animation_speed:
+        if self.animation_timer > ticks(animation_speed):
             self.animation_timer = 0
             self.animation_index = (self.animation_index + 1) % len(self.frames_right)
 
         # Apply gravity with terminal velocity
-        max_fall_speed = 15
-        self.velocity_y = min(self.velocity_y + GRAVITY, max_fall_speed)
+        self.velocity_y = min(self.velocity_y + GRAVITY, MAX_FALL_SPEED)
         self.rect.y += self.velocity_y
         
         # Apply horizontal movement with sub-pixel precision
@@ -218,7 +197,7 @@ class Player(pygame.sprite.Sprite):
         if self.has_star:
             if self.jumping:
                 self.image = self.star_jump_frame_right if self.facing_right else self.star_jump_frame_left
-            elif abs(self.velocity_x) > 0.5:  # Only show walking animation if actually moving
+            elif abs(self.velocity_x) > MIN_MOVING_SPEED:  # Only show walking animation if actually moving
                 if self.velocity_x > 0:
                     self.facing_right = True
                     self.image = self.star_frames_right[self.animation_index]
@@ -230,7 +209,7 @@ class Player(pygame.sprite.Sprite):
         elif self.has_flower:
             if self.jumping:
                 self.image = self.flower_jump_frame_right if self.facing_right else self.flower_jump_frame_left
-            elif abs(self.velocity_x) > 0.5:  # Only show walking animation if actually moving
+            elif abs(self.velocity_x) > MIN_MOVING_SPEED:  # Only show walking animation if actually moving
                 if self.velocity_x > 0:
                     self.facing_right = True
                     self.image = self.flower_frames_right[self.animation_index]
@@ -243,7 +222,7 @@ class Player(pygame.sprite.Sprite):
             # Normal animation (non-power-up)
             if self.jumping:
                 self.image = self.jump_frame_right if self.facing_right else self.jump_frame_left
-            elif abs(self.velocity_x) > 0.5:  # Only show walking animation if actually moving
+            elif abs(self.velocity_x) > MIN_MOVING_SPEED:  # Only show walking animation if actually moving
                 if self.velocity_x > 0:
                     self.facing_right = True
                     self.image = self.frames_right[self.animation_index]
@@ -255,7 +234,7 @@ class Player(pygame.sprite.Sprite):
 
         # Apply friction
         self.velocity_x *= PLAYER_DECELERATION
-        if abs(self.velocity_x) < 0.5:
+        if abs(self.velocity_x) < STOP_SPEED:
             self.velocity_x = 0
 
         # Ground collision
@@ -330,17 +309,17 @@ class Player(pygame.sprite.Sprite):
             self.invincibility_timer -= 1
             # Flash effect
             self.flash_timer += 1
-            if self.flash_timer > 5:  # Flash every 5 frames
+            if self.flash_timer > ticks(5):  # Flash every 5 frames
                 self.flash_timer = 0
                 # Toggle visibility for flash effect
-                if self.image.get_alpha() == 255:
-                    self.image.set_alpha(150)
-                else:
-                    self.image.set_alpha(255)
+                self.flash_visible = not self.flash_visible
                     
             if self.invincibility_timer <= 0:
                 self.invincible = False
-                self.image.set_alpha(255)  # Restore full opacity
+                self.flash_visible = True  # Restore full opacity
+            elif not self.flash_visible:
+                # The frames are shared, so fade a copy rather than the frame itself
+                self.image = self.get_faded_frame(self.image)
         
         # Update score multiplier timer
         if self.score_multiplier > 1:
@@ -372,7 +351,7 @@ class Player(pygame.sprite.Sprite):
     def shoot_fireball(self, fireballs_group):
         """Shoot a fireball if player has flower power"""
         if self.has_flower and self.fireball_cooldown <= 0:
-            from src.fireball import Fireball  # Import here to avoid circular imports
+            from src.fireball import fireball_pool  # Import here to avoid circular imports
             
             # Create fireball at appropriate position
             if self.facing_right:
@@ -384,22 +363,23 @@ class Player(pygame.sprite.Sprite):
             
             # Create fireball with direction based on player facing
             direction = 1 if self.facing_right else -1
-            fireball = Fireball(fireball_x, fireball_y, direction)
+            fireball = fireball_pool.acquire(fireball_x, fireball_y, direction)
             
             # Add to fireballs group
             fireballs_group.add(fireball)
             
             # Set cooldown to prevent rapid fire
-            self.fireball_cooldown = 20  # 20 frames (about 1/3 second at 60fps)
+            self.fireball_cooldown = ticks(20)  # 20 frames (about 1/3 second at 60fps)
             
             # Optional: Small recoil for visual effect
-            self.velocity_x -= direction * 0.5
+            self.velocity_x -= direction * per_tick(0.5)
             
             return True
         return False
         
     def collect_powerup(self, powerup_type):
         """Apply effect of a collected power-up"""
+        trace_event("powerup", type=powerup_type)
         if powerup_type == "mushroom":
             if self.lives < MAX_LIVES:
                 self.lives += 1
@@ -453,7 +433,7 @@ class Player(pygame.sprite.Sprite):
         
         # Knocked back slightly and bounce up
         direction = -1 if self.facing_right else 1
-        self.velocity_x = 5 * direction
-        self.velocity_y = -8
+        self.velocity_x = per_tick(5) * direction
+        self.velocity_y = per_tick(-8)
         
         return self.lives <= 0  # Return whether player is dead 
\ No newline at end of file
@@ -5,9 +5,15 @@ from src.constants import (
     POWERUP_SIZE, GRAVITY, SCREEN_HEIGHT, 
     RED, WHITE, GOLD, YELLOW, ORANGE, GREEN, BLACK
 )
+from src.constants import convert_surface, ticks
+from src.atlas import get_frame, frame_key
+from src.scheduler import PHYSICS
 
 class PowerUp(pygame.sprite.Sprite):
     """Base class for all power-ups"""
+    update_phase = PHYSICS
+    update_section = "powerups"
+
     def __init__(self, x, y, type_name):
         super().__init__()
         self.type = type_name
@@ -25,8 +31,15 @@ class PowerUp(pygame.sprite.Sprite):
         # Rotation for star powerup
         self.angle = 0
         
-    def create_animation_frames(self, type_name):
+    @staticmethod
+    def create_animation_frames(type_name):
         """Create multiple frames for each powerup type"""
+        # Use the pre-baked frames from the sprite atlas when available
+        baked = [get_frame(frame_key(f"powerup_{type_name}_{i}", POWERUP_SIZE, POWERUP_SIZE))
+                 for i in range(4)]
+        if all(frame is not None for frame in baked):
+            return baked
+
         frames = []
         
         if type_name == "mushroom":
@@ -128,7 +141,7 @@ class PowerUp(pygame.sprite.Sprite):
                 
                 frames.append(img)
         
-        return frames
+        return [convert_surface(frame) for frame in frames]
     
     def update(self):
         # Apply gravity
@@ -146,7 +159,7 @@ class PowerUp(pygame.sprite.Sprite):
         # Bobbing animation when on ground
         if self.on_ground:
             self.animation_timer += 1
-            if self.animation_timer > 5:
+            if self.animation_timer > ticks(5):
                 self.animation_timer = 0
                 self.bob_offset += self.bob_direction
                 if abs(self.bob_offset) > 3:
@@ -155,7 +168,7 @@ class PowerUp(pygame.sprite.Sprite):
         
         # Animate powerups
         self.animation_timer += 1
-        if self.animation_timer > 8:  # Adjust for animation speed
+        if self.animation_timer > ticks(8):  # Adjust for animation speed
             self.animation_timer = 0
             self.animation_index = (self.animation_index + 1) % len(self.animation_frames)
             
@@ -200,6 +213,7 @@ class LifeIcon(pygame.sprite.Sprite):
             (4, 8),   # Middle left
             (8, 12),  # Lower middle
         ])
+        self.image = convert_surface(self.image)
         
         self.rect = self.image.get_rect()
         self.rect.x = x
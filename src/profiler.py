@@ -0,0 +1,185 @@
+import pygame
+import time
+from collections import deque
+import numpy as np
+from src.constants import SCREEN_WIDTH, WHITE, convert_surface
+from src.text import render_text, draw_counter
+
+# Frames of section timings kept for statistics (None keeps every frame)
+PROFILE_HISTORY = 600
+PERCENTILES = (50, 95, 99)
+
+# Overlay layout: averages over the last PROFILE_AVERAGE_FRAMES frames, refreshed
+# every OVERLAY_REFRESH_FRAMES so the numbers can be read, above a scrolling graph
+PROFILE_AVERAGE_FRAMES = 120
+OVERLAY_REFRESH_FRAMES = 15
+OVERLAY_WIDTH = 240
+OVERLAY_LINE_HEIGHT = 16
+OVERLAY_FONT_SIZE = 20
+GRAPH_HEIGHT = 80
+GRAPH_SCALE = 3  # Graph pixels per millisecond
+FRAME_BUDGET_MS = 1000 / 60  # Drawn as a line across the graph
+SECTION_COLORS = [
+    (230, 25, 75), (60, 180, 75), (255, 225, 25), (0, 130, 200), (245, 130, 48),
+    (145, 30, 180), (70, 240, 240), (240, 50, 230), (210, 245, 60), (250, 190, 212),
+    (0, 128, 128), (170, 110, 40),
+]
+
+
+class FrameProfiler:
+    """Wall-clock time spent in each section of a frame, in milliseconds.
+
+    The game loop calls begin_frame(), then lap(name) at the end of each
+    section, which charges the time since the previous lap to that name,
+    then end_frame(). Sections that run more than once in a frame (one per
+    simulation tick, say) add up. When disabled every call returns at once.
+    With a tracer attached, every lap and frame is also recorded as a span.
+    """
+    def __init__(self, enabled=False, history=PROFILE_HISTORY, tracer=None):
+        self.enabled = enabled
+        self.tracer = tracer
+        self.frame_number = 0
+        self.frames = deque(maxlen=history)  # One {section: ms, "total": ms} dict per frame
+        self.current = None
+        self.frame_start = 0.0
+        self.last_lap = 0.0
+
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.current = {}
+        self.frame_start = self.last_lap = time.perf_counter()
+
+    def lap(self, name):
+        """Charge the time since the last lap (or the frame start) to a section"""
+        if self.current is None:
+            return
+        now = time.perf_counter()
+        self.current[name] = self.current.get(name, 0.0) + (now - self.last_lap) * 1000
+        if self.tracer is not None:
+            self.tracer.complete(name, self.last_lap, now)
+        self.last_lap = now
+
+    def end_frame(self):
+        if self.current is None:
+            return
+        now = time.perf_counter()
+        self.current["total"] = (now - self.frame_start) * 1000
+        self.frames.append(self.current)
+        self.current = None
+        self.frame_number += 1
+        if self.tracer is not None:
+            self.tracer.complete("frame", self.frame_start, now, frame=self.frame_number)
+
+    def section_names(self):
+        """Return every section seen, in the order they were first timed, then "total" """
+        names = {}
+        for frame in self.frames:
+            names.update(dict.fromkeys(frame))
+        names.pop("total", None)
+        return list(names) + ["total"] if self.frames else []
+
+    def get_stats(self):
+        """Return mean, percentiles and max time per section over the kept frames"""
+        stats = {}
+        for name in self.section_names():
+            times = np.array([frame.get(name, 0.0) for frame in self.frames])
+            section = {"mean": float(times.mean())}
+            for percentile, value in zip(PERCENTILES, np.percentile(times, PERCENTILES)):
+                section[f"p{percentile}"] = float(value)
+            section["max"] = float(times.max())
+            stats[name] = section
+        return stats
+
+    def averages(self, frames=PROFILE_AVERAGE_FRAMES):
+        """Return the mean time per section over the most recent frames"""
+        recent = list(self.frames)[-frames:]
+        if not recent:
+            return {}
+        return {name: sum(frame.get(name, 0.0) for frame in recent) / len(recent)
+                for name in self.section_names()}
+
+
+class ProfilerOverlay:
+    """Rolling section averages and a stacked frame-time graph, drawn on the screen.
+
+    The graph is kept on its own surface, scrolled one pixel left per frame
+    with only the new column drawn, so the overlay costs about the same
+    however much history it shows.
+    """
+    def __init__(self, profiler, x=SCREEN_WIDTH - OVERLAY_WIDTH - 10, y=45):
+        self.profiler = profiler
+        self.x = x
+        self.y = y
+        self.colors = {}  # Section name -> graph color
+        self.lines = []  # (name, microseconds) shown until the next refresh
+        self.frames_seen = 0
+        self.last_frame = None
+        self.graph = convert_surface(pygame.Surface((OVERLAY_WIDTH, GRAPH_HEIGHT)), alpha=False)
+        self.panel = None
+        self.rect = pygame.Rect(x, y, OVERLAY_WIDTH, GRAPH_HEIGHT)
+        self.clear()
+
+    def clear(self):
+        self.graph.fill((0, 0, 0))
+        self.lines = []
+        self.frames_seen = 0
+
+    def color(self, name):
+        color = self.colors.get(name)
+        if color is None:
+            color = SECTION_COLORS[len(self.colors) % len(SECTION_COLORS)]
+            self.colors[name] = color
+        return color
+
+    def add_frame(self, frame):
+        """Scroll the graph and draw one stacked column for a frame"""
+        self.graph.scroll(-1, 0)
+        column = OVERLAY_WIDTH - 1
+        self.graph.fill((0, 0, 0), (column, 0, 1, GRAPH_HEIGHT))
+        bottom = GRAPH_HEIGHT
+        for name, ms in frame.items():
+            if name == "total":
+                continue
+            height = ms * GRAPH_SCALE
+            top = bottom - height
+            if int(top) < int(bottom):
+                self.graph.fill(self.color(name), (column, int(top), 1, int(bottom) - int(top)))
+            bottom = top
+            if bottom <= 0:
+                break
+        budget_y = GRAPH_HEIGHT - round(FRAME_BUDGET_MS * GRAPH_SCALE)
+        if budget_y >= 0:
+            self.graph.set_at((column, budget_y), WHITE)
+
+    def refresh(self):
+        """Recompute the averages shown as text and the panel size"""
+        averages = self.profiler.averages()
+        self.lines = [(name, round(ms * 1000)) for name, ms in averages.items()]
+        height = (len(self.lines) + 1) * OVERLAY_LINE_HEIGHT + GRAPH_HEIGHT + 8
+        if self.panel is None or self.panel.get_height() != height:
+            self.panel = pygame.Surface((OVERLAY_WIDTH + 8, height), pygame.SRCALPHA)
+            self.panel.fill((0, 0, 0, 160))
+            self.panel = convert_surface(self.panel)
+            self.rect = pygame.Rect(self.x - 4, self.y - 4, OVERLAY_WIDTH + 8, height)
+
+    def draw(self, surface):
+        frames = self.profiler.frames
+        if frames and frames[-1] is not self.last_frame:
+            self.last_frame = frames[-1]
+            self.add_frame(self.last_frame)
+            self.frames_seen += 1
+            if self.frames_seen % OVERLAY_REFRESH_FRAMES == 1:
+                self.refresh()
+        if self.panel is None:
+            return
+
+        surface.blit(self.panel, self.rect)
+        x, y = self.x, self.y
+        surface.blit(render_text("Average per frame (us)", OVERLAY_FONT_SIZE, WHITE), (x, y))
+        for name, microseconds in self.lines:
+            y += OVERLAY_LINE_HEIGHT
+            if name != "total":
+                surface.fill(self.color(name), (x, y + 3, 8, 8))
+            draw_counter(surface, f"{name}: ", microseconds, x + 12, y, OVERLAY_FONT_SIZE, WHITE)
+        surface.blit(self.graph, (x, y + OVERLAY_LINE_HEIGHT + 4))
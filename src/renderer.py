@@ -0,0 +1,215 @@
+import pygame
+import time
+from collections import Counter
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+from src.display import present
+
+# Render modes
+FULL = "full"
+DIRTY = "dirty"
+# Set MARIO_RENDER_MODE=dirty to start in dirty-rectangle mode (F2 toggles in game)
+RENDER_MODE_ENV = "MARIO_RENDER_MODE"
+
+# Redraw everything when more than this fraction of the screen changed
+DIRTY_AREA_LIMIT = 0.5
+# ...or when more sprites than this changed, as merging their rects would cost more
+DIRTY_RECT_LIMIT = 200
+
+
+def merge_rects(rects):
+    """Merge overlapping rects so no region is redrawn twice"""
+    merged = []
+    for rect in rects:
+        rect = rect.clip(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+        if not rect.width or not rect.height:
+            continue
+        # Keep absorbing neighbours until the rect stops growing
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
+
+
+class FrameRenderer:
+    """Draws the world either with full redraws or by updating only the regions that changed.
+
+    World sprites are not blitted straight to the screen: they are recorded
+    through blit()/blits() (so the renderer can be passed anywhere a surface
+    is expected) and drawn by draw_world(). In dirty mode the recorded list is
+    compared with the previous frame; only rects whose image or position
+    changed, plus the overlay areas (HUD), get the backdrop restored and the
+    sprites on top of them redrawn, and only those rects are sent to the
+    display. A camera scroll changes every pixel, so it falls back to a full
+    redraw. Full mode never diffs, so it records the (image, position) pairs
+    as they come and hands them to the screen in one blits call.
+    """
+    def __init__(self, screen, mode=FULL):
+        self.screen = screen
+        self.mode = mode
+        self.items = []  # (image, rect) recorded this frame in draw order; (image, position) in full mode
+        self.previous_keys = Counter()  # Item signatures of the previous frame
+        self.overlay_rects = []  # Areas drawn directly on the screen this frame (HUD)
+        self.previous_overlay_rects = []
+        self.update_rects = []
+        self.last_scroll = None
+        self.last_static_key = None
+        self.full_redraw = True
+        self.invalidated = True
+        self.frame_start = 0
+        self.cpu_start = 0
+        self.stats = {}
+
+    def get_width(self):
+        return self.screen.get_width()
+
+    def get_height(self):
+        return self.screen.get_height()
+
+    def toggle_mode(self):
+        """Switch between full and dirty-rectangle rendering"""
+        self.mode = DIRTY if self.mode == FULL else FULL
+        self.invalidate()
+        return self.mode
+
+    def invalidate(self):
+        """Force the next frame to redraw the whole screen (e.g. after a cutscene)"""
+        self.invalidated = True
+        self.last_static_key = None
+
+    def begin_frame(self, scroll_x, force_full=False):
+        """Start recording a frame. Returns True if the whole screen will be redrawn"""
+        self.frame_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        scroll = round(scroll_x)
+        self.full_redraw = (self.mode == FULL or force_full or self.invalidated
+                            or scroll != self.last_scroll)
+        self.last_scroll = scroll
+        self.invalidated = False
+        self.last_static_key = None
+        self.items = []
+        self.overlay_rects = []
+        return self.full_redraw
+
+    def blit(self, image, dest):
+        """Record a world sprite. Returns the screen rect it will cover in dirty mode"""
+        if self.mode == FULL:
+            self.items.append((image, dest))
+            return None
+        rect = image.get_rect(topleft=(dest[0], dest[1]))
+        self.items.append((image, rect))
+        return rect
+
+    def blits(self, blit_sequence, doreturn=True):
+        """Record several world sprites, like Surface.blits"""
+        if self.mode == FULL:
+            self.items.extend(blit_sequence)
+            return None
+        rects = [self.blit(item[0], item[1]) for item in blit_sequence]
+        return rects if doreturn else None
+
+    def add_overlay(self, rect):
+        """Mark an area that is drawn straight onto the screen after the world"""
+        self.overlay_rects.append(pygame.Rect(rect))
+
+    def draw_world(self, draw_backdrop):
+        """Draw the recorded sprites over the backdrop, redrawing only what changed in dirty mode"""
+        items = self.items
+        if self.mode == FULL:
+            draw_backdrop()
+            self.screen.blits(items, doreturn=False)
+            self.update_rects = None
+            self.full_redraw = True
+            self.previous_keys = Counter()
+            return
+
+        # The alpha is part of the signature because flashing sprites reuse their image.
+        # Signatures are counted, since two identical sprites on the same spot blend twice
+        keys = Counter((id(image), image.get_alpha(), tuple(rect)) for image, rect in items)
+
+        if not self.full_redraw:
+            previous_keys = self.previous_keys
+            changed = [pygame.Rect(key[2]) for key in keys.keys() | previous_keys.keys()
+                       if keys[key] != previous_keys[key]]
+            changed += self.overlay_rects + self.previous_overlay_rects
+            dirty = merge_rects(changed) if len(changed) <= DIRTY_RECT_LIMIT else None
+            if dirty is None or (sum(rect.width * rect.height for rect in dirty)
+                                 > SCREEN_WIDTH * SCREEN_HEIGHT * DIRTY_AREA_LIMIT):
+                self.full_redraw = True
+            else:
+                for rect in dirty:
+                    self.screen.set_clip(rect)
+                    draw_backdrop()
+                    self.screen.blits([(image, item_rect) for image, item_rect in items
+                                       if item_rect.colliderect(rect)], False)
+                self.screen.set_clip(None)
+                self.update_rects = dirty
+
+        if self.full_redraw:
+            draw_backdrop()
+            self.screen.blits(items, False)
+            self.update_rects = None
+
+        self.previous_keys = keys
+
+    def present(self):
+        """Show the frame: a flip after a full redraw, otherwise only the dirty rects"""
+        self.previous_overlay_rects = self.overlay_rects
+        if self.update_rects is None:
+            present(self.screen)
+            pixels = SCREEN_WIDTH * SCREEN_HEIGHT
+        else:
+            present(self.screen, self.update_rects)
+            pixels = sum(rect.width * rect.height for rect in self.update_rects)
+        self.record_frame(pixels)
+
+    def present_static(self, key, draw):
+        """Draw and show a screen that only changes when its key changes (menus)"""
+        self.frame_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+        if self.mode == DIRTY and key == self.last_static_key:
+            # Nothing changed, so there is nothing to draw or send to the display
+            self.update_rects = []
+            self.record_frame(0)
+            return False
+        self.update_rects = None
+        draw()
+        present(self.screen)
+        self.record_frame(SCREEN_WIDTH * SCREEN_HEIGHT)
+        self.last_static_key = key
+        # The world has to be redrawn completely after leaving the static screen
+        self.invalidated = True
+        return True
+
+    def record_frame(self, pixels):
+        stats = self.stats.setdefault(self.mode, {
+            "frames": 0, "full_redraws": 0, "frame_time": 0.0, "cpu_time": 0.0, "pixels": 0
+        })
+        stats["frames"] += 1
+        stats["full_redraws"] += self.update_rects is None
+        stats["frame_time"] += time.perf_counter() - self.frame_start
+        stats["cpu_time"] += time.process_time() - self.cpu_start
+        stats["pixels"] += pixels
+
+    def get_stats(self):
+        """Return average draw+present time, CPU time and pixels updated per mode"""
+        report = {}
+        for mode, stats in self.stats.items():
+            frames = max(1, stats["frames"])
+            report[mode] = {
+                "frames": stats["frames"],
+                "full_redraws": stats["full_redraws"],
+                "avg_frame_ms": stats["frame_time"] * 1000 / frames,
+                "avg_cpu_ms": stats["cpu_time"] * 1000 / frames,
+                "avg_pixels": stats["pixels"] // frames,
+            }
+        return report
+
+    def print_stats(self):
+        for mode, stats in self.get_stats().items():
+            print(f"Render mode {mode}: {stats['frames']} frames "
+                  f"({stats['full_redraws']} full redraws), "
+                  f"{stats['avg_frame_ms']:.2f} ms/frame, "
+                  f"{stats['avg_cpu_ms']:.2f} ms CPU/frame, "
+                  f"{stats['avg_pixels']} pixels updated/frame")
@@ -0,0 +1,223 @@
+import pygame
+import random
+import math
+from src.constants import (
+    SCREEN_WIDTH, SCREEN_HEIGHT, BLACK, WHITE, RED, YELLOW, GOLD,
+    BOSS_WIDTH, BOSS_HEIGHT
+)
+from src.constants import ticks, per_tick
+from src.text import get_font, render_text
+from src import audio
+
+FRAME_STEP = per_tick(1)  # Scene frames (60 a second) that one simulation tick lasts
+
+
+class Scene:
+    """A cutscene ticked by the main loop, one update() per simulation tick.
+
+    A scene is a list of stages, each lasting a number of frames. Frames
+    are counted at 60 a second whatever the tick rate, so at other rates
+    a tick moves the timeline on by a fraction or several frames. update()
+    advances the timeline and draw() paints the scene over the world the
+    main loop has just drawn, so nothing here waits on input, sound or
+    timers. Any key other than ESC skips the rest of the scene. ESC leaves
+    for the menu, which also ends the scene, so its bonus is still awarded.
+    """
+    stages = ()  # (name, frames) in play order
+    score_bonus = 0  # Added to the player's score when the scene ends
+
+    def __init__(self):
+        self.stage_index = 0
+        self.frame = 0  # Frames into the current stage
+        self.total_frames = 0  # Frames since the scene started
+        self.finished = not self.stages
+
+    @property
+    def stage(self):
+        return self.stages[self.stage_index][0] if not self.finished else None
+
+    def update(self):
+        """Advance the timeline by one tick"""
+        if self.finished:
+            return
+        self.frame += FRAME_STEP
+        self.total_frames += FRAME_STEP
+        if self.frame >= self.stages[self.stage_index][1]:
+            self.stage_index += 1
+            self.frame = 0
+            self.finished = self.stage_index >= len(self.stages)
+
+    def skip(self):
+        self.finished = True
+
+    def handle_event(self, event):
+        """Skip the scene on any key but ESC, which the main loop handles"""
+        if event.type == pygame.KEYDOWN and event.key != pygame.K_ESCAPE:
+            self.skip()
+
+    def draw(self, screen):
+        pass
+
+
+class BossIntroScene(Scene):
+    """Dark arena build-up, then a white flash over the level and a short pause"""
+    stages = (("arena", 180), ("flash", 17), ("hold", 30))
+
+    sky_color = (20, 20, 40)  # Darker blue
+    ground_color = (60, 30, 30)  # Darker red/brown
+
+    def __init__(self):
+        super().__init__()
+        self.arena = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.lightning_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.lightning_surf.fill((255, 255, 255))
+        self.lightning_flash = False
+        self.lightning_alpha = 0
+        self.lightning_timer = 0
+        self.warning_alpha = 0
+        self.warning_direction = 1  # 1 = fade in, -1 = fade out
+        self.silhouette = pygame.Surface((BOSS_WIDTH * 2, BOSS_HEIGHT * 2), pygame.SRCALPHA)
+        pygame.draw.rect(self.silhouette, (200, 0, 0), self.silhouette.get_rect(), 0)
+        self.silhouette.set_alpha(0)
+        self.silhouette_alpha = 0
+        self.silhouette_pos = (SCREEN_WIDTH // 2 - self.silhouette.get_width() // 2,
+                               SCREEN_HEIGHT // 2 - self.silhouette.get_height() // 2)
+        self.flash_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.flash_surf.fill((255, 255, 255))
+        self.screen_shake = 0
+        self.draw_arena()
+
+    def update(self):
+        super().update()
+        if self.stage == "arena":
+            self.draw_arena()
+
+    def draw_arena(self):
+        """Paint the current arena frame into self.arena"""
+        frame = self.frame
+        progress = frame / self.stages[0][1]
+        arena = self.arena
+
+        # Background color that gradually changes
+        arena.fill([int(BLACK[c] + (self.sky_color[c] - BLACK[c]) * progress) for c in range(3)])
+        pygame.draw.rect(arena, self.ground_color, (0, SCREEN_HEIGHT - 60, SCREEN_WIDTH, 60))
+
+        # Jagged mountains in background
+        for i in range(5):
+            points = [
+                (SCREEN_WIDTH * i // 5, SCREEN_HEIGHT - 60),
+                (SCREEN_WIDTH * i // 5 + SCREEN_WIDTH // 10, SCREEN_HEIGHT - 120 - random.randint(0, 50)),
+                (SCREEN_WIDTH * (i + 1) // 5, SCREEN_HEIGHT - 60)
+            ]
+            pygame.draw.polygon(arena, (40, 20, 20), points)
+
+        # Lightning flashes, more often near the end
+        if progress > 0.3:
+            self.lightning_timer += 1
+            if self.lightning_timer % ticks(20) == 0 or (progress > 0.8 and self.lightning_timer % ticks(10) == 0):
+                self.lightning_flash = True
+                self.lightning_alpha = random.randint(100, 200)
+            if self.lightning_flash:
+                self.lightning_alpha -= per_tick(10)
+                if self.lightning_alpha <= 0:
+                    self.lightning_flash = False
+                    self.lightning_alpha = 0
+                else:
+                    self.lightning_surf.set_alpha(self.lightning_alpha)
+                    arena.blit(self.lightning_surf, (0, 0), special_flags=pygame.BLEND_ADD)
+
+        # Pulsing warning text and blinking subtitle
+        if progress > 0.4:
+            self.warning_alpha += self.warning_direction * per_tick(8)
+            if self.warning_alpha >= 255:
+                self.warning_alpha = 255
+                self.warning_direction = -1
+            elif self.warning_alpha <= 0:
+                self.warning_alpha = 0
+                self.warning_direction = 1
+            # render_text returns a shared surface, so fade a copy
+            warning_surf = render_text("BOSS BATTLE", 72, RED).copy()
+            warning_surf.set_alpha(self.warning_alpha)
+            arena.blit(warning_surf, warning_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)))
+            if frame % 30 < 15:
+                subtitle_surf = render_text("PREPARE FOR BATTLE!", 36, YELLOW)
+                arena.blit(subtitle_surf, subtitle_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3 + 50)))
+
+        # Boss silhouette fades in, then its eyes glow and it shakes
+        if progress > 0.6:
+            self.silhouette_alpha = min(self.silhouette_alpha + per_tick(5), 200)
+            self.silhouette.set_alpha(self.silhouette_alpha)
+            if progress > 0.8:
+                eye_radius = int(5 + 5 * math.sin(frame / 10))
+                width, height = self.silhouette.get_size()
+                pygame.draw.circle(self.silhouette, (255, 0, 0), (width // 3, height // 3), eye_radius)
+                pygame.draw.circle(self.silhouette, (255, 0, 0), (width * 2 // 3, height // 3), eye_radius)
+            shake_x = random.randint(-2, 2) if progress > 0.8 else 0
+            shake_y = random.randint(-2, 2) if progress > 0.8 else 0
+            arena.blit(self.silhouette, (self.silhouette_pos[0] + shake_x, self.silhouette_pos[1] + shake_y))
+
+        self.screen_shake = random.randint(-4, 4) if progress > 0.85 else 0
+
+    def draw(self, screen):
+        if self.stage == "arena":
+            if self.screen_shake:
+                screen.fill(BLACK)
+            screen.blit(self.arena, (self.screen_shake, self.screen_shake))
+        elif self.stage == "flash":
+            self.flash_surf.set_alpha(255 - self.frame * 15)
+            screen.blit(self.flash_surf, (0, 0))
+
+
+class BossVictoryScene(Scene):
+    """Flash, growing "BOSS DEFEATED!" text and the bonus, with the boss in its hurt pose"""
+    stages = (("victory", 120),)
+    score_bonus = 1000
+
+    def __init__(self, boss):
+        super().__init__()
+        self.boss = boss
+        self.flash_surf = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
+        self.flash_surf.fill((255, 255, 255))
+        # Sounds are prepared at startup; here they are only started on their frame
+        self.cues = list(audio.victory_cues)
+        self.play_cues()
+        self.boss.image = self.boss.hurt_frame
+
+    def play_cues(self):
+        while self.cues and self.cues[0][0] <= self.total_frames:
+            self.cues.pop(0)[1].play()
+
+    def update(self):
+        super().update()
+        self.boss.image = self.boss.hurt_frame
+        self.play_cues()
+
+    def draw(self, screen):
+        frame = self.frame
+
+        # Flash fades out
+        if frame < 20:
+            self.flash_surf.set_alpha(max(0, 180 - frame * 9))
+            screen.blit(self.flash_surf, (0, 0))
+
+        # Victory text grows in, then pulses
+        if frame > 30:
+            text_size = int(min(72, (frame - 30) * 2))
+            text_surf = get_font(text_size).render("BOSS DEFEATED!", True, GOLD)
+            text_surf.set_alpha(min(255, (frame - 30) * 8))
+            if frame > 60:
+                scale = 1.0 + 0.05 * abs(math.sin((frame - 60) / 10))
+                text_surf = pygame.transform.scale(
+                    text_surf, (int(text_surf.get_width() * scale), int(text_surf.get_height() * scale)))
+            screen.blit(text_surf, text_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 3)))
+
+        # Bonus and continue prompt
+        if frame > 60:
+            bonus_surf = render_text(f"+{self.score_bonus} POINTS!", 48, WHITE).copy()
+            bonus_surf.set_alpha(min(255, (frame - 60) * 12))
+            screen.blit(bonus_surf, bonus_surf.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)))
+            if frame > 90:
+                continue_surf = render_text("Press any key to continue", 30, WHITE).copy()
+                continue_surf.set_alpha(min(255, (frame - 90) * 15))
+                screen.blit(continue_surf, continue_surf.get_rect(
+                    center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT * 2 // 3)))
@@ -0,0 +1,85 @@
+# Update phases, in the order they run every simulation tick
+INPUT = "input"          # The player acting on its controls, and the moving platforms it rides
+AI = "ai"                # Enemies deciding what to do about where the player is now
+PHYSICS = "physics"      # Everything else moving: enemies, power-ups, fireballs, crumbling platforms
+COLLISION = "collision"  # After the level's collisions are resolved, the boss acts and is hit
+ANIMATION = "animation"  # Purely visual state
+PHASES = (INPUT, AI, PHYSICS, COLLISION, ANIMATION)
+
+
+class UpdateScheduler:
+    """Runs every registered entity's update exactly once per simulation tick.
+
+    Entities are registered once, in one phase and one section of it:
+    sprites by the SpatialGroup they are added to, from their `update_phase`
+    and `update_section` class attributes (sprites without a phase have
+    nothing to update), anything else with add(). The game loop calls
+    begin_tick(), then run(phase) for each phase in order. A phase updates
+    its sections in the order they were first registered, the entities of
+    a section in registration order, and laps the profiler once per section
+    with the section's name ("player", "enemies"...), so every kind of
+    entity is timed on its own. Running a phase twice in a tick, or after
+    a later one, is an error.
+    """
+    def __init__(self, profiler=None, phases=PHASES):
+        self.profiler = profiler
+        self.phases = phases
+        self.phase_index = {phase: index for index, phase in enumerate(phases)}
+        self.sections = {phase: {} for phase in phases}  # Phase -> {section: {entity: update callable}}
+        self.entity_section = {}  # Entity -> (phase, section)
+        self.next_phase = 0
+        self.tick_count = 0
+
+    def add(self, entity, phase=None, update=None, section=None):
+        """Register an entity, in its update_phase and update_section unless given.
+
+        Returns False if it has no phase.
+        """
+        if phase is None:
+            phase = getattr(entity, "update_phase", None)
+            if phase is None:
+                return False
+        if entity in self.entity_section:
+            raise ValueError(f"{entity!r} is already scheduled in the {self.entity_section[entity][0]} phase")
+        if section is None:
+            section = getattr(entity, "update_section", phase)
+        # Sections are kept when they empty, so their order doesn't change when the level resets
+        self.sections[phase].setdefault(section, {})[entity] = update or entity.update
+        self.entity_section[entity] = (phase, section)
+        return True
+
+    def remove(self, entity):
+        placed = self.entity_section.pop(entity, None)
+        if placed is not None:
+            phase, section = placed
+            del self.sections[phase][section][entity]
+
+    def __contains__(self, entity):
+        return entity in self.entity_section
+
+    def begin_tick(self):
+        self.next_phase = 0
+        self.tick_count += 1
+
+    def run(self, phase):
+        """Update every entity in a phase; phases must run in order, once per tick"""
+        index = self.phase_index[phase]
+        if index < self.next_phase:
+            raise RuntimeError(f"The {phase} phase already ran this tick, or a later phase did")
+        self.next_phase = index + 1
+        for section, updates in self.sections[phase].items():
+            if not updates:
+                continue
+            # Iterate over a copy, as updates may add or remove entities
+            for update in list(updates.values()):
+                update()
+            if self.profiler is not None:
+                self.profiler.lap(section)
+
+    def get_stats(self):
+        """Return the ticks run and how many entities each phase and section updates"""
+        return {
+            "ticks": self.tick_count,
+            "entities": {phase: {section: len(updates) for section, updates in sections.items()}
+                         for phase, sections in self.sections.items()},
+        }
@@ -0,0 +1,76 @@
+import pygame
+
+# Sprites that moved further than this in one tick were teleported and aren't interpolated
+INTERPOLATION_SNAP_DISTANCE = 100
+
+
+class SpatialGroup(pygame.sprite.Group):
+    """Sprite group that keeps its moving sprites apart for viewport queries.
+
+    Sprites with a true `static` attribute never move horizontally (platforms,
+    spikes, trees...) and are drawn from the pre-baked static layer, so only
+    the moving sprites are looked at by query() and snapshot(). They are
+    scanned rather than bucketed: re-bucketing them every tick is a Python
+    loop over all of them, which costs more than the scan it saves.
+
+    With a scheduler, sprites are registered for updates while they are in
+    the group.
+    """
+    def __init__(self, *sprites, scheduler=None):
+        self.scheduler = scheduler
+        self.static_count = 0
+        self.dynamic = set()
+        self.order = {}  # Sprite -> insertion number, to keep the group's draw order
+        self.next_order = 0
+        self.previous_positions = {}  # Moving sprite -> top left at the start of the tick
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.order[sprite] = self.next_order
+        self.next_order += 1
+        if self.scheduler is not None:
+            self.scheduler.add(sprite)
+        if getattr(sprite, "static", False):
+            self.static_count += 1
+        else:
+            self.dynamic.add(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.order.pop(sprite, None)
+        if self.scheduler is not None:
+            self.scheduler.remove(sprite)
+        if sprite in self.dynamic:
+            self.dynamic.discard(sprite)
+        else:
+            self.static_count -= 1
+
+    def query(self, rect):
+        """Return the moving sprites whose rect collides with a world-space rect, in draw order"""
+        visible = [sprite for sprite in self.dynamic if sprite.rect.colliderect(rect)]
+        visible.sort(key=self.order.__getitem__)
+        return visible
+
+    def snapshot(self):
+        """Remember where the moving sprites are before a simulation tick"""
+        self.previous_positions = {sprite: sprite.rect.topleft for sprite in self.dynamic}
+
+    def interpolated_position(self, sprite, alpha):
+        """Return a sprite's top left between the last two ticks (alpha 0 = previous, 1 = current)"""
+        x, y = sprite.rect.topleft
+        previous = self.previous_positions.get(sprite)
+        if previous is None:
+            return x, y
+        previous_x, previous_y = previous
+        if abs(x - previous_x) + abs(y - previous_y) > INTERPOLATION_SNAP_DISTANCE:
+            return x, y
+        return (round(previous_x + (x - previous_x) * alpha),
+                round(previous_y + (y - previous_y) * alpha))
+
+    def get_stats(self):
+        """Return how many sprites are static and how many move"""
+        return {
+            "static": self.static_count,
+            "dynamic": len(self.dynamic),
+        }
@@ -1,9 +1,11 @@
 import pygame
-from src.constants import SPIKE_WIDTH, SPIKE_HEIGHT
+from src.constants import SPIKE_WIDTH, SPIKE_HEIGHT, convert_surface
+from src.atlas import get_frame, frame_key
 
 class Spike(pygame.sprite.Sprite):
     # Add class variable for height
     height = SPIKE_HEIGHT
+    static = True  # Never moves, so it is baked into the static layer
     
     def __init__(self, x, y, width=SPIKE_WIDTH):
         super().__init__()
@@ -13,7 +15,13 @@ class Spike(pygame.sprite.Sprite):
         self.rect.y = y
         self.deadly = True  # Causes instant game over on collision
     
-    def create_spike_image(self, width, height):
+    @staticmethod
+    def create_spike_image(width, height):
+        # Use the pre-baked spikes from the sprite atlas when available
+        baked = get_frame(frame_key("spike", width, height))
+        if baked is not None:
+            return baked
+
         img = pygame.Surface((width, height), pygame.SRCALPHA)
         # Draw triangular spikes
         spike_color = (150, 150, 150)  # Metal gray
@@ -38,4 +46,4 @@ class Spike(pygame.sprite.Sprite):
                 (x_pos + spike_width - 2, height - 2)  # Slightly in from bottom right
             ])
         
-        return img 
\ No newline at end of file
+        return convert_surface(img) 
\ No newline at end of file
@@ -0,0 +1,99 @@
+import pygame
+from src.constants import SCREEN_WIDTH, convert_surface
+
+# Width in pixels of one baked chunk of level geometry
+STATIC_CHUNK_WIDTH = 512
+STATIC_EVICT_CHUNKS = 3  # Baked chunks further than this from the view are dropped
+
+
+class StaticLayer(pygame.sprite.Group):
+    """Sprite group whose members are baked into world-space chunk images.
+
+    Only sprites that never change (their class has static = True) belong
+    here. Each chunk is one image holding every member that overlaps it, in
+    the order they were added, so drawing the level costs one blit per
+    visible chunk. Adding or removing a sprite re-bakes the chunks it covers
+    the next time they are drawn.
+    """
+    def __init__(self, *sprites, chunk_width=STATIC_CHUNK_WIDTH):
+        self.chunk_width = chunk_width
+        self.chunk_sprites = {}  # Chunk index -> member sprites overlapping it, in draw order
+        self.chunks = {}  # Chunk index -> (image, top y), only for baked chunks
+        self.bakes = 0
+        self.evictions = 0
+        super().__init__(*sprites)
+
+    def chunk_span(self, sprite):
+        return (range(sprite.rect.left // self.chunk_width,
+                      (sprite.rect.right - 1) // self.chunk_width + 1))
+
+    def add_internal(self, sprite, layer=None):
+        if not getattr(sprite, "static", False):
+            raise ValueError(f"{type(sprite).__name__} is not static and can't be baked")
+        super().add_internal(sprite, layer)
+        for index in self.chunk_span(sprite):
+            self.chunk_sprites.setdefault(index, []).append(sprite)
+            self.chunks.pop(index, None)  # Re-bake on next draw
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        for index in self.chunk_span(sprite):
+            members = self.chunk_sprites[index]
+            members.remove(sprite)
+            if not members:
+                del self.chunk_sprites[index]
+            self.chunks.pop(index, None)
+
+    def bake_chunk(self, index):
+        """Draw every member overlapping a chunk into one image, cropped to their height"""
+        members = self.chunk_sprites[index]
+        top = min(sprite.rect.top for sprite in members)
+        bottom = max(sprite.rect.bottom for sprite in members)
+        left = index * self.chunk_width
+        image = pygame.Surface((self.chunk_width, bottom - top), pygame.SRCALPHA)
+        image.fill((0, 0, 0, 0))
+        image.blits([(sprite.image, (sprite.rect.x - left, sprite.rect.y - top))
+                     for sprite in members], False)
+        self.bakes += 1
+        image = convert_surface(image, alpha=True)
+        # Chunks are mostly transparent and never change, which is what RLE encoding is for
+        image.set_alpha(255, pygame.RLEACCEL)
+        return image, top
+
+    def get_chunk(self, index):
+        chunk = self.chunks.get(index)
+        if chunk is None:
+            chunk = self.bake_chunk(index)
+            self.chunks[index] = chunk
+        return chunk
+
+    def bake_all(self):
+        """Bake every chunk up front, e.g. at level load"""
+        for index in self.chunk_sprites:
+            self.get_chunk(index)
+
+    def draw(self, surface, camera):
+        """Blit the baked chunks under the camera and drop the ones far away"""
+        scroll_x = round(camera.scroll_x)
+        first = -scroll_x // self.chunk_width
+        last = (-scroll_x + SCREEN_WIDTH - 1) // self.chunk_width
+        for index in range(first, last + 1):
+            if index in self.chunk_sprites:
+                image, top = self.get_chunk(index)
+                surface.blit(image, (index * self.chunk_width + scroll_x, top))
+        for index in list(self.chunks):
+            if index < first - STATIC_EVICT_CHUNKS or index > last + STATIC_EVICT_CHUNKS:
+                del self.chunks[index]
+                self.evictions += 1
+
+    def get_stats(self):
+        """Return member, chunk and bake counts and the baked images' memory"""
+        return {
+            "sprites": len(self),
+            "chunks": len(self.chunk_sprites),
+            "baked_chunks": len(self.chunks),
+            "bakes": self.bakes,
+            "evictions": self.evictions,
+            "bytes": sum(image.get_width() * image.get_height() * image.get_bytesize()
+                         for image, top in self.chunks.values()),
+        }
@@ -0,0 +1,78 @@
+import pygame
+from collections import OrderedDict
+
+# Maximum number of rendered strings kept around
+TEXT_CACHE_SIZE = 256
+DIGIT_GLYPHS = "0123456789-"
+
+# One Font object per size, created on first use
+_fonts = {}
+# (text, size, color) -> rendered surface, least recently used first
+_text_cache = OrderedDict()
+# (size, color) -> {glyph: surface} used to compose numbers
+_digit_atlases = {}
+
+
+def get_font(size):
+    """Return the default font at a size, creating it only once"""
+    font = _fonts.get(size)
+    if font is None:
+        font = pygame.font.Font(None, size)
+        _fonts[size] = font
+    return font
+
+
+def render_text(text, size, color):
+    """Return a rendered text surface, reusing a cached one when possible.
+
+    The surface is shared, so set its alpha on every use if you change it.
+    Text whose color changes every frame should use get_font() directly.
+    """
+    key = (text, size, tuple(color))
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        return surface
+
+    surface = get_font(size).render(text, True, color)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
+
+
+def get_digit_atlas(size, color):
+    """Return the pre-rendered digit glyphs for a size and color"""
+    key = (size, tuple(color))
+    atlas = _digit_atlases.get(key)
+    if atlas is None:
+        font = get_font(size)
+        atlas = {glyph: font.render(glyph, True, color) for glyph in DIGIT_GLYPHS}
+        _digit_atlases[key] = atlas
+    return atlas
+
+
+def draw_number(surface, value, x, y, size, color):
+    """Draw an integer from pre-rendered digits. Returns the x after the last digit"""
+    atlas = get_digit_atlas(size, color)
+    for glyph in str(int(value)):
+        image = atlas[glyph]
+        surface.blit(image, (x, y))
+        x += image.get_width()
+    return x
+
+
+def draw_counter(surface, label, value, x, y, size, color):
+    """Draw a cached label followed by a number, e.g. 'Score: ' and 120"""
+    label_surface = render_text(label, size, color)
+    surface.blit(label_surface, (x, y))
+    return draw_number(surface, value, x + label_surface.get_width(), y, size, color)
+
+
+def get_text_cache_stats():
+    """Return how many fonts, strings and digit atlases are cached"""
+    return {
+        "fonts": len(_fonts),
+        "strings": len(_text_cache),
+        "digit_atlases": len(_digit_atlases),
+    }
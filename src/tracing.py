@@ -0,0 +1,188 @@
+import os
+import json
+import time
+import queue
+import threading
+from contextlib import nullcontext
+
+# Events collected before they are handed to the writer thread
+TRACE_BUFFER_EVENTS = 2048
+# NDJSON traces roll over to a new file at this size, keeping this many old ones
+TRACE_ROTATE_BYTES = 16 * 1024 * 1024
+TRACE_KEEP_FILES = 5
+
+# The tracer started by start_tracing(), if any. trace_event() and trace_span()
+# do nothing while it is None
+active_tracer = None
+_no_span = nullcontext()
+
+
+class ChromeTraceWriter:
+    """Writes events as a Chrome trace-event JSON file (chrome://tracing, Perfetto)"""
+    def __init__(self, path):
+        self.file = open(path, "w")
+        self.file.write('{"displayTimeUnit": "ms", "traceEvents": [\n')
+        self.first = True
+
+    def write(self, events):
+        lines = ",\n".join(json.dumps(event, separators=(",", ":")) for event in events)
+        if not self.first:
+            lines = ",\n" + lines
+        self.first = False
+        self.file.write(lines)
+
+    def close(self):
+        self.file.write("\n]}\n")
+        self.file.close()
+
+
+class RotatingNDJSONWriter:
+    """Writes one event per line, starting a new file when the current one is full.
+
+    The current file is always `path`; older ones are path.1, path.2... up to
+    `keep`, like logging's RotatingFileHandler.
+    """
+    def __init__(self, path, max_bytes=TRACE_ROTATE_BYTES, keep=TRACE_KEEP_FILES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.keep = keep
+        self.file = open(path, "w")
+        self.rotations = 0
+
+    def rotate(self):
+        self.file.close()
+        for index in range(self.keep - 1, 0, -1):
+            older = f"{self.path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+        self.file = open(self.path, "w")
+        self.rotations += 1
+
+    def write(self, events):
+        self.file.write("".join(json.dumps(event, separators=(",", ":")) + "\n" for event in events))
+        if self.file.tell() >= self.max_bytes:
+            self.rotate()
+
+    def close(self):
+        self.file.close()
+
+
+class Tracer:
+    """Opt-in recorder of frame phases and gameplay events.
+
+    Phases are Chrome "complete" events (a begin time and a duration, shown
+    as spans by trace viewers) and gameplay events are instant events. Events
+    are buffered and handed in batches to a writer thread, so the game never
+    waits on the disk. A path ending in .ndjson gives rotating NDJSON files,
+    anything else a Chrome trace-event JSON file.
+    """
+    def __init__(self, path):
+        self.path = path
+        if path.endswith(".ndjson"):
+            self.writer = RotatingNDJSONWriter(path)
+        else:
+            self.writer = ChromeTraceWriter(path)
+        self.start = time.perf_counter()
+        self.pid = os.getpid()
+        self.events = []
+        self.event_count = 0
+        self.batches = queue.Queue()
+        self.thread = threading.Thread(target=self.write_batches, name="trace-writer", daemon=True)
+        self.thread.start()
+
+    def timestamp(self, when=None):
+        """Microseconds since the tracer started, from a perf_counter() value"""
+        return ((time.perf_counter() if when is None else when) - self.start) * 1e6
+
+    def add(self, event):
+        event["pid"] = self.pid
+        event["tid"] = threading.get_ident()
+        self.events.append(event)
+        self.event_count += 1
+        if len(self.events) >= TRACE_BUFFER_EVENTS:
+            self.flush()
+
+    def complete(self, name, start, end, category="frame", **args):
+        """Record a phase that ran from start to end (perf_counter() values)"""
+        event = {"name": name, "cat": category, "ph": "X",
+                 "ts": self.timestamp(start), "dur": (end - start) * 1e6}
+        if args:
+            event["args"] = args
+        self.add(event)
+
+    def instant(self, name, category="game", **args):
+        event = {"name": name, "cat": category, "ph": "i", "s": "t", "ts": self.timestamp()}
+        if args:
+            event["args"] = args
+        self.add(event)
+
+    def span(self, name, category="game", **args):
+        return TraceSpan(self, name, category, args)
+
+    def flush(self):
+        if self.events:
+            self.batches.put(self.events)
+            self.events = []
+
+    def write_batches(self):
+        while True:
+            batch = self.batches.get()
+            if batch is None:
+                break
+            self.writer.write(batch)
+
+    def close(self):
+        """Write everything still buffered and close the file"""
+        self.flush()
+        self.batches.put(None)
+        self.thread.join()
+        self.writer.close()
+
+    def get_stats(self):
+        return {"events": self.event_count, "path": self.path}
+
+
+class TraceSpan:
+    """Context manager recording the time spent inside it as one complete event"""
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def __enter__(self):
+        self.begin = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.tracer.complete(self.name, self.begin, time.perf_counter(), self.category, **self.args)
+
+
+def start_tracing(path):
+    """Start recording to path and make the tracer the active one"""
+    global active_tracer
+    stop_tracing()
+    active_tracer = Tracer(path)
+    return active_tracer
+
+
+def stop_tracing():
+    """Finish the active trace, if any"""
+    global active_tracer
+    if active_tracer is not None:
+        active_tracer.close()
+        active_tracer = None
+
+
+def trace_event(name, **args):
+    """Record a gameplay event on the active trace"""
+    if active_tracer is not None:
+        active_tracer.instant(name, **args)
+
+
+def trace_span(name, **args):
+    """Return a context manager timing its body on the active trace"""
+    if active_tracer is None:
+        return _no_span
+    return active_tracer.span(name, **args)
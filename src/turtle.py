@@ -1,9 +1,14 @@
 import pygame
 import random
 from src.constants import ENEMY_WIDTH, ENEMY_HEIGHT, ENEMY_SPEED, GRAVITY, SCREEN_HEIGHT, WORLD_WIDTH
-from src.constants import load_image
+from src.constants import load_image, ticks, per_tick
+from src.scheduler import PHYSICS
 
 class Turtle(pygame.sprite.Sprite):
+    update_phase = PHYSICS
+    update_section = "enemies"
+    animation_delay = ticks(8)  # Ticks per animation step
+
     def __init__(self, x, y):
         super().__init__()
         # Create animation frames
@@ -36,14 +41,14 @@ class Turtle(pygame.sprite.Sprite):
         # Turtle specific properties
         self.in_shell = False
         self.shell_speed = 0
-        self.shell_max_speed = 10
+        self.shell_max_speed = per_tick(10)
         self.shell_timer = 0
-        self.shell_duration = 180  # 3 seconds at 60 FPS
+        self.shell_duration = ticks(180)  # 3 seconds
         
     def update(self):
         # Animation timing
         self.animation_timer += 1
-        if self.animation_timer > 8:
+        if self.animation_timer > self.animation_delay:
             self.animation_timer = 0
             self.animation_index = (self.animation_index + 1) % len(self.frames_right)
 
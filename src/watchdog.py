@@ -0,0 +1,118 @@
+import os
+import sys
+import json
+import time
+import threading
+from collections import Counter
+
+# A frame taking longer than this is a hitch (two frames at 60 fps)
+HITCH_BUDGET_MS = 33
+SAMPLE_INTERVAL_MS = 2  # How often the watchdog looks at the main thread during a hitch
+MAX_STACK_DEPTH = 64
+
+
+def collapse_stack(frame):
+    """Turn a frame and its callers into one collapsed-stack line, outermost call first"""
+    names = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class HitchWatchdog:
+    """Background thread that samples the main thread's stack while a frame runs long.
+
+    The game loop calls frame_started() and frame_finished() around the work
+    of each frame. Once a frame has taken longer than the budget, the thread
+    wakes every few milliseconds and records the main thread's stack from
+    sys._current_frames(). Samples from every hitch are added up into a
+    collapsed-stack file (one "outer;...;inner count" line per stack, the
+    input flamegraph.pl and speedscope take), and each hitch gets a line in
+    a .hitches.ndjson file next to it with its length, the game context
+    and the stack seen most often.
+    """
+    def __init__(self, path, budget_ms=HITCH_BUDGET_MS, interval_ms=SAMPLE_INTERVAL_MS, context=None):
+        self.path = path
+        self.hitch_path = os.path.splitext(path)[0] + ".hitches.ndjson"
+        self.budget = budget_ms / 1000
+        self.interval = interval_ms / 1000
+        self.context = context  # Called on the main thread to describe a hitch
+        self.main_thread_id = threading.main_thread().ident
+        self.lock = threading.Lock()
+        self.frame_start = None
+        self.frame_number = 0
+        self.samples = []  # Stacks sampled during the current frame
+        self.stacks = Counter()  # Collapsed stack -> samples, over every hitch
+        self.hitches = 0
+        self.hitch_file = open(self.hitch_path, "w")
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="hitch-watchdog", daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def frame_started(self):
+        with self.lock:
+            self.frame_number += 1
+            self.frame_start = time.perf_counter()
+            self.samples = []
+
+    def frame_finished(self):
+        """End the frame; if it went over budget, log it as a hitch"""
+        with self.lock:
+            if self.frame_start is None:
+                return
+            duration = time.perf_counter() - self.frame_start
+            samples = self.samples
+            self.frame_start = None
+            self.samples = []
+        if duration <= self.budget:
+            return
+
+        self.hitches += 1
+        counts = Counter(samples)
+        self.stacks.update(counts)
+        hitch = {
+            "frame": self.frame_number,
+            "ms": round(duration * 1000, 2),
+            "samples": len(samples),
+            "context": self.context() if self.context else {},
+        }
+        if counts:
+            hitch["top_stack"] = counts.most_common(1)[0][0]
+        self.hitch_file.write(json.dumps(hitch) + "\n")
+
+    def run(self):
+        while not self.stopping.wait(self.interval):
+            start = self.frame_start
+            if start is None or time.perf_counter() - start <= self.budget:
+                continue
+            frame = sys._current_frames().get(self.main_thread_id)
+            if frame is None:
+                continue
+            stack = collapse_stack(frame)
+            with self.lock:
+                # Only keep the sample if the same frame is still running
+                if self.frame_start == start:
+                    self.samples.append(stack)
+
+    def stop(self):
+        """Stop sampling and write the collapsed stacks"""
+        self.stopping.set()
+        if self.thread.is_alive():
+            self.thread.join()
+        self.hitch_file.close()
+        with open(self.path, "w") as file:
+            for stack, count in self.stacks.most_common():
+                file.write(f"{stack} {count}\n")
+
+    def get_stats(self):
+        return {
+            "frames": self.frame_number,
+            "hitches": self.hitches,
+            "samples": sum(self.stacks.values()),
+            "stacks": len(self.stacks),
+        }